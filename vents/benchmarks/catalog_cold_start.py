@@ -0,0 +1,53 @@
+"""Compares loading a catalog from JSON and from a compiled snapshot.
+
+Usage: python benchmarks/catalog_cold_start.py [size ...]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+from vents import settings
+
+
+def get_catalog_payload(size: int) -> str:
+    return json.dumps(
+        {
+            "connections": [
+                {
+                    "name": "conn{}".format(i),
+                    "kind": "s3",
+                    "tags": ["team{}".format(i % 7)],
+                    "schema": {"bucket": "s3://bucket{}".format(i)},
+                    "secret": {"name": "secret{}".format(i % 10)},
+                    "annotations": {"tier": "gold"},
+                }
+                for i in range(size)
+            ]
+        }
+    )
+
+
+def benchmark_cold_start(size: int, path: str) -> dict:
+    """Returns the seconds spent loading a catalog from JSON and from a snapshot."""
+    from vents.connections.catalog import ConnectionCatalog
+
+    payload = get_catalog_payload(size)
+    start = time.perf_counter()
+    catalog = ConnectionCatalog.read_json(payload)
+    json_time = time.perf_counter() - start
+    catalog.compile(path)
+    start = time.perf_counter()
+    ConnectionCatalog.load_compiled(path)
+    compiled_time = time.perf_counter() - start
+    return {"size": size, "json": json_time, "compiled": compiled_time}
+
+
+if __name__ == "__main__":
+    settings.create_app()
+    sizes = [int(s) for s in sys.argv[1:]] or [1000, 10000]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for size in sizes:
+            print(benchmark_cold_start(size, os.path.join(temp_dir, "catalog.bin")))
@@ -0,0 +1,57 @@
+"""Compares validating connection schemas by kind and through the union.
+
+Usage: python benchmarks/schema_validation.py [size ...]
+"""
+
+import sys
+import time
+from unittest import mock
+
+from vents import settings
+
+
+SCHEMAS = [
+    ("host_path", {"hostPath": "/a", "mountPath": "/b"}),
+    ("volume_claim", {"volumeClaim": "c", "mountPath": "/m"}),
+    ("git", {"url": "https://github.com/org/repo", "revision": "main"}),
+    ("registry", {"url": "registry.io"}),
+    ("s3", {"bucket": "s3://bucket"}),
+]
+
+
+def get_catalog_data(size: int) -> dict:
+    return {
+        "connections": [
+            {"name": "conn{}".format(i), "kind": kind, "schema": schema}
+            for i, (kind, schema) in enumerate(SCHEMAS * (size // len(SCHEMAS)))
+        ]
+    }
+
+
+def get_load_time(data: dict) -> float:
+    """Returns the best of 3 runs, after a warm-up."""
+    from vents.connections.catalog import ConnectionCatalog
+
+    ConnectionCatalog.from_dict(data)
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        ConnectionCatalog.from_dict(data)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def benchmark_validation(size: int) -> dict:
+    data = get_catalog_data(size)
+    discriminated_time = get_load_time(data)
+    with mock.patch(
+        "vents.connections.connection.parse_schema", side_effect=lambda k, v: v
+    ):
+        union_time = get_load_time(data)
+    return {"size": size, "union": union_time, "discriminated": discriminated_time}
+
+
+if __name__ == "__main__":
+    settings.create_app()
+    for size in [int(s) for s in sys.argv[1:]] or [1000, 10000]:
+        print(benchmark_validation(size))
@@ -0,0 +1,65 @@
+"""Compares the memory retained by connections and by their compact views.
+
+Usage: python benchmarks/view_memory.py [size ...]
+"""
+
+import gc
+import sys
+import tracemalloc
+
+from vents import settings
+
+
+def get_connections_data(size: int) -> list:
+    return [
+        {
+            "name": "conn{}".format(i),
+            "kind": "s3" if i % 2 else "volume_claim",
+            "tags": ["team{}".format(i % 7), "prod"],
+            "schema": {"bucket": "s3://bucket{}".format(i)}
+            if i % 2
+            else {"volumeClaim": "claim{}".format(i), "mountPath": "/data/"},
+            "secret": {"name": "secret{}".format(i % 10), "mountPath": "/secrets"},
+            "configMap": {"name": "config{}".format(i % 5)},
+        }
+        for i in range(size)
+    ]
+
+
+def get_retained_memory(build) -> int:
+    """Returns the bytes retained by the value returned by `build`."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        value = build()
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+        del value
+    finally:
+        tracemalloc.stop()
+    return size
+
+
+def benchmark_memory(size: int) -> dict:
+    from vents.connections.catalog import ConnectionCatalog
+    from vents.connections.connection import Connection
+
+    data = get_connections_data(size)
+    connections_size = get_retained_memory(
+        lambda: [Connection.from_dict(d) for d in data]
+    )
+    views_size = get_retained_memory(
+        lambda: ConnectionCatalog.from_entries(data).views()
+    )
+    return {
+        "size": size,
+        "connections": connections_size,
+        "views": views_size,
+        "ratio": connections_size / views_size,
+    }
+
+
+if __name__ == "__main__":
+    settings.create_app()
+    for size in [int(s) for s in sys.argv[1:]] or [2000, 100000]:
+        print(benchmark_memory(size))
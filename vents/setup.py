@@ -33,7 +33,7 @@ with open(os.path.join("./vents/pkg.py"), encoding="utf8") as f:
 with open("requirements/prod.txt") as requirements_file:
     requirements = requirements_file.read().splitlines()
 
-extra = {}
+extra = {"async": ["aiobotocore"]}
 setup(
     name=pkg["NAME"],
     version=pkg["VERSION"],
@@ -1,8 +1,12 @@
+import mock
 from unittest import TestCase
 
+from clipped.compact.pydantic import ValidationError
+from clipped.utils.json import orjson_loads
 from vents.connections import ConnectionCatalog, ConnectionResource
 from vents.connections.connection import Connection
 from vents.connections.connection_schema import BucketConnection
+from vents.exceptions import VentError
 from vents.providers.kinds import ProviderKind
 
 
@@ -104,3 +108,275 @@ class TestConnectionCatalog(TestCase):
         assert catalog.connections_by_names.get("s3_store") is None
         assert catalog.connections_by_names.get("gcs_store") is None
         assert catalog.connections_by_names.get("az_store") == self.az_store
+
+    def test_indexes(self):
+        s3_store2 = Connection(
+            name="s3_store2",
+            kind=ProviderKind.S3,
+            tags=["foo", "foo"],
+            secret=self.secret1,
+            config_map=self.config1,
+            annotations={"team": "a", "meta": {"k": "v"}},
+            schema_=BucketConnection(bucket="s3//:bar"),
+        )
+        catalog = ConnectionCatalog(
+            connections=[self.s3_store, self.gcs_store, self.az_store, s3_store2]
+        )
+        assert catalog.by_kind(ProviderKind.S3) == [self.s3_store, s3_store2]
+        assert catalog.by_kind("gcs") == [self.gcs_store]
+        assert catalog.by_kind(ProviderKind.HOST_PATH) == []
+        assert catalog.by_tag("test") == [self.s3_store, self.gcs_store]
+        assert catalog.by_tag("foo") == [self.s3_store, s3_store2]
+        assert catalog.by_tag("bar") == []
+        assert catalog.by_secret(self.secret1.name) == [self.s3_store, s3_store2]
+        assert catalog.by_secret(self.secret3.name) == [self.az_store]
+        assert catalog.by_config_map(self.config1.name) == [self.gcs_store, s3_store2]
+        assert catalog.by_annotation("team") == [s3_store2]
+        assert catalog.by_annotation("team", "a") == [s3_store2]
+        assert catalog.by_annotation("team", "b") == []
+        assert catalog.by_annotation("meta", {"k": "v"}) == [s3_store2]
+        assert catalog.by_annotation("other") == []
+        assert catalog.secrets == [self.secret1, self.secret2, self.secret3]
+        assert catalog.config_maps == [self.config1]
+
+        catalog.connections = [self.az_store]
+        catalog.set_all_connections()
+        assert catalog.by_kind(ProviderKind.S3) == []
+        assert catalog.by_kind(ProviderKind.WASB) == [self.az_store]
+        assert catalog.by_tag("test") == []
+
+    def test_empty_views_are_cached(self):
+        catalog = ConnectionCatalog(connections=[self.az_store])
+        assert catalog.config_maps == []
+        with mock.patch.object(ConnectionCatalog, "_build_indexes") as build_indexes:
+            assert catalog.config_maps == []
+            assert catalog.by_tag("test") == []
+        assert build_indexes.call_count == 0
+
+    def test_mutations(self):
+        catalog = ConnectionCatalog(connections=[self.s3_store])
+        assert catalog.secrets == [self.secret1]
+        assert catalog.config_maps == []
+        assert catalog.by_tag("test") == [self.s3_store]
+
+        catalog.add(self.gcs_store)
+        with self.assertRaises(VentError):
+            catalog.add(self.gcs_store)
+        assert catalog.connections == [self.s3_store, self.gcs_store]
+        assert catalog.all_connections == [self.s3_store, self.gcs_store]
+        assert catalog.connections_by_names["gcs_store"] == self.gcs_store
+        assert catalog.by_tag("test") == [self.s3_store, self.gcs_store]
+        assert catalog.secrets == [self.secret1, self.secret2]
+        assert catalog.config_maps == [self.config1]
+
+        s3_store = Connection(
+            name="s3_store",
+            kind=ProviderKind.S3,
+            secret=self.secret3,
+            schema_=BucketConnection(bucket="s3//:bar"),
+        )
+        assert catalog.upsert(s3_store) == self.s3_store
+        assert catalog.all_connections == [s3_store, self.gcs_store]
+        assert catalog.by_tag("test") == [self.gcs_store]
+        assert catalog.by_tag("foo") == []
+        assert catalog.by_secret(self.secret1.name) == []
+        assert catalog.secrets == [self.secret2, self.secret3]
+
+        assert catalog.remove("gcs_store") == self.gcs_store
+        assert catalog.remove("gcs_store") is None
+        assert catalog.all_connections == [s3_store]
+        assert catalog.by_kind(ProviderKind.GCS) == []
+        assert catalog.config_maps == []
+        assert catalog.secrets == [self.secret3]
+
+        catalog.replace_many(
+            connections=[self.gcs_store, self.az_store], removed=["s3_store"]
+        )
+        assert catalog.connections == [self.gcs_store, self.az_store]
+        assert catalog.connections_by_names.get("s3_store") is None
+        assert catalog.by_kind(ProviderKind.S3) == []
+        assert catalog.by_kind(ProviderKind.WASB) == [self.az_store]
+        assert catalog.secrets == [self.secret2, self.secret3]
+        assert catalog.config_maps == [self.config1]
+
+        catalog.replace_many(removed=["gcs_store", "az_store"])
+        assert catalog.all_connections == []
+        assert catalog.secrets is None
+
+    def test_mutations_update_connections_in_place(self):
+        catalog = ConnectionCatalog(connections=[self.s3_store, self.gcs_store])
+        connections = catalog.connections
+        catalog.add(self.az_store)
+        s3_store = Connection(name="s3_store", kind=ProviderKind.S3, tags=["bar"])
+        catalog.upsert(s3_store)
+        catalog.remove("gcs_store")
+        catalog.add(self.gcs_store)
+        catalog.upsert(self.gcs_store)
+        # Not copied and revalidated on every change
+        assert catalog.connections is connections
+        assert connections == [s3_store, self.az_store, self.gcs_store]
+        assert catalog.all_connections == connections
+        assert catalog.to_dict()["connections"][0]["tags"] == ["bar"]
+
+    def test_mutations_are_serialized(self):
+        def get_names(catalog):
+            data = orjson_loads(catalog.to_json())
+            assert data == catalog.to_dict()
+            return [c["name"] for c in data["connections"]]
+
+        catalog = ConnectionCatalog()
+        catalog.add(self.s3_store)
+        assert get_names(catalog) == ["s3_store"]
+
+        catalog = ConnectionCatalog()
+        catalog.upsert(self.gcs_store)
+        assert get_names(catalog) == ["gcs_store"]
+        catalog.upsert(self.s3_store)
+        catalog.upsert(self.gcs_store)
+        assert get_names(catalog) == ["gcs_store", "s3_store"]
+        catalog.remove("gcs_store")
+        assert get_names(catalog) == ["s3_store"]
+
+        catalog = ConnectionCatalog()
+        catalog.replace_many(connections=[self.s3_store, self.az_store])
+        assert get_names(catalog) == ["s3_store", "az_store"]
+        catalog.replace_many(connections=[self.gcs_store], removed=["s3_store"])
+        assert get_names(catalog) == ["az_store", "gcs_store"]
+        catalog.replace_many(removed=["az_store", "gcs_store"])
+        assert catalog.to_dict() == {"connections": []}
+
+    def test_clone(self):
+        catalog = ConnectionCatalog(connections=[self.s3_store, self.gcs_store])
+        clone = catalog.clone()
+        assert clone.connections == catalog.connections
+        assert clone.connections is not catalog.connections
+        assert clone.to_dict() == catalog.to_dict()
+        assert clone.to_json() == catalog.to_json()
+        assert ConnectionCatalog.read_json(clone.to_json()).connections == [
+            self.s3_store,
+            self.gcs_store,
+        ]
+
+        clone.add(self.az_store)
+        assert len(catalog.connections) == 2
+        assert ConnectionCatalog().clone().to_dict() == {}
+
+    def test_lazy(self):
+        connections = [
+            c.to_dict() for c in [self.s3_store, self.gcs_store, self.az_store]
+        ]
+        connections.append({"name": "invalid", "kind": "foo"})
+        with mock.patch.object(
+            Connection, "from_dict", wraps=Connection.from_dict
+        ) as from_dict:
+            catalog = ConnectionCatalog.from_entries(connections)
+            assert catalog.is_lazy is True
+            assert catalog.connections is None
+            assert len(catalog.connections_by_names) == 4
+            assert "gcs_store" in catalog.connections_by_names
+            assert from_dict.call_count == 0
+
+            assert catalog.get_connection_for("s3_store") == self.s3_store
+            assert catalog.connections_by_names["s3_store"] == self.s3_store
+            assert catalog.connections_by_names.get("test") is None
+            assert from_dict.call_count == 1
+
+            # The raw entries are indexed without validation
+            assert catalog.by_tag("test") == [self.s3_store, self.gcs_store]
+            assert from_dict.call_count == 2
+            assert catalog.by_secret(self.secret3.name) == [self.az_store]
+            assert catalog.by_kind("gcs") == [self.gcs_store]
+            assert from_dict.call_count == 3
+
+        catalog.remove("gcs_store")
+        assert catalog.by_tag("test") == [self.s3_store]
+        with self.assertRaises(VentError) as error:
+            catalog.validate_all()
+        assert "`invalid`" in str(error.exception)
+
+        # Replaced entries are validated before the catalog is changed
+        for mutate in (
+            lambda: catalog.upsert(Connection(name="invalid", kind="http")),
+            lambda: catalog.remove("invalid"),
+        ):
+            with self.assertRaises(ValidationError):
+                mutate()
+            assert catalog._connections_by_names["invalid"] == {
+                "name": "invalid",
+                "kind": "foo",
+            }
+            assert len(catalog.connections_by_names) == 3
+
+        # Pending entries are serialized as read
+        data = catalog.to_dict()
+        assert data == orjson_loads(catalog.to_json())
+        assert [c["name"] for c in data["connections"]] == [
+            "s3_store",
+            "az_store",
+            "invalid",
+        ]
+        assert data["connections"][2] == {"name": "invalid", "kind": "foo"}
+
+        # Pending entries are removed without validation
+        catalog.replace_many(removed=["invalid"])
+        assert catalog.validate_all() == [self.s3_store, self.az_store]
+        assert catalog.is_lazy is False
+        assert catalog.connections == [self.s3_store, self.az_store]
+        assert catalog.secrets == [self.secret1, self.secret3]
+        assert catalog.to_dict() == {
+            "connections": [self.s3_store.to_dict(), self.az_store.to_dict()]
+        }
+
+    def test_lazy_requires_names(self):
+        with self.assertRaises(VentError):
+            ConnectionCatalog.from_entries([{"name": "test", "kind": "http"}, {}])
+        with self.assertRaises(VentError):
+            ConnectionCatalog.read_json(
+                '{"connections": [{"kind": "http"}]}', lazy=True
+            )
+
+    def test_read_json_lazy(self):
+        payload = ConnectionCatalog(connections=[self.s3_store, self.gcs_store])
+        catalog = ConnectionCatalog.read_json(payload.to_json(), lazy=True)
+        assert catalog.is_lazy is True
+        assert catalog.all_connections == [self.s3_store, self.gcs_store]
+        assert catalog.connections_by_names["gcs_store"] == self.gcs_store
+        with self.assertRaises(VentError):
+            ConnectionCatalog.read_json('{"foo": []}', lazy=True)
+
+    def test_to_json_bytes(self):
+        catalog = ConnectionCatalog(
+            connections=[self.s3_store, self.gcs_store, self.az_store]
+        )
+        value = catalog.to_json_bytes()
+        assert orjson_loads(value) == catalog.to_dict()
+        assert b" " not in value
+        assert ConnectionCatalog.read_json(value).connections == catalog.connections
+
+        with mock.patch.object(
+            ConnectionCatalog,
+            "_encode_connection",
+            wraps=ConnectionCatalog._encode_connection,
+        ) as encode_connection:
+            subset = catalog.to_json_bytes(names=["az_store", "s3_store"])
+            assert encode_connection.call_count == 0
+            assert orjson_loads(subset) == {
+                "connections": [self.az_store.to_dict(), self.s3_store.to_dict()]
+            }
+            # Replaced connections are re-encoded
+            s3_store = Connection.from_dict(
+                {**self.s3_store.to_dict(), "tags": ["new"]}
+            )
+            catalog.upsert(s3_store)
+            subset = catalog.to_json_bytes(names=["s3_store"])
+            assert encode_connection.call_count == 1
+            assert orjson_loads(subset)["connections"][0]["tags"] == ["new"]
+
+        with self.assertRaises(VentError):
+            catalog.to_json_bytes(names=["s3_store", "foo"])
+        assert catalog.to_json_bytes(names=[]) == b'{"connections":[]}'
+        catalog.remove("az_store")
+        assert "az_store" not in catalog._encoded
+
+        lazy_catalog = ConnectionCatalog.read_json(value, lazy=True)
+        assert orjson_loads(lazy_catalog.to_json_bytes()) == orjson_loads(value)
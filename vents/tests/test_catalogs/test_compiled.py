@@ -0,0 +1,97 @@
+import json
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from vents.connections.catalog import ConnectionCatalog
+from vents.exceptions import VentError
+
+
+def get_catalog_payload(size: int) -> str:
+    return json.dumps(
+        {
+            "connections": [
+                {
+                    "name": "conn{}".format(i),
+                    "kind": "s3",
+                    "tags": ["team{}".format(i % 7)],
+                    "schema": {"bucket": "s3://bucket{}".format(i)},
+                    "secret": {"name": "secret{}".format(i % 10)},
+                    "annotations": {"tier": "gold"},
+                }
+                for i in range(size)
+            ]
+        }
+    )
+
+
+class TestCompiledCatalog(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "catalog.bin")
+        self.payload = get_catalog_payload(20)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        super().tearDown()
+
+    def test_compile(self):
+        catalog = ConnectionCatalog.read_json(self.payload, lazy=True)
+        catalog.compile(self.path)
+        assert catalog.is_lazy is False
+        compiled = ConnectionCatalog.load_compiled(self.path)
+        assert compiled.connections == catalog.connections
+        assert compiled.connections_by_names["conn3"] == catalog.get_connection_for(
+            "conn3"
+        )
+        # The indexes are part of the snapshot
+        assert compiled._indexes is not None
+        with mock.patch.object(ConnectionCatalog, "_build_indexes") as build_indexes:
+            assert len(compiled.by_tag("team1")) == 3
+            assert len(compiled.secrets) == 10
+        assert build_indexes.call_count == 0
+        assert compiled.by_tag("team1")[0] is compiled.connections_by_names["conn1"]
+
+    def test_key(self):
+        ConnectionCatalog.read_json(self.payload).compile(self.path, key=b"secret")
+        assert ConnectionCatalog.load_compiled(self.path, key=b"secret").connections
+        with self.assertRaises(VentError):
+            ConnectionCatalog.load_compiled(self.path)
+
+    def test_fallback(self):
+        with self.assertRaises(VentError):
+            ConnectionCatalog.load_compiled(self.path)
+        catalog = ConnectionCatalog.load_compiled(self.path, source=self.payload)
+        assert len(catalog.connections) == 20
+
+        catalog.compile(self.path)
+        with mock.patch.object(
+            ConnectionCatalog, "_get_compiled_header", return_value=b"0|0.0.0"
+        ):
+            with self.assertRaises(VentError):
+                ConnectionCatalog.load_compiled(self.path)
+            catalog = ConnectionCatalog.load_compiled(self.path, source=self.payload)
+            assert len(catalog.connections) == 20
+
+        # Corrupted payload
+        with open(self.path, "r+b") as f:
+            f.seek(-10, os.SEEK_END)
+            f.write(b"0" * 10)
+        with self.assertRaises(VentError):
+            ConnectionCatalog.load_compiled(self.path)
+        catalog = ConnectionCatalog.load_compiled(self.path, source=self.payload)
+        assert len(catalog.connections) == 20
+
+    def test_load_compiled_skips_validation(self):
+        # The snapshot is faster to load since the connections are not revalidated,
+        # see benchmarks/catalog_cold_start.py
+        ConnectionCatalog.read_json(self.payload).compile(self.path)
+        # Called by the schema validator of each connection
+        with mock.patch(
+            "vents.connections.connection.parse_schema", side_effect=AssertionError
+        ):
+            with self.assertRaises(ValueError):
+                ConnectionCatalog.read_json(self.payload)
+            catalog = ConnectionCatalog.load_compiled(self.path)
+        assert len(catalog.connections) == 20
@@ -1,4 +1,6 @@
-from unittest import TestCase
+import copy
+import pickle
+from unittest import TestCase, mock
 
 from vents.connections import ConnectionResource
 from vents.connections.connection import Connection
@@ -68,6 +70,42 @@ class TestConnection(TestCase):
         assert self.host_path_store.store_path == self.claim_store.schema_.mount_path
         assert self.host_path_store.tags is None
 
+    def test_store_path_is_memoized(self):
+        from vents.settings import VENTS_CONFIG
+
+        with mock.patch.object(
+            VENTS_CONFIG.config_parser, "parse", wraps=VENTS_CONFIG.config_parser.parse
+        ) as parse:
+            assert self.az_store.store_path == "x"
+            assert self.az_store.store_path == "x"
+            assert parse.call_count == 1
+            # Patching the schema invalidates the path
+            self.az_store.schema_.patch(
+                BucketConnection(bucket="wasbs://y@z.blob.core.windows.net")
+            )
+            assert self.az_store.store_path == "y"
+            assert parse.call_count == 2
+            self.az_store.schema_ = BucketConnection(
+                bucket="wasbs://x@y.blob.core.windows.net/"
+            )
+            assert self.az_store.store_path == "x"
+            assert parse.call_count == 3
+
+        # Changing the kind invalidates the path
+        connection = copy.deepcopy(self.s3_store)
+        assert connection.store_path == "s3//:foo"
+        connection.kind = ProviderKind.WASB
+        connection.schema_.bucket = "wasbs://x@y.blob.core.windows.net"
+        assert connection.store_path == "x"
+        # The memoized values are not part of the fields, nor pickled
+        assert "_store_path" not in connection.to_dict()
+        assert "_store_path" not in connection.__dict__
+        assert connection == Connection.from_dict(connection.to_dict())
+        unpickled = pickle.loads(pickle.dumps(connection))
+        assert unpickled == connection
+        assert unpickled._store_path.value == ""
+        assert unpickled.store_path == "x"
+
     def test_is_bucket(self):
         assert self.s3_store.is_bucket is True
         assert self.s3_store.is_s3 is True
@@ -117,6 +155,53 @@ class TestConnection(TestCase):
         assert self.custom_connection2.schema_ == {"key1": "val1", "key2": "val2"}
         self.assert_from_model(self.custom_connection2)
 
+    def test_from_models(self):
+        class Row:
+            def __init__(self, connection: Connection, **kwargs):
+                self.name = connection.name
+                self.kind = ProviderKind(connection.kind)
+                self.schema_ = connection.schema_
+                self.secret = connection.secret
+                self.config_map = connection.config_map
+                self.env = None
+                self.annotations = {"team": "a"}
+                self.__dict__.update(kwargs)
+
+        rows = [
+            Row(self.s3_store),
+            Row(self.claim_store),
+            Row(self.custom_connection2),
+            # Raw dicts, e.g. JSON columns
+            Row(self.host_path_store, schema_={"hostPath": "/a", "mountPath": "/b"}),
+            Row(self.gcs_store, secret={"name": "secret", "mountPath": "/secret"}),
+        ]
+        connections = Connection.from_models(iter(rows))
+        assert next(connections) == Connection(
+            name=self.s3_store.name,
+            kind=ProviderKind.S3,
+            schema_=self.s3_store.schema_,
+            secret=self.s3_store.secret,
+            annotations={"team": "a"},
+        )
+        connections = [next(connections)] + list(connections)
+        assert len(connections) == 4
+        # The nested models are copied
+        assert connections[0].schema_ == self.claim_store.schema_
+        assert connections[0].schema_ is not self.claim_store.schema_
+        assert connections[1].schema_ == {"key1": "val1", "key2": "val2"}
+        assert connections[2].schema_ == HostPathConnection(
+            host_path="/a", mount_path="/b"
+        )
+        assert connections[3].secret == ConnectionResource(
+            name="secret", mount_path="/secret"
+        )
+
+        trusted = list(Connection.from_models(rows, validate=False))
+        assert trusted[1:] == connections
+        assert trusted[0].kind == "s3"
+        assert "env" not in trusted[0].model_fields_set
+        assert trusted[3].store_path == "/b"
+
 
 class TestMainSecrets(TestCase):
     def setUp(self):
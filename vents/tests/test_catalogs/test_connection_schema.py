@@ -1,12 +1,15 @@
-from unittest import TestCase
+from unittest import TestCase, mock
 
 from clipped.compact.pydantic import ValidationError
+from vents.connections.catalog import ConnectionCatalog
+from vents.connections.connection import Connection
 from vents.connections.connection_schema import (
     BucketConnection,
     ClaimConnection,
     GitConnection,
     HostConnection,
     HostPathConnection,
+    parse_schema,
 )
 
 
@@ -82,3 +85,54 @@ class TestGitConnection(TestCase):
         }
         config = GitConnection.from_dict(config_dict)
         assert config.to_dict() == config_dict
+
+
+class TestParseSchema(TestCase):
+    def test_parse_schema(self):
+        assert parse_schema("s3", {"bucket": "s3://foo"}) == BucketConnection(
+            bucket="s3://foo"
+        )
+        assert parse_schema("host_path", {"hostPath": "/a", "mountPath": "/b"}) == (
+            HostPathConnection(host_path="/a", mount_path="/b")
+        )
+        assert parse_schema("registry", {"url": "foo"}) == HostConnection(url="foo")
+        # No trial of the union members, a git url is a git schema
+        assert parse_schema("git", {"url": "foo"}) == GitConnection(url="foo")
+        # Unknown kinds and invalid schemas are left to the union
+        assert parse_schema("custom", {"url": "foo"}) == {"url": "foo"}
+        assert parse_schema("s3", {"foo": "bar"}) == {"foo": "bar"}
+        assert parse_schema("s3", None) is None
+
+    def test_connection_schema(self):
+        connection = Connection.from_dict(
+            {"name": "repo", "kind": "git", "schema": {"url": "foo"}}
+        )
+        assert isinstance(connection.schema_, GitConnection)
+        connection = Connection.from_dict(
+            {"name": "foo", "kind": "s3", "schema": {"key": "value"}}
+        )
+        assert connection.schema_ == {"key": "value"}
+        connection.schema_ = {"bucket": "s3://foo"}
+        assert connection.schema_ == BucketConnection(bucket="s3://foo")
+
+    def test_validation_by_kind_matches_union(self):
+        # See benchmarks/schema_validation.py for the timings
+        schemas = [
+            ("host_path", {"hostPath": "/a", "mountPath": "/b"}),
+            ("volume_claim", {"volumeClaim": "c", "mountPath": "/m"}),
+            ("git", {"url": "https://github.com/org/repo", "revision": "main"}),
+            ("registry", {"url": "registry.io"}),
+            ("s3", {"bucket": "s3://bucket"}),
+        ]
+        data = {
+            "connections": [
+                {"name": "conn{}".format(i), "kind": kind, "schema": schema}
+                for i, (kind, schema) in enumerate(schemas)
+            ]
+        }
+        catalog = ConnectionCatalog.from_dict(data)
+        with mock.patch(
+            "vents.connections.connection.parse_schema", side_effect=lambda k, v: v
+        ):
+            union_catalog = ConnectionCatalog.from_dict(data)
+        assert catalog.connections == union_catalog.connections
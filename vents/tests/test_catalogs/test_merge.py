@@ -0,0 +1,150 @@
+from unittest import TestCase
+
+from clipped.config.patch_strategy import PatchStrategy
+from vents.connections.catalog import ConnectionCatalog
+from vents.connections.connection import Connection
+from vents.connections.connection_schema import (
+    BucketConnection,
+    ClaimConnection,
+    GitConnection,
+)
+from vents.connections.merge import diff_catalogs, merge_catalogs
+from vents.providers.kinds import ProviderKind
+
+
+class TestCatalogMerge(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.base = ConnectionCatalog.from_dict(
+            {
+                "connections": [
+                    {
+                        "name": "data",
+                        "kind": "s3",
+                        "tags": ["base"],
+                        "schema": {"bucket": "s3://base"},
+                        "annotations": {"team": "base", "tier": "gold"},
+                    },
+                    {
+                        "name": "claim",
+                        "kind": "volume_claim",
+                        "schema": {"volumeClaim": "claim", "mountPath": "/base"},
+                    },
+                    {
+                        "name": "repo",
+                        "kind": "git",
+                        "schema": {
+                            "url": "https://github.com/org/repo",
+                            "revision": "main",
+                        },
+                    },
+                ]
+            }
+        )
+        self.team = ConnectionCatalog.from_dict(
+            {
+                "connections": [
+                    {
+                        "name": "data",
+                        "kind": "s3",
+                        "schema": {"bucket": "s3://team"},
+                        "annotations": {"team": "a"},
+                    },
+                    {"name": "repo", "kind": "git", "schema": {"revision": "dev"}},
+                    {"name": "team", "kind": "http"},
+                ]
+            }
+        )
+        self.env = ConnectionCatalog.from_dict(
+            {
+                "connections": [
+                    {
+                        "name": "claim",
+                        "kind": "volume_claim",
+                        "schema": {
+                            "volumeClaim": "claim",
+                            "mountPath": "/env",
+                            "readOnly": True,
+                        },
+                    },
+                    {"name": "repo", "kind": "gcs", "schema": {"bucket": "gs://repo"}},
+                ]
+            }
+        )
+
+    def test_merge(self):
+        base_data = self.base.connections_by_names["data"].to_dict()
+        catalog = ConnectionCatalog.merge(self.base, self.team, None, self.env)
+        assert list(catalog.connections_by_names) == ["data", "claim", "repo", "team"]
+        data = catalog.connections_by_names["data"]
+        assert data.schema_ == BucketConnection(bucket="s3://team")
+        assert data.tags == ["base"]
+        assert data.annotations == {"team": "a", "tier": "gold"}
+        claim = catalog.connections_by_names["claim"]
+        assert claim.schema_ == ClaimConnection(
+            volume_claim="claim", mount_path="/env", read_only=True
+        )
+        # A different kind replaces the connection
+        repo = catalog.connections_by_names["repo"]
+        assert repo.kind == ProviderKind.GCS
+        # The inputs are not mutated
+        assert self.base.connections_by_names["data"].to_dict() == base_data
+
+        catalog = merge_catalogs(self.base, self.team)
+        assert catalog.connections_by_names["repo"].schema_ == GitConnection(
+            url="https://github.com/org/repo", revision="dev"
+        )
+        assert catalog.by_tag("base") == [catalog.connections_by_names["data"]]
+
+    def test_merge_strategies(self):
+        catalog = merge_catalogs(self.base, self.team, strategy=PatchStrategy.PRE_MERGE)
+        data = catalog.connections_by_names["data"]
+        assert data.schema_.bucket == "s3://base"
+        assert data.annotations == {"team": "base", "tier": "gold"}
+
+        catalog = merge_catalogs(self.base, self.team, strategy=PatchStrategy.REPLACE)
+        data = catalog.connections_by_names["data"]
+        assert data is self.team.connections_by_names["data"]
+        assert data.tags is None
+
+        catalog = merge_catalogs(self.base, self.team, strategy=PatchStrategy.ISNULL)
+        assert (
+            catalog.connections_by_names["data"]
+            is (self.base.connections_by_names["data"])
+        )
+        assert "team" in catalog.connections_by_names
+
+    def test_diff(self):
+        merged = merge_catalogs(self.base, self.team)
+        diff = self.base.diff(merged)
+        assert diff.added == ["team"]
+        assert diff.removed == []
+        assert diff.changed == ["data", "repo"]
+        assert diff.is_empty is False
+
+        diff = diff_catalogs(merged, self.env)
+        assert diff.added == []
+        assert diff.removed == ["data", "team"]
+        assert diff.changed == ["claim", "repo"]
+
+        assert diff_catalogs(self.base, self.base.clone()).is_empty is True
+        assert diff_catalogs(None, None).is_empty is True
+
+        catalog = self.base.clone()
+        self.base.diff(merged).apply(catalog, merged)
+        assert diff_catalogs(catalog, merged).is_empty is True
+        assert catalog.connections == merged.connections
+
+    def test_merge_connection_instances(self):
+        current = Connection(
+            name="data",
+            kind=ProviderKind.S3,
+            schema_=BucketConnection(bucket="s3://base"),
+        )
+        value = Connection(name="data", kind=ProviderKind.S3, description="desc")
+        merged = merge_catalogs(
+            ConnectionCatalog(connections=[current]),
+            ConnectionCatalog(connections=[value]),
+        ).connections_by_names["data"]
+        assert merged.schema_ == current.schema_
+        assert merged.description == "desc"
@@ -0,0 +1,169 @@
+import pickle
+from unittest import TestCase
+
+from vents.connections.catalog import ConnectionCatalog
+from vents.connections.connection import Connection
+from vents.connections.connection_resource import ConnectionResource
+from vents.connections.connection_schema import (
+    BucketConnection,
+    ClaimConnection,
+    HostPathConnection,
+)
+from vents.connections.mount_plan import MountPlan, normalize_mount_path
+from vents.exceptions import VentError
+from vents.providers.kinds import ProviderKind
+
+
+class TestMountPlan(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.secret1 = ConnectionResource(name="secret1", mount_path="/secrets/1")
+        self.secret2 = ConnectionResource(name="secret2")
+        self.secret3 = ConnectionResource(
+            name="secret3", mount_path="/secrets/3", is_requested=True
+        )
+        self.config1 = ConnectionResource(name="config1", mount_path="/configs")
+        self.config2 = ConnectionResource(name="config2", is_requested=True)
+        self.s3_store = Connection(
+            name="s3_store",
+            kind=ProviderKind.S3,
+            secret=self.secret1,
+            schema_=BucketConnection(bucket="s3://foo"),
+        )
+        self.gcs_store = Connection(
+            name="gcs_store",
+            kind=ProviderKind.GCS,
+            secret=self.secret2,
+            config_map=self.config1,
+            schema_=BucketConnection(bucket="gs://foo"),
+        )
+        self.claim_store = Connection(
+            name="claim_store",
+            kind=ProviderKind.VOLUME_CLAIM,
+            secret=self.secret1,
+            schema_=ClaimConnection(mount_path="/data/", volume_claim="claim"),
+        )
+        self.host_path_store = Connection(
+            name="host_path_store",
+            kind=ProviderKind.HOST_PATH,
+            schema_=HostPathConnection(mount_path="/secrets/1", host_path="/tmp"),
+        )
+        self.catalog = ConnectionCatalog(
+            connections=[
+                self.s3_store,
+                self.gcs_store,
+                self.claim_store,
+                self.host_path_store,
+            ]
+        )
+
+    def test_build(self):
+        names = ["gcs_store", "claim_store", "s3_store", "host_path_store", "s3_store"]
+        secrets = [self.secret2, self.secret3]
+        config_maps = [self.config2]
+        plan = MountPlan.build(
+            self.catalog, names, secrets=secrets, config_maps=config_maps
+        )
+        assert plan.connections == (
+            self.gcs_store,
+            self.claim_store,
+            self.s3_store,
+            self.host_path_store,
+        )
+        # Same as `get_requested_resources`
+        assert list(plan.secrets) == Connection.get_requested_resources(
+            resources=secrets, connections=list(plan.connections), resource_key="secret"
+        )
+        assert plan.secrets == (self.secret3, self.secret2, self.secret1)
+        assert list(plan.config_maps) == Connection.get_requested_resources(
+            resources=config_maps,
+            connections=list(plan.connections),
+            resource_key="config_map",
+        )
+        assert plan.volumes == (self.claim_store, self.host_path_store)
+        assert plan.mount_paths == {
+            "/secrets/3": "secret3",
+            "/configs": "config1",
+            "/data": "claim_store",
+            "/secrets/1": "secret1",
+        }
+
+        with self.assertRaises(TypeError):
+            plan.mount_paths["/foo"] = "foo"
+        with self.assertRaises(AttributeError):
+            plan.secrets = ()
+        copied_plan = pickle.loads(pickle.dumps(plan))
+        assert copied_plan.mount_paths == plan.mount_paths
+        assert copied_plan.volumes == plan.volumes
+
+        plan = MountPlan.build(self.catalog, [])
+        assert plan.connections == plan.secrets == plan.volumes == ()
+        with self.assertRaises(VentError):
+            MountPlan.build(self.catalog, ["foo"])
+
+    def test_duplicate_requested_resources(self):
+        # Requested resources are kept as is, like `get_requested_resources`
+        secret1 = ConnectionResource(
+            name="secret1", mount_path="/secrets/other", is_requested=True
+        )
+        secrets = [self.secret3, self.secret3, secret1]
+        plan = MountPlan.build(self.catalog, ["s3_store"], secrets=secrets)
+        assert list(plan.secrets) == Connection.get_requested_resources(
+            resources=secrets, connections=list(plan.connections), resource_key="secret"
+        )
+        assert plan.secrets == (self.secret3, self.secret3, secret1)
+        assert plan.mount_paths == {
+            "/secrets/3": "secret3",
+            "/secrets/other": "secret1",
+        }
+
+    def test_normalized_mount_paths(self):
+        secret = ConnectionResource(
+            name="secret", mount_path="/data//", is_requested=True
+        )
+        plan = MountPlan.build(self.catalog, ["claim_store"], secrets=[secret])
+        assert plan.mount_paths == {"/data": "secret", "/secrets/1": "secret1"}
+        assert normalize_mount_path("//data/./foo/") == "/data/foo"
+
+    def test_precomputed_entries(self):
+        # Built with the indexes, and updated on mutations
+        assert self.catalog.by_kind(ProviderKind.S3) == [self.s3_store]
+        entry = self.catalog._mount_entries["claim_store"]
+        assert entry.secret is self.catalog.connections_by_names["claim_store"].secret
+        assert entry.volume_mount_path == "/data"
+        assert self.catalog.get_mount_entry("claim_store") is entry
+        assert self.catalog.get_mount_entry("foo") is None
+
+        claim_store = Connection.from_dict(
+            {**self.claim_store.to_dict(), "secret": self.secret2.to_dict()}
+        )
+        self.catalog.upsert(claim_store)
+        assert self.catalog.get_mount_entry("claim_store").secret is claim_store.secret
+        self.catalog.remove("claim_store")
+        assert "claim_store" not in self.catalog._mount_entries
+
+        # Lazy catalogs validate the requested connections only
+        catalog = ConnectionCatalog.from_entries(
+            [c.to_dict() for c in [self.s3_store, self.claim_store]]
+        )
+        plan = catalog.get_mount_plan(["claim_store"])
+        assert plan.volumes[0].name == "claim_store"
+        assert not isinstance(catalog._connections_by_names["claim_store"], dict)
+        assert isinstance(catalog._connections_by_names["s3_store"], dict)
+
+    def test_cached_plan(self):
+        plan = self.catalog.get_mount_plan(["s3_store"], secrets=[self.secret3])
+        assert plan.secrets == (self.secret3, self.secret1)
+        assert self.catalog.get_mount_plan(["s3_store"], secrets=[self.secret3]) is plan
+        # Equal resources share the plan
+        secret3 = ConnectionResource(**self.secret3.model_dump())
+        assert self.catalog.get_mount_plan(["s3_store"], secrets=[secret3]) is plan
+        assert self.catalog.get_mount_plan(["s3_store"]) is not plan
+
+        # Mutations clear the plans
+        s3_store = Connection.from_dict(
+            {**self.s3_store.to_dict(), "secret": self.secret2.to_dict()}
+        )
+        self.catalog.upsert(s3_store)
+        plan = self.catalog.get_mount_plan(["s3_store"], secrets=[self.secret3])
+        assert plan.secrets == (self.secret3, self.secret2)
@@ -0,0 +1,97 @@
+import io
+import json
+import os
+import tempfile
+from unittest import TestCase, mock
+
+from vents.config import AppConfig
+from vents.connections.connection import Connection
+from vents.connections.streaming import StreamingCatalog, iter_catalog_entries
+from vents.exceptions import VentError
+
+
+class TestStreamingCatalog(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.data = {
+            "version": "1.1",
+            "meta": {"connections": [{"name": "fake"}]},
+            "connections": [
+                {
+                    "name": "conn{}".format(i),
+                    "kind": "s3",
+                    "description": 'escaped \\" {[ "}] chars',
+                    "schema": {"bucket": "s3://bucket{}".format(i)},
+                    "annotations": {"list": [1, {"a": [2]}]},
+                }
+                for i in range(50)
+            ],
+            "other": [{"name": "fake"}],
+        }
+        self.payload = json.dumps(self.data).encode()
+
+    def test_iter_catalog_entries(self):
+        # Small chunks to exercise entries and strings split across reads
+        for chunk_size in [1, 2, 7, 64, 1 << 16]:
+            entries = list(
+                iter_catalog_entries(io.BytesIO(self.payload), chunk_size=chunk_size)
+            )
+            assert [json.loads(e[2]) for e in entries] == self.data["connections"]
+            for start, end, raw in entries:
+                assert self.payload[start:end] == raw
+
+    def test_incomplete_document(self):
+        with self.assertRaises(VentError):
+            payload = self.payload[: self.payload.index(b'"other"') - 30]
+            list(iter_catalog_entries(io.BytesIO(payload)))
+
+    def test_get_connection_for(self):
+        catalog = StreamingCatalog(self.payload, chunk_size=128)
+        with mock.patch.object(
+            Connection, "from_dict", wraps=Connection.from_dict
+        ) as from_dict:
+            connection = catalog.get_connection_for("conn3")
+            assert connection.schema_.bucket == "s3://bucket3"
+            # Only the requested entry is validated, the rest is not scanned yet
+            assert from_dict.call_count == 1
+            assert catalog._names == ["conn0", "conn1", "conn2", "conn3"]
+            assert catalog.get_connection_for("conn3") is connection
+            # Already scanned entries are read back from their span
+            assert catalog.get_connection_for("conn1").name == "conn1"
+            assert from_dict.call_count == 2
+
+        assert catalog.get_connection_for("fake") is None
+        assert "fake" not in catalog
+        assert "conn49" in catalog
+        assert len(catalog) == 50
+        assert catalog.get_connection_for("conn49").name == "conn49"
+
+    def test_file_and_load(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "catalog.json")
+            with open(path, "wb") as f:
+                f.write(self.payload)
+            catalog = StreamingCatalog(path, chunk_size=256)
+            assert catalog.get_connection_for("conn10").name == "conn10"
+            assert catalog.get_connection_for("conn2").name == "conn2"
+            assert [c.name for c in catalog.iter_connections()] == [
+                "conn{}".format(i) for i in range(50)
+            ]
+            full_catalog = catalog.load()
+            assert len(full_catalog.connections) == 50
+            assert full_catalog.connections_by_names["conn4"].schema_.bucket == (
+                "s3://bucket4"
+            )
+
+    def test_app_config(self):
+        config = AppConfig(use_streaming_catalog=True)
+        payload = json.dumps({"connections": self.data["connections"]})
+        with mock.patch.dict(os.environ, {"VENTS_CONNECTIONS_CATALOG": payload}):
+            assert config.streaming_catalog is not None
+            assert config.get_connection_for("conn7").name == "conn7"
+            assert config.get_connection_for("fake") is None
+            assert config._catalog_loaded is False
+            # Accessing the full catalog disables the streaming lookups
+            assert len(config.catalog.connections) == 50
+            assert config.streaming_catalog is None
+            assert config.get_connection_for("conn7").name == "conn7"
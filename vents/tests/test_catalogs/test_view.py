@@ -0,0 +1,67 @@
+import pickle
+from unittest import TestCase
+
+from vents.connections.catalog import ConnectionCatalog
+from vents.connections.connection import Connection
+from vents.connections.view import ConnectionView
+
+
+def get_connections_data(size: int) -> list:
+    return [
+        {
+            "name": "conn{}".format(i),
+            "kind": "s3" if i % 2 else "volume_claim",
+            "tags": ["team{}".format(i % 7), "prod"],
+            "schema": {"bucket": "s3://bucket{}".format(i)}
+            if i % 2
+            else {"volumeClaim": "claim{}".format(i), "mountPath": "/data/"},
+            "secret": {"name": "secret{}".format(i % 10), "mountPath": "/secrets"},
+            "configMap": {"name": "config{}".format(i % 5)},
+        }
+        for i in range(size)
+    ]
+
+
+class TestConnectionView(TestCase):
+    def test_view(self):
+        catalog = ConnectionCatalog.from_dict({"connections": get_connections_data(2)})
+        claim, s3 = catalog.views()
+        assert claim == ConnectionView(
+            name="conn0",
+            kind="volume_claim",
+            store_path="/data",
+            tags=("team0", "prod"),
+            secret="secret0",
+            secret_mount_path="/secrets",
+            config_map="config0",
+        )
+        assert claim.is_mount is True
+        assert claim.is_artifact is True
+        assert s3.store_path == "s3://bucket1"
+        assert s3.is_bucket is True
+        assert s3.is_mount is False
+        assert s3.config_map_mount_path is None
+        assert hash(s3) == hash(pickle.loads(pickle.dumps(s3)))
+        with self.assertRaises(AttributeError):
+            s3.name = "foo"
+        with self.assertRaises(AttributeError):
+            s3.foo = "bar"
+
+        view = ConnectionView.from_connection(
+            Connection(name="custom", kind="custom", schema_={"url": "foo"})
+        )
+        assert view.store_path is None
+        assert view.tags == ()
+        assert view.secret is None
+
+    def test_compact_views(self):
+        # See benchmarks/view_memory.py for the retained memory
+        data = get_connections_data(20)
+        views = ConnectionCatalog.from_entries(data).views()
+        assert not hasattr(views[0], "__dict__")
+        # Repeated strings are shared
+        assert views[0].kind is views[2].kind
+        assert views[0].tags[1] is views[1].tags[1]
+        assert views[0].secret is views[10].secret
+        assert views[0].config_map is views[5].config_map
+        assert views[0].config_map == "config0"
@@ -0,0 +1,149 @@
+import importlib.util
+import json
+import mock
+import os
+import sys
+import tempfile
+import time
+from unittest import TestCase, skipUnless
+
+from vents.config import AppConfig
+from vents.connections.catalog import ConnectionCatalog
+from vents.connections.watcher import CatalogWatcher
+
+
+class TestCatalogWatcher(TestCase):
+    def setUp(self):
+        super().setUp()
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "catalog.json")
+        self.config = AppConfig(catalog=ConnectionCatalog())
+        self.changes = []
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+        super().tearDown()
+
+    def write(self, connections, path=None):
+        # Atomic replace, as done by config management tools
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"connections": connections}, f)
+        os.replace(tmp_path, path or self.path)
+
+    def on_change(self, catalog, changed):
+        self.changes.append(changed)
+
+    def test_reload(self):
+        self.write(
+            [
+                {"name": "conn1", "kind": "http"},
+                {"name": "conn2", "kind": "s3", "schema": {"bucket": "s3://foo"}},
+            ]
+        )
+        watcher = CatalogWatcher(
+            self.path, config=self.config, on_change=self.on_change
+        )
+        assert watcher.reload() is True
+        catalog = self.config.catalog
+        conn1 = catalog.connections_by_names["conn1"]
+        conn2 = catalog.connections_by_names["conn2"]
+        assert self.changes == [{"conn1", "conn2"}]
+        # No changes
+        assert watcher.reload() is False
+        # Same content, different file
+        self.write(
+            [
+                {"name": "conn1", "kind": "http"},
+                {"name": "conn2", "kind": "s3", "schema": {"bucket": "s3://foo"}},
+            ]
+        )
+        assert watcher.reload() is False
+        assert self.config.catalog is catalog
+
+        self.write(
+            [
+                {"name": "conn1", "kind": "http"},
+                {"name": "conn2", "kind": "s3", "schema": {"bucket": "s3://bar"}},
+                {"name": "conn3", "kind": "gcs", "schema": {"bucket": "gs://foo"}},
+            ]
+        )
+        assert watcher.reload() is True
+        assert self.config.catalog is not catalog
+        assert self.changes[-1] == {"conn2", "conn3"}
+        by_names = self.config.catalog.connections_by_names
+        assert by_names["conn1"] is conn1
+        assert by_names["conn2"] is not conn2
+        assert by_names["conn2"].schema_.bucket == "s3://bar"
+
+        self.write([{"name": "conn1", "kind": "http"}])
+        assert watcher.reload() is True
+        assert self.changes[-1] == {"conn2", "conn3"}
+        assert list(self.config.catalog.connections_by_names) == ["conn1"]
+
+    def test_reload_yaml(self):
+        path = os.path.join(self.temp_dir.name, "catalog.yaml")
+        with open(path, "w") as f:
+            f.write("connections:\n  - name: conn1\n    kind: http\n")
+        watcher = CatalogWatcher(path, config=self.config)
+        assert watcher.reload() is True
+        assert "conn1" in self.config.catalog.connections_by_names
+
+    def test_watch(self):
+        self.write([{"name": "conn1", "kind": "http"}])
+        with CatalogWatcher(
+            self.path,
+            config=self.config,
+            interval=0.01,
+            on_change=self.on_change,
+            use_inotify=False,
+        ):
+            assert "conn1" in self.config.catalog.connections_by_names
+            self.write([{"name": "conn2", "kind": "http"}])
+            for _ in range(200):
+                if len(self.changes) > 1:
+                    break
+                time.sleep(0.01)
+        assert "conn2" in self.config.catalog.connections_by_names
+        assert self.changes[-1] == {"conn1", "conn2"}
+
+    def wait_for_changes(self, count: int):
+        for _ in range(200):
+            if len(self.changes) >= count:
+                return
+            time.sleep(0.01)
+
+    @skipUnless(
+        importlib.util.find_spec("inotify_simple"), "inotify_simple is not installed"
+    )
+    def test_watch_inotify(self):
+        self.write([{"name": "conn1", "kind": "http"}])
+        # Polling would only reload after the interval
+        with CatalogWatcher(
+            self.path, config=self.config, interval=30, on_change=self.on_change
+        ) as watcher:
+            self.write([{"name": "conn2", "kind": "http"}])
+            self.wait_for_changes(2)
+            assert watcher.use_inotify is None
+        assert "conn2" in self.config.catalog.connections_by_names
+        assert self.changes[-1] == {"conn1", "conn2"}
+
+    def test_inotify_events_trigger_reloads(self):
+        inotify = mock.MagicMock()
+        inotify.read.side_effect = lambda timeout: (
+            time.sleep(0.01) or [mock.MagicMock()]
+        )
+        inotify_simple = mock.MagicMock()
+        inotify_simple.INotify.return_value = inotify
+        self.write([{"name": "conn1", "kind": "http"}])
+        with mock.patch.dict(sys.modules, {"inotify_simple": inotify_simple}):
+            with CatalogWatcher(
+                self.path, config=self.config, interval=30, on_change=self.on_change
+            ):
+                self.write([{"name": "conn2", "kind": "http"}])
+                self.wait_for_changes(2)
+        # The directory is watched, to catch atomic renames
+        assert inotify.add_watch.call_args[0][0] == self.temp_dir.name
+        assert inotify.read.call_args[1] == {"timeout": 30000}
+        inotify.close.assert_called_once()
+        assert self.changes[-1] == {"conn1", "conn2"}
@@ -0,0 +1,144 @@
+import datetime
+import multiprocessing
+import os
+import stat
+import tempfile
+import time
+from unittest import TestCase, mock
+
+from moto import mock_aws
+
+from vents.cache import SharedCredentialsCache
+from vents.config import AppConfig
+from vents.providers.aws.credentials import AssumeRoleCache
+from vents.providers.aws.service import AWSService
+from vents.providers.gcp.base import get_gc_cache_key, share_gc_credentials
+
+
+def fetch_in_process(path: str, calls_path: str, queue):
+    def fetch():
+        with open(calls_path, "a") as f:
+            f.write("call\n")
+        time.sleep(0.2)  # The other processes wait for the lock meanwhile
+        return {"token": "token-{}".format(os.getpid())}, time.time() + 3600
+
+    queue.put(SharedCredentialsCache(path).get("key", fetch, margin=60)["token"])
+
+
+class TestSharedCredentialsCache(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "credentials")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_get_and_expiry(self):
+        cache = SharedCredentialsCache(self.path)
+        fetch = mock.MagicMock(return_value=({"token": "foo"}, time.time() + 3600))
+        assert cache.get("key", fetch, margin=60) == {"token": "foo"}
+        assert cache.get("key", fetch, margin=60) == {"token": "foo"}
+        assert SharedCredentialsCache(self.path).get("key", fetch) == {"token": "foo"}
+        assert fetch.call_count == 1
+        assert cache.stats == {"hits": 1, "misses": 1}
+        assert stat.S_IMODE(os.stat(self.path).st_mode) == 0o700
+        for name in os.listdir(self.path):
+            assert (
+                stat.S_IMODE(os.stat(os.path.join(self.path, name)).st_mode) & 0o077
+                == 0
+            )
+
+        # Expired
+        fetch.return_value = ({"token": "bar"}, time.time() - 1)
+        assert cache.get("other", fetch, margin=60) == {"token": "bar"}
+        fetch.return_value = ({"token": "baz"}, time.time() + 3600)
+        assert cache.get("other", fetch, margin=60) == {"token": "baz"}
+        assert fetch.call_count == 3
+
+        # Short-lived credentials are refreshed halfway through their lifetime
+        fetch.return_value = ({"token": "foo"}, time.time() + 40)
+        cache.delete("other")
+        assert cache.get("other", fetch, margin=60) == {"token": "foo"}
+        assert cache.get("other", fetch, margin=60) == {"token": "foo"}
+        with mock.patch("time.time", return_value=time.time() + 30):
+            assert cache.get("other", fetch, margin=60) == {"token": "foo"}
+        assert fetch.call_count == 5
+
+        cache.delete("key")
+        assert cache.get("key", fetch) == {"token": "foo"}
+        assert fetch.call_count == 6
+
+    def test_single_refresh_across_processes(self):
+        calls_path = os.path.join(self.tmp.name, "calls")
+        context = multiprocessing.get_context("fork")
+        queue = context.Queue()
+        processes = [
+            context.Process(
+                target=fetch_in_process, args=(self.path, calls_path, queue)
+            )
+            for _ in range(4)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        tokens = {queue.get() for _ in processes}
+        assert len(tokens) == 1
+        with open(calls_path) as f:
+            assert len(f.readlines()) == 1
+
+    @mock_aws
+    def test_assumed_role_credentials(self):
+        config = AppConfig(credentials_cache_path=self.path)
+        with mock.patch("vents.settings.VENTS_CONFIG", config):
+            with mock.patch.object(
+                AWSService, "assume_role", wraps=AWSService.assume_role
+            ) as assume_role:
+                credentials = AWSService.get_assumed_role_credentials(
+                    role_arn="arn:aws:iam::123456789012:role/vents",
+                    session_name="shared",
+                    region="us-east-1",
+                )
+                # Another process, with its own in-memory cache
+                entry = AssumeRoleCache(background=False).get("key", credentials.fetch)
+                assert entry.get_credentials() == credentials.get_credentials()
+                assert assume_role.call_count == 1
+        assert config.credentials_cache.stats == {"hits": 1, "misses": 1}
+
+    def test_gc_credentials(self):
+        cache = SharedCredentialsCache(self.path)
+        expiry = datetime.datetime.utcnow().replace(microsecond=0)
+
+        def get_credentials(token: str):
+            credentials = mock.MagicMock(token=None, expiry=None)
+
+            def refresh(request):
+                credentials.token = token
+                credentials.expiry = expiry + datetime.timedelta(hours=1)
+
+            credentials.refresh.side_effect = refresh
+            return credentials
+
+        credentials = share_gc_credentials(get_credentials("foo"), "gcp", cache)
+        credentials.refresh(None)
+        other_credentials = share_gc_credentials(get_credentials("bar"), "gcp", cache)
+        other_credentials.refresh(None)
+        assert other_credentials.token == "foo"
+        assert other_credentials.expiry == expiry + datetime.timedelta(hours=1)
+        assert cache.stats == {"hits": 1, "misses": 1}
+
+    def test_gc_cache_key(self):
+        key_path = os.path.join(self.tmp.name, "key.json")
+        with open(key_path, "w") as f:
+            f.write("{}")
+        key = get_gc_cache_key(key_path, scopes=["scope"])
+        assert get_gc_cache_key(key_path, scopes=["scope"]) == key
+        assert get_gc_cache_key(key_path) != key
+
+        # Rotated key files at the same path get a new key
+        with open(key_path, "w") as f:
+            f.write('{"key": 1}')
+        assert get_gc_cache_key(key_path, scopes=["scope"]) != key
+        assert get_gc_cache_key(keyfile_dict={"a": 1}) != get_gc_cache_key(
+            keyfile_dict={"a": 2}
+        )
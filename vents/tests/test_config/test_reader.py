@@ -1,10 +1,15 @@
 import json
+import mock
 import os
 import tempfile
 from unittest import TestCase
 
+from vents.cache import ResolutionCache
+from vents.config import AppConfig, KeySpec, clear_catalogs_cache
 from vents.connections import ConnectionCatalog
 from vents.connections.connection import Connection
+from vents.env import EnvSnapshot
+from vents.providers.aws.service import AWSService
 from vents.settings import VENTS_CONFIG
 
 
@@ -201,3 +206,286 @@ class TestReader(TestCase):
             # Test with no underscore
             result = VENTS_CONFIG.read_keys(context_paths=[temp_dir], keys=["testkey1"])
             assert result is None
+
+    def test_read_keys_many(self):
+        with tempfile.TemporaryDirectory() as temp_dir1:
+            with tempfile.TemporaryDirectory() as temp_dir2:
+                with open(os.path.join(temp_dir1, "TEST_KEY_1"), "w") as f:
+                    f.write("path_value1")
+                with open(os.path.join(temp_dir2, "test_key_2"), "w") as f:
+                    f.write("false")
+                os.environ["TEST_KEY_3"] = "env_value3"
+                os.environ.pop("TEST_KEY_2", None)
+
+                result = VENTS_CONFIG.read_keys_many(
+                    context_paths=[temp_dir1, "/nonexistent/path", temp_dir2],
+                    schema={"test_key_4": "schema_value4"},
+                    keys={
+                        "key1": ["test_key_1"],
+                        "key2": ["TEST_KEY_2"],
+                        "key3": ["test_key_3"],
+                        "key4": ["test_key_4"],
+                        "key5": ["nonexistent"],
+                    },
+                )
+                assert result == {
+                    "key1": "path_value1",
+                    "key2": False,
+                    "key3": "env_value3",
+                    "key4": "schema_value4",
+                    "key5": None,
+                }
+                os.environ.pop("TEST_KEY_3")
+
+    def test_keys_resolver_scans_context_paths_once(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with open(os.path.join(temp_dir, "test_key_1"), "w") as f:
+                f.write("path_value1")
+            os.mkdir(os.path.join(temp_dir, "test_key_2"))
+
+            resolver = VENTS_CONFIG.get_keys_resolver(context_paths=[temp_dir])
+            with mock.patch("os.scandir", wraps=os.scandir) as scandir:
+                assert resolver.read_keys(["TEST_KEY_1"]) == "path_value1"
+                assert resolver.read_keys(["test_key_2"]) is None
+                assert VENTS_CONFIG.read_keys(["testkey1"], resolver=resolver) is None
+            assert scandir.call_count == 1
+
+    def test_key_spec(self):
+        spec = KeySpec(["test_key_1", "TEST_KEY_2"])
+        assert spec.variants == (
+            "test_key_1",
+            "TEST_KEY_1",
+            "testkey1",
+            "test_key_2",
+            "TEST_KEY_2",
+            "testkey2",
+        )
+        assert spec.get_env_keys(None)[0] == ("test_key_1", None)
+        assert spec.get_env_keys("VENTS")[0] == ("test_key_1", "VENTS_test_key_1")
+        assert spec.get_env_keys("VENTS") is spec.get_env_keys("VENTS")
+        assert spec.get_env_probes("VENTS")[:3] == (
+            ("test_key_1", False),
+            ("VENTS_test_key_1", True),
+            ("TEST_KEY_1", False),
+        )
+        assert spec.get_env_probes("VENTS") is spec.get_env_probes("VENTS")
+
+        os.environ["VENTS_TEST_KEY_2"] = "prefix_value2"
+        assert VENTS_CONFIG.read_keys_from_env(spec) == "prefix_value2"
+        assert VENTS_CONFIG.read_keys(spec) == "prefix_value2"
+        os.environ["test_key_1"] = "value1"
+        assert VENTS_CONFIG.read_keys(spec) == "value1"
+        del os.environ["VENTS_TEST_KEY_2"]
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with open(os.path.join(temp_dir, "testkey2"), "w") as f:
+                f.write("path_value2")
+            assert VENTS_CONFIG.read_keys_from_path([temp_dir], spec) == "path_value2"
+            assert VENTS_CONFIG.read_keys_from_schema({"testkey2": "a"}, spec) == "a"
+
+    def test_resolution_cache(self):
+        config = AppConfig(use_resolution_cache=True)
+        cache = config.resolution_cache
+        assert isinstance(cache, ResolutionCache)
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            # Mimic a mounted secret: key -> ..data/key, ..data -> versioned dir
+            for version, value in [("v1", "value1"), ("v2", "value2")]:
+                os.mkdir(os.path.join(temp_dir, version))
+                with open(os.path.join(temp_dir, version, "test_key_1"), "w") as f:
+                    f.write(value)
+            os.symlink("v1", os.path.join(temp_dir, "..data"))
+            os.symlink(
+                os.path.join("..data", "test_key_1"),
+                os.path.join(temp_dir, "test_key_1"),
+            )
+
+            assert config.read_keys_from_path([temp_dir], ["test_key_1"]) == "value1"
+            assert config.read_keys(["test_key_1"], context_paths=[temp_dir]) == (
+                "value1"
+            )
+            assert cache.hits >= 1
+
+            # Atomic swap of the data symlink
+            os.symlink("v2", os.path.join(temp_dir, "..data_tmp"))
+            os.rename(
+                os.path.join(temp_dir, "..data_tmp"), os.path.join(temp_dir, "..data")
+            )
+            assert config.read_keys_from_path([temp_dir], ["test_key_1"]) == "value2"
+            assert config.read_keys(["test_key_1"], context_paths=[temp_dir]) == (
+                "value2"
+            )
+
+        os.environ["test_key_1"] = "value1"
+        assert config.read_keys_from_env(["test_key_1"]) == "value1"
+        os.environ["test_key_1"] = "value2"
+        hits = cache.hits
+        assert config.read_keys_from_env(["test_key_1"]) == "value1"
+        assert cache.hits == hits + 1
+        cache.invalidate_env()
+        assert config.read_keys_from_env(["test_key_1"]) == "value2"
+        # Explicit envs are not cached
+        assert config.read_keys_from_env(["test_key_1"], env={"test_key_1": "a"}) == "a"
+
+        cache.clear()
+        assert cache.hits == 0
+        assert cache.misses == 0
+        assert cache.stats["files"] == 0
+
+        config.disable_resolution_cache()
+        assert config.resolution_cache is None
+        assert config.enable_resolution_cache() is config.resolution_cache
+
+    def test_env_snapshot(self):
+        snapshot = EnvSnapshot(
+            env={"Test_Key_1": "a", "VENTS_TEST_KEY_2": "b"}, env_prefix="VENTS"
+        )
+        assert snapshot.get_names("testkey1") == ("Test_Key_1",)
+        assert snapshot.get_names("testkey2") == ("VENTS_TEST_KEY_2",)
+        assert snapshot.get_names("ventstestkey2") == ("VENTS_TEST_KEY_2",)
+        assert snapshot.has_any({"foo", "testkey2"}) is True
+        assert snapshot.has_any({"foo"}) is False
+
+        config = AppConfig(use_env_snapshot=True)
+        os.environ["test_key_1"] = "value1"
+        # The snapshot is immutable until refreshed
+        assert config.read_keys_from_env(["test_key_1"]) is None
+        config.refresh_env()
+        assert config.read_keys_from_env(["test_key_1"]) == "value1"
+        assert config.read_keys(KeySpec(["TEST_KEY_1"])) == "value1"
+        assert config.env_snapshot.version == 1
+
+        os.environ["VENTS_test_key_2"] = "prefix_value2"
+        config.refresh_env()
+        assert config.read_keys_from_env(["test_key_2"]) == "prefix_value2"
+
+        config.disable_env_snapshot()
+        assert config.env_snapshot is None
+
+    def test_env_snapshot_update(self):
+        snapshot = EnvSnapshot(
+            env={"test_key_1": "a", "VENTS_TEST_KEY_2": "b"}, env_prefix="VENTS"
+        )
+        probes = KeySpec(["test_key_2"]).get_env_probes("VENTS")
+        assert snapshot.find(probes) == ("b", True)
+
+        assert snapshot.update({"test_key_1": "a"}) == ()
+        assert snapshot.version == 0
+        assert snapshot.update(
+            {"test_key_1": None, "TEST_KEY_2": "true", "foo": None}
+        ) == ("test_key_1", "TEST_KEY_2")
+        assert snapshot.version == 1
+        assert snapshot.get_names("testkey1") == ()
+        assert snapshot.has_any({"testkey1"}) is False
+        assert snapshot.get_names("testkey2") == ("VENTS_TEST_KEY_2", "TEST_KEY_2")
+        assert snapshot.find(probes) == ("true", False)
+
+        snapshot.update({"VENTS_TEST_KEY_2": None})
+        assert snapshot.get_names("ventstestkey2") == ()
+        assert snapshot.get_names("testkey2") == ("TEST_KEY_2",)
+
+    def test_refresh_env_names(self):
+        config = AppConfig(use_env_snapshot=True, use_resolution_cache=True)
+        snapshot = config.env_snapshot
+        cache = config.resolution_cache
+        os.environ["test_key_1"] = "value1"
+        os.environ["test_key_2"] = "value2"
+        config.refresh_env("test_key_1", "test_key_2")
+        # Updated in place
+        assert config.env_snapshot is snapshot
+        assert snapshot.version == 1
+        env_version = config.env_version
+        assert config.read_keys_from_env(["test_key_1"]) == "value1"
+        assert config.read_keys_from_env(["test_key_2"]) == "value2"
+
+        # Unchanged names do not invalidate anything
+        config.refresh_env("test_key_1")
+        assert snapshot.version == 1
+        assert config.env_version == env_version
+        assert cache.stats["env"] == 2
+
+        # Only the lookups reading the changed names are invalidated
+        os.environ["test_key_2"] = "false"
+        config.refresh_env("test_key_2")
+        assert snapshot.version == 2
+        assert config.env_version == env_version + 1
+        assert cache.stats["env"] == 1
+        assert config.read_keys_from_env(["test_key_1"]) == "value1"
+        assert config.read_keys_from_env(["test_key_2"]) is False
+
+        # A full refresh rebuilds the snapshot
+        config.refresh_env()
+        assert config.env_snapshot is not snapshot
+        assert config.env_snapshot.version == 3
+        assert cache.stats["env"] == 0
+
+    def test_set_env_vars_refreshes_env_snapshot(self):
+        VENTS_CONFIG.enable_env_snapshot()
+        try:
+            os.environ.pop("AWS_REGION", None)
+            VENTS_CONFIG.refresh_env()
+            assert VENTS_CONFIG.read_keys(["AWS_REGION"]) is None
+            AWSService(region="test-region").set_env_vars()
+            assert VENTS_CONFIG.read_keys(["AWS_REGION"]) == "test-region"
+        finally:
+            os.environ.pop("AWS_REGION", None)
+            VENTS_CONFIG.disable_env_snapshot()
+
+    def test_lazy_connections_catalog(self):
+        env_name = VENTS_CONFIG.get_connections_catalog_env_name()
+        os.environ[env_name] = (
+            '{"connections": [{"name": "test_conn", "kind": "http"}]}'
+        )
+        try:
+            clear_catalogs_cache()
+            config = AppConfig()
+            assert config._catalog_loaded is False
+            with mock.patch.object(
+                ConnectionCatalog, "read_json", wraps=ConnectionCatalog.read_json
+            ) as read_json:
+                catalog = config.catalog
+                assert config._catalog_loaded is True
+                assert "test_conn" in catalog.connections_by_names
+                # Same payload, the parsed connections are reused
+                other_catalog = AppConfig().catalog
+                assert other_catalog is not catalog
+                assert other_catalog.connections[0] is catalog.connections[0]
+                assert read_json.call_count == 1
+                assert other_catalog.to_dict() == {
+                    "connections": [{"name": "test_conn", "kind": "http"}]
+                }
+                assert json.loads(other_catalog.to_json()) == catalog.to_dict()
+                # Each config mutates its own catalog
+                other_catalog.add(Connection(name="other", kind="http"))
+                assert "other" not in catalog.connections_by_names
+                assert "other" not in AppConfig().catalog.connections_by_names
+
+                os.environ[env_name] = (
+                    '{"connections": [{"name": "test_conn2", "kind": "http"}]}'
+                )
+                assert "test_conn2" in AppConfig().catalog.connections_by_names
+                assert read_json.call_count == 2
+
+            config.catalog = None
+            assert config.catalog is None
+            assert AppConfig(catalog=catalog).catalog is catalog
+
+            # Lazy catalogs are cached separately
+            config = AppConfig(use_lazy_catalog=True)
+            assert config.catalog.is_lazy is True
+            assert config.get_connection_for("test_conn2").name == "test_conn2"
+            assert AppConfig().catalog.is_lazy is False
+        finally:
+            del os.environ[env_name]
+            clear_catalogs_cache()
+
+    def test_read_json_catalog(self):
+        catalog = ConnectionCatalog.read_json(
+            b'{"connections": [{"name": "test_conn", "kind": "http"}]}'
+        )
+        assert "test_conn" in catalog.connections_by_names
+        # Falls back to the generic reader
+        catalog = ConnectionCatalog.read_json(
+            "connections:\n  - name: test_conn\n    kind: http\n"
+        )
+        assert "test_conn" in catalog.connections_by_names
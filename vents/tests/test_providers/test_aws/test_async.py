@@ -0,0 +1,179 @@
+import asyncio
+import threading
+from unittest import TestCase, mock
+
+from aiobotocore.awsrequest import AioAWSResponse
+import aiobotocore.endpoint
+from moto import mock_aws
+
+from tests.test_providers.test_aws.test_credentials import ROLE_ARN, get_connection
+from vents.providers.aws.clients import AWS_ASYNC_CLIENTS_CACHE
+from vents.providers.aws.credentials import (
+    STS_CREDENTIALS_CACHE,
+    AssumedRoleCredentials,
+)
+from vents.providers.aws.s3 import S3Service
+from vents.providers.aws.service import AWSService
+
+
+convert_to_response_dict = aiobotocore.endpoint.convert_to_response_dict
+
+
+async def convert_moto_response(http_response, operation_model):
+    # Moto returns botocore responses, their content is not awaitable
+    if isinstance(http_response, AioAWSResponse):
+        return await convert_to_response_dict(http_response, operation_model)
+    return {
+        "headers": http_response.headers,
+        "status_code": http_response.status_code,
+        "context": {"operation_name": operation_model.name},
+        "body": http_response.content,
+    }
+
+
+@mock.patch("aiobotocore.endpoint.convert_to_response_dict", convert_moto_response)
+class TestAsyncService(TestCase):
+    def setUp(self):
+        AWS_ASYNC_CLIENTS_CACHE.clear()
+        STS_CREDENTIALS_CACHE.clear()
+
+    def tearDown(self):
+        AWS_ASYNC_CLIENTS_CACHE.clear()
+        STS_CREDENTIALS_CACHE.clear()
+
+    @mock_aws
+    def test_async_clients(self):
+        service = AWSService(
+            resource="s3",
+            access_key_id="a1",
+            secret_access_key="a2",
+            region="us-east-1",
+            is_async=True,
+        )
+
+        async def run():
+            async with AWS_ASYNC_CLIENTS_CACHE:
+                client = await service.get_async_client()
+                assert await service.get_async_client() is client
+                assert await S3Service(**service.to_dict()).get_async_client() is client
+                assert client.meta.config.max_pool_connections == 10
+                await client.create_bucket(Bucket="bucket")
+                assert AWS_ASYNC_CLIENTS_CACHE.stats == {
+                    "hits": 2,
+                    "misses": 1,
+                    "clients": 1,
+                }
+            assert AWS_ASYNC_CLIENTS_CACHE.stats["clients"] == 0
+
+            async with service.async_client() as client:
+                response = await client.list_buckets()
+            return [b["Name"] for b in response["Buckets"]]
+
+        assert asyncio.run(run()) == ["bucket"]
+
+        # Clients are bound to their loop
+        async def get_client():
+            client = await service.get_async_client()
+            await AWS_ASYNC_CLIENTS_CACHE.close()
+            return client
+
+        assert asyncio.run(get_client()) is not asyncio.run(get_client())
+
+    @mock_aws
+    def test_load_from_connection_async(self):
+        with mock.patch.object(
+            AWSService, "assume_role", wraps=AWSService.assume_role
+        ) as assume_role:
+
+            async def run():
+                service = await AWSService.load_from_connection_async(get_connection())
+                assert service.is_async
+                s3_service = await S3Service.load_from_connection_async(
+                    get_connection()
+                )
+                assert s3_service.session.asynchronous
+                assert s3_service.credentials is service.credentials
+                credentials = await service.session.get_credentials()
+                assert credentials.method == "sts-assume-role"
+                frozen_credentials = await credentials.get_frozen_credentials()
+                assert frozen_credentials.access_key == service.access_key_id
+                return service
+
+            service = asyncio.run(run())
+            assert assume_role.call_count == 0
+            assert service.credentials.refreshes == 1
+
+            # Cached, and refreshed with the sync fetch
+            other_service = AWSService.load_from_connection(get_connection())
+            assert other_service.credentials is service.credentials
+            service.credentials.refresh()
+            assert assume_role.call_count == 1
+        assert len(STS_CREDENTIALS_CACHE) == 1
+
+    @mock_aws
+    def test_load_from_connection_async_refreshes_off_the_loop(self):
+        service = AWSService.load_from_connection(get_connection())
+        entry = service.credentials
+        # Expiring, e.g. after the background refresh was missed
+        STS_CREDENTIALS_CACHE.stop()
+        entry._expiry = 0.0
+        refresh_threads = []
+        refresh = AssumedRoleCredentials._refresh
+
+        def record_refresh(credentials):
+            refresh_threads.append(threading.get_ident())
+            return refresh(credentials)
+
+        async def run():
+            loop_thread = threading.get_ident()
+            with mock.patch.object(
+                AssumedRoleCredentials, "_refresh", autospec=True
+            ) as patched:
+                patched.side_effect = record_refresh
+                service = await AWSService.load_from_connection_async(get_connection())
+            return loop_thread, service
+
+        loop_thread, async_service = asyncio.run(run())
+        assert async_service.credentials is entry
+        assert len(refresh_threads) == 1
+        assert refresh_threads[0] != loop_thread
+        assert async_service.session_token == entry.get_credentials()["SessionToken"]
+
+    @mock_aws
+    def test_async_sessions_refresh_off_the_loop(self):
+        service = AWSService.load_from_connection(get_connection())
+        entry = service.credentials
+        # E.g. evicted while idle, or inherited by a forked worker
+        STS_CREDENTIALS_CACHE.clear()
+        STS_CREDENTIALS_CACHE.stop()
+        entry._expiry = 0.0
+        refresh_threads = []
+        refresh = AssumedRoleCredentials._refresh
+
+        def record_refresh(credentials):
+            refresh_threads.append(threading.get_ident())
+            return refresh(credentials)
+
+        async def run():
+            with mock.patch.object(
+                AssumedRoleCredentials, "_refresh", autospec=True
+            ) as patched:
+                patched.side_effect = record_refresh
+                credentials = await service.get_aio_session().get_credentials()
+                frozen_credentials = await credentials.get_frozen_credentials()
+            return threading.get_ident(), frozen_credentials
+
+        loop_thread, frozen_credentials = asyncio.run(run())
+        assert len(refresh_threads) == 1
+        assert refresh_threads[0] != loop_thread
+        assert frozen_credentials.token == entry.get_credentials()["SessionToken"]
+
+    @mock_aws
+    def test_assume_role_async(self):
+        credentials = asyncio.run(
+            AWSService.assume_role_async(
+                role_arn=ROLE_ARN, session_name="vents", region="us-east-1"
+            )
+        )
+        assert credentials["AccessKeyId"]
+        assert credentials["SessionToken"]
@@ -0,0 +1,98 @@
+import os
+import threading
+import time
+from unittest import TestCase, mock
+
+import boto3
+from moto import mock_aws
+
+from vents.providers.aws.base import get_aws_client, get_aws_resource
+from vents.providers.aws.clients import AWS_CLIENTS_CACHE
+from vents.providers.aws.s3 import S3Service
+from vents.providers.aws.service import AWSService
+
+
+class TestClientsCache(TestCase):
+    def setUp(self):
+        AWS_CLIENTS_CACHE.clear()
+
+    def tearDown(self):
+        AWS_CLIENTS_CACHE.clear()
+
+    @mock_aws
+    def test_service_clients(self):
+        service = AWSService(
+            resource="s3",
+            access_key_id="a1",
+            secret_access_key="a2",
+            region="us-east-1",
+        )
+        client = service.get_client()
+        assert service.get_client() is client
+        assert AWSService(**service.to_dict()).get_client() is client
+        assert S3Service(**service.to_dict()).get_client() is client
+        assert client.meta.config.max_pool_connections == 10
+
+        other_region = AWSService(**{**service.to_dict(), "region": "eu-west-1"})
+        assert other_region.get_client() is not client
+        other_credentials = AWSService(
+            **{**service.to_dict(), "secret_access_key": "b2"}
+        )
+        assert other_credentials.get_client() is not client
+        pool = AWSService(**{**service.to_dict(), "max_pool_connections": 50})
+        assert pool.get_client().meta.config.max_pool_connections == 50
+        assert AWS_CLIENTS_CACHE.stats == {"hits": 3, "misses": 4, "clients": 4}
+
+        client.create_bucket(Bucket="bucket")
+        assert pool.get_resource().Bucket("bucket").name == "bucket"
+
+    @mock_aws
+    def test_concurrent_clients(self):
+        service = AWSService(resource="s3", region="us-east-1")
+        session = service.get_boto3_session()
+        clients = []
+
+        def session_factory():
+            time.sleep(0.05)  # The other threads hit the lock meanwhile
+            return session
+
+        def get_client():
+            clients.append(
+                AWS_CLIENTS_CACHE.get_client(
+                    session_factory, service_name="s3", region_name="us-east-1"
+                )
+            )
+
+        threads = [threading.Thread(target=get_client) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len({id(c) for c in clients}) == 1
+        assert AWS_CLIENTS_CACHE.stats["misses"] == 1
+
+    @mock_aws
+    def test_resources_per_thread(self):
+        service = AWSService(resource="s3", region="us-east-1")
+        resource = service.get_resource()
+        assert service.get_resource() is resource
+        resources = []
+        thread = threading.Thread(
+            target=lambda: resources.append(service.get_resource())
+        )
+        thread.start()
+        thread.join()
+        assert resources[0] is not resource
+
+    @mock_aws
+    def test_module_clients(self):
+        with mock.patch.dict(os.environ, {"AWS_REGION": "us-east-1"}):
+            with mock.patch(
+                "boto3.session.Session", wraps=boto3.session.Session
+            ) as session:
+                client = get_aws_client("s3")
+                assert get_aws_client("s3") is client
+                assert get_aws_client("s3", max_pool_connections=20) is not client
+                resource = get_aws_resource("s3")
+                assert get_aws_resource("s3") is resource
+                assert session.call_count == 3
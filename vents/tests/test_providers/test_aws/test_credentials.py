@@ -0,0 +1,209 @@
+import asyncio
+import datetime
+import os
+import time
+from unittest import TestCase, mock, skipUnless
+
+from moto import mock_aws
+
+from vents.connections.connection import Connection
+from vents.providers.aws.credentials import (
+    STS_CREDENTIALS_CACHE,
+    AssumedRoleCredentials,
+    AssumeRoleCache,
+)
+from vents.providers.aws.s3 import S3Service
+from vents.providers.aws.service import AWSService
+from vents.providers.kinds import ProviderKind
+
+
+ROLE_ARN = "arn:aws:iam::123456789012:role/vents"
+
+
+def get_connection(session_name: str = "vents") -> Connection:
+    return Connection(
+        name="s3",
+        kind=ProviderKind.S3,
+        env={
+            "AWS_REGION": "us-east-1",
+            "AWS_ACCESS_KEY_ID": "source",
+            "AWS_SECRET_ACCESS_KEY": "secret",
+            "AWS_ASSUME_ROLE": "true",
+            "AWS_ROLE_ARN": ROLE_ARN,
+            "AWS_SESSION_NAME": session_name,
+            "AWS_SESSION_DURATION": "3600",
+        },
+    )
+
+
+class TestAssumeRoleCache(TestCase):
+    def setUp(self):
+        STS_CREDENTIALS_CACHE.clear()
+
+    def tearDown(self):
+        STS_CREDENTIALS_CACHE.clear()
+
+    @mock_aws
+    def test_assume_role_is_cached(self):
+        with mock.patch.object(
+            AWSService, "assume_role", wraps=AWSService.assume_role
+        ) as assume_role:
+            service = AWSService.load_from_connection(get_connection())
+            assert service.credentials is not None
+            assert service.session_token
+            session_credentials = service.session.get_credentials()
+            assert session_credentials.access_key == service.access_key_id
+            assert session_credentials.token == service.session_token
+            assert session_credentials.method == "sts-assume-role"
+
+            other_service = S3Service.load_from_connection(get_connection())
+            assert other_service.credentials is service.credentials
+            assert other_service.session_token == service.session_token
+            assert assume_role.call_count == 1
+
+            S3Service.load_from_connection(get_connection(session_name="other"))
+            assert assume_role.call_count == 2
+        assert len(STS_CREDENTIALS_CACHE) == 2
+
+    @mock_aws
+    def test_refresh_before_expiry(self):
+        cache = AssumeRoleCache(background=False)
+        credentials = AWSService.get_assumed_role_credentials(
+            role_arn=ROLE_ARN,
+            session_name="vents",
+            session_duration=3600,
+            region="us-east-1",
+        )
+        entry = cache.get("vents", credentials.fetch)
+        token = entry.get_credentials()["SessionToken"]
+        assert entry.refreshes == 1
+
+        # Not expiring yet
+        assert cache.refresh_expiring() > 0
+        assert entry.refreshes == 1
+
+        refreshable = entry.get_refreshable_credentials()
+        expiring_at = entry.expiry - entry.margin + 1
+        delay = cache.refresh_expiring(now=expiring_at)
+        assert entry.refreshes == 2
+        assert 0 < delay <= cache.refresh_margin
+        new_token = entry.get_credentials()["SessionToken"]
+        assert new_token != token
+
+        # Botocore credentials read the refreshed credentials from the cache
+        with mock.patch.object(
+            refreshable,
+            "refresh_needed",
+            side_effect=lambda *_, **__: (
+                refreshable._frozen_credentials.token != new_token
+            ),
+        ):
+            assert refreshable.get_frozen_credentials().token == new_token
+        assert entry.refreshes == 2
+
+    def test_short_lived_and_failed_refreshes(self):
+        expiration = datetime.datetime.now(tz=datetime.timezone.utc)
+        fetch = mock.MagicMock(
+            return_value={
+                "AccessKeyId": "key",
+                "SecretAccessKey": "secret",
+                "SessionToken": "token",
+                "Expiration": expiration + datetime.timedelta(seconds=900),
+            }
+        )
+        entry = AssumedRoleCredentials(fetch=fetch)
+        entry.get_metadata()
+        entry.get_metadata()
+        assert fetch.call_count == 1
+        assert 440 < entry.margin <= 450
+
+        cache = AssumeRoleCache(background=False)
+        cache._entries["key"] = entry
+        fetch.side_effect = ValueError("STS is down")
+        with self.assertLogs("vents.providers.aws.credentials", "WARNING"):
+            assert cache.refresh_expiring(now=entry.expiry) == 30
+
+    def get_fetch(self):
+        expiration = datetime.datetime.now(tz=datetime.timezone.utc)
+        return mock.MagicMock(
+            return_value={
+                "AccessKeyId": "key",
+                "SecretAccessKey": "secret",
+                "SessionToken": "token",
+                "Expiration": expiration + datetime.timedelta(hours=1),
+            }
+        )
+
+    def test_failed_first_fetch_is_not_cached(self):
+        cache = AssumeRoleCache(background=False)
+        fetch = self.get_fetch()
+        fetch.side_effect = ValueError("Access denied")
+        with self.assertRaises(ValueError):
+            cache.get("key", fetch)
+        assert len(cache) == 0
+        assert cache.refresh_expiring() == cache.refresh_margin
+        assert fetch.call_count == 1
+
+        fetch.side_effect = None
+        assert cache.get("key", fetch).refreshes == 1
+        assert len(cache) == 1
+
+    def test_idle_credentials_are_evicted(self):
+        cache = AssumeRoleCache(background=False, idle_ttl=60)
+        entry = cache.get("key", self.get_fetch())
+        other_entry = cache.get("other", self.get_fetch())
+        entry.last_used -= 120
+        cache.refresh_expiring()
+        assert cache.find("key") is None
+        assert cache.find("other") is other_entry
+
+        # Used credentials are kept
+        other_entry.get_metadata()
+        assert cache.evict_idle(now=time.time() + 30) == 0
+        assert cache.evict_idle(now=time.time() + 120) == 1
+        assert len(cache) == 0
+
+    def test_after_fork(self):
+        cache = AssumeRoleCache(background=False)
+        entry = cache.get("key", self.get_fetch())
+        # Held by threads that do not exist in the child
+        cache._lock.acquire()
+        entry._lock.acquire()
+        cache.background = True
+        cache._after_fork()
+        try:
+            assert not cache._lock.locked()
+            assert not entry._lock.locked()
+            assert cache._is_running()
+        finally:
+            cache.stop()
+
+    @skipUnless(hasattr(os, "fork"), "Requires fork")
+    def test_forked_process_restarts_refresh_thread(self):
+        cache = AssumeRoleCache()
+        cache.get("key", self.get_fetch())
+        assert cache._is_running()
+        pid = os.fork()
+        if pid == 0:  # Child
+            os._exit(0 if cache._is_running() else 1)
+        try:
+            _, status = os.waitpid(pid, 0)
+            assert os.WIFEXITED(status) and os.WEXITSTATUS(status) == 0
+        finally:
+            cache.stop()
+
+    def test_background_thread(self):
+        cache = AssumeRoleCache()
+        cache.start()
+        assert cache._is_running()
+        cache.stop()
+        assert not cache._is_running()
+
+    @mock_aws
+    def test_s3_filesystem_credentials(self):
+        service = S3Service.load_from_connection(get_connection())
+        fs = service.get_fs(asynchronous=True, skip_instance_cache=True)
+        assert fs.key is None
+        credentials = asyncio.run(fs.session.get_credentials())
+        frozen_credentials = asyncio.run(credentials.get_frozen_credentials())
+        assert frozen_credentials.access_key == service.access_key_id
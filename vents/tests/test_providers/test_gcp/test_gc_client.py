@@ -7,11 +7,11 @@ from vents.providers.gcp.service import GCPService
 from vents.settings import VENTS_CONFIG
 
 
-GCS_MODULE = "vents.providers.gcp.base.{}"
+GCS_MODULE = "google.oauth2.service_account.{}"
 
 
 class TestGCClient(TestCase):
-    @mock.patch(GCS_MODULE.format("google.auth.default"))
+    @mock.patch("google.auth.default")
     def test_get_default_gc_credentials(self, default_auth):
         default_auth.return_value = None, None
         credentials = get_gc_credentials(key_path=None, keyfile_dict=None, scopes=None)
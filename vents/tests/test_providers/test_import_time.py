@@ -0,0 +1,84 @@
+import re
+import subprocess
+import sys
+from unittest import TestCase
+
+
+# Import budgets in milliseconds, measured on top of the core modules,
+# an order of magnitude above the recorded times and below the SDKs' import times
+IMPORT_BUDGETS = {
+    "vents": 50,
+    "vents.providers.registry": 50,
+    "vents.providers.aws.service": 50,
+    "vents.providers.aws.s3": 50,
+    "vents.providers.gcp.service": 50,
+    "vents.providers.gcp.gcs": 50,
+    "vents.providers.azure.service": 50,
+    "vents.providers.azure.blob_storage": 50,
+    "vents.providers.slack.service": 50,
+    "vents.providers.discord.service": 50,
+}
+
+HEAVY_MODULES = ["boto3", "botocore", "s3fs", "gcsfs", "adlfs", "google.auth", "azure"]
+
+CORE_IMPORTS = (
+    "import vents.settings\n"
+    "vents.settings.create_app()\n"
+    "import vents.config, vents.connections, vents.providers.base\n"
+)
+
+_IMPORT_TIME = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \|\s*(\S+)$")
+
+
+def get_import_time(module: str) -> float:
+    """Returns the cumulative import time of a module in ms, see `-X importtime`."""
+    code = "import {}\n".format(module)
+    if module != "vents":
+        code = CORE_IMPORTS + code
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    for line in result.stderr.splitlines():
+        match = _IMPORT_TIME.match(line)
+        if match and match.group(2) == module:
+            return int(match.group(1)) / 1000
+    raise AssertionError("Module `{}` was already imported.".format(module))
+
+
+class TestImportTime(TestCase):
+    def test_heavy_modules_are_not_imported(self):
+        code = (
+            "import sys\n"
+            "{}"
+            "{}"
+            "heavy = [m for m in {!r} if m in sys.modules]\n"
+            "assert not heavy, heavy\n"
+        ).format(
+            CORE_IMPORTS,
+            "".join("import {}\n".format(m) for m in IMPORT_BUDGETS),
+            HEAVY_MODULES,
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_azure_loggers_are_quieted(self):
+        code = (
+            "import logging\n"
+            "{}"
+            "import vents.providers.azure.service\n"
+            "assert logging.getLogger('azure').level == logging.WARNING\n"
+        ).format(CORE_IMPORTS)
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_import_budgets(self):
+        exceeded = {}
+        for module, budget in IMPORT_BUDGETS.items():
+            elapsed = get_import_time(module)
+            if elapsed > budget:
+                # Retried once, a single run can be slowed down by the machine
+                elapsed = min(elapsed, get_import_time(module))
+            if elapsed > budget:
+                exceeded[module] = elapsed
+        assert not exceeded, "Import budgets exceeded (ms): {}".format(exceeded)
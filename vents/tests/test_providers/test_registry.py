@@ -0,0 +1,83 @@
+import subprocess
+import sys
+from unittest import TestCase, mock
+
+from vents.connections.connection import Connection
+from vents.exceptions import VentError
+from vents.providers.aws.s3 import S3Service
+from vents.providers.base import BaseService
+from vents.providers.kinds import ProviderKind
+from vents.providers.registry import PROVIDERS_REGISTRY, ProviderRegistry, service_for
+
+
+class CustomService(BaseService):
+    url: str = ""
+
+    @classmethod
+    def load_from_connection(cls, connection=None):
+        return cls(url=connection.schema_.url)
+
+    def _set_session(self):
+        self._session = self.url
+
+
+class TestProviderRegistry(TestCase):
+    def test_lazy_imports(self):
+        code = (
+            "import sys\n"
+            "from vents import settings\n"
+            "settings.create_app()\n"
+            "from vents.providers.registry import PROVIDERS_REGISTRY\n"
+            "assert 'google.auth' not in sys.modules\n"
+            "assert 's3fs' not in sys.modules\n"
+            "PROVIDERS_REGISTRY.get('s3')\n"
+            "assert 'vents.providers.aws.s3' in sys.modules\n"
+            "assert 'vents.providers.gcp.gcs' not in sys.modules\n"
+        )
+        subprocess.run([sys.executable, "-c", code], check=True)
+
+    def test_service_for(self):
+        assert PROVIDERS_REGISTRY.get(ProviderKind.S3) is S3Service
+        assert PROVIDERS_REGISTRY.get("s3") is S3Service
+        assert PROVIDERS_REGISTRY.get("mysql") is None
+        connection = Connection(name="s3", kind=ProviderKind.S3)
+        service = service_for(connection)
+        assert isinstance(service, S3Service)
+        with self.assertRaises(VentError):
+            service_for(Connection(name="db", kind=ProviderKind.MYSQL))
+
+    def test_register(self):
+        registry = ProviderRegistry()
+        connection = Connection(
+            name="custom", kind=ProviderKind.CUSTOM, schema_={"url": "foo"}
+        )
+        with self.assertRaises(VentError):
+            registry.service_for(connection)
+        registry.register(ProviderKind.CUSTOM, CustomService)
+        assert registry.service_for(connection).url == "foo"
+        registry.register(
+            ProviderKind.CUSTOM, "tests.test_providers.test_registry:CustomService"
+        )
+        assert registry.get(ProviderKind.CUSTOM) is CustomService
+        registry.unregister(ProviderKind.CUSTOM)
+        assert registry.get(ProviderKind.CUSTOM) is None
+        with self.assertRaises(VentError):
+            registry.register("foo", "tests.test_providers.test_registry")
+            registry.get("foo")
+
+    def test_entry_points(self):
+        entry_point = mock.MagicMock()
+        entry_point.name = "custom"
+        entry_point.value = "tests.test_providers.test_registry:CustomService"
+        s3_entry_point = mock.MagicMock()
+        s3_entry_point.name = "s3"
+        s3_entry_point.value = "tests.test_providers.test_registry:CustomService"
+        registry = ProviderRegistry()
+        with mock.patch(
+            "importlib.metadata.entry_points",
+            return_value=[entry_point, s3_entry_point],
+        ):
+            assert "custom" in registry.kinds
+        assert registry.get("custom") is CustomService
+        # Entry points do not override registered kinds
+        assert registry.get("s3") is S3Service
@@ -0,0 +1,148 @@
+import os
+import tempfile
+from typing import ClassVar
+from unittest import TestCase, mock
+
+from vents.connections.catalog import ConnectionCatalog
+from vents.connections.connection import Connection
+from vents.providers.aws.s3 import S3Service
+from vents.providers.base import BaseService
+from vents.providers.kinds import ProviderKind
+from vents.providers.service_registry import (
+    ServiceRegistry,
+    clear_fingerprints,
+    get_context_paths,
+)
+from vents.settings import VENTS_CONFIG
+
+
+class CountingService(BaseService):
+    token: str = ""
+    builds: ClassVar[int] = 0
+
+    @classmethod
+    def load_from_connection(cls, connection=None):
+        CountingService.builds += 1
+        context_path = connection.secret.mount_path
+        with open(os.path.join(context_path, "TOKEN")) as f:
+            return cls(token=f.read())
+
+    def _set_session(self):
+        self._session = object()
+
+
+class TestServiceRegistry(TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.write_token("foo")
+        self.connection = Connection(
+            name="custom",
+            kind=ProviderKind.CUSTOM,
+            secret={"name": "token", "mountPath": self.tmp.name},
+        )
+        self.catalog = ConnectionCatalog(connections=[self.connection])
+        CountingService.builds = 0
+        clear_fingerprints()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        clear_fingerprints()
+
+    def write_token(self, value: str, mtime_ns: int = 0, replace: bool = False):
+        path = os.path.join(self.tmp.name, "TOKEN")
+        if replace:
+            # Atomic swap, changes the directory
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w") as f:
+                f.write(value)
+            os.replace(tmp_path, path)
+            return
+        with open(path, "w") as f:
+            f.write(value)
+        if mtime_ns:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def get(self, registry, catalog=None):
+        return registry.get(
+            "custom", catalog=catalog or self.catalog, service_class=CountingService
+        )
+
+    def test_caches_services_and_sessions(self):
+        registry = ServiceRegistry()
+        service = self.get(registry)
+        assert service.token == "foo"
+        assert self.get(registry) is service
+        assert self.get(registry).session is service.session
+        assert CountingService.builds == 1
+        assert registry.stats == {"hits": 2, "misses": 1, "evictions": 0, "size": 1}
+
+        # Equal connections from a reloaded catalog hit the cache
+        catalog = ConnectionCatalog(connections=[self.connection.model_copy()])
+        assert self.get(registry, catalog) is service
+
+        registry.invalidate("custom")
+        assert self.get(registry) is not service
+        assert CountingService.builds == 2
+
+    def test_invalidates_on_secret_changes(self):
+        registry = ServiceRegistry()
+        service = self.get(registry)
+        self.write_token("bar", replace=True)
+        new_service = self.get(registry)
+        assert new_service is not service
+        assert new_service.token == "bar"
+        assert self.get(registry) is new_service
+
+        # Files edited in place are checked again after the interval
+        self.write_token("baz", mtime_ns=10**18)
+        with mock.patch("vents.providers.service_registry.FINGERPRINT_INTERVAL", 0):
+            last_service = self.get(registry)
+        assert last_service is not new_service
+        assert last_service.token == "baz"
+
+    def test_unchanged_directories_are_not_listed(self):
+        registry = ServiceRegistry()
+        service = self.get(registry)
+        with mock.patch("os.listdir", side_effect=AssertionError) as listdir:
+            assert self.get(registry) is service
+        assert listdir.call_count == 0
+
+    def test_context_paths_skip_refs(self):
+        connection = Connection(
+            name="custom",
+            kind=ProviderKind.CUSTOM,
+            secret="{{ secret }}",
+            config_map={"name": "config", "mountPath": self.tmp.name},
+        )
+        assert get_context_paths(connection) == [self.tmp.name]
+        assert get_context_paths(None) == []
+
+    def test_invalidates_on_connection_and_env_changes(self):
+        registry = ServiceRegistry()
+        service = self.get(registry)
+        connection = Connection.from_dict(
+            {**self.connection.to_dict(), "tags": ["foo"]}
+        )
+        catalog = ConnectionCatalog(connections=[connection])
+        new_service = self.get(registry, catalog)
+        assert new_service is not service
+
+        VENTS_CONFIG.refresh_env()
+        assert self.get(registry, catalog) is not new_service
+        assert CountingService.builds == 3
+
+    def test_lru_and_ttl(self):
+        registry = ServiceRegistry(maxsize=1, ttl=60)
+        service = self.get(registry)
+        with mock.patch("time.monotonic", return_value=10**9):
+            assert self.get(registry) is not service
+        assert registry.stats["misses"] == 2
+
+        s3_connection = Connection(name="s3", kind=ProviderKind.S3)
+        catalog = ConnectionCatalog(connections=[s3_connection])
+        s3_service = registry.get("s3", catalog=catalog)
+        assert isinstance(s3_service, S3Service)
+        assert S3Service.get_from_catalog("s3", catalog) is not None
+        assert len(registry) == 1
+        assert registry.stats["evictions"] == 1
+        assert registry.get("foo", catalog=catalog) is None
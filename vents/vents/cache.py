@@ -0,0 +1,240 @@
+import contextlib
+import hashlib
+import os
+import tempfile
+import time
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from clipped.utils.json import orjson_dumps, orjson_loads
+
+
+try:
+    import fcntl
+except ImportError:  # Windows, the writes are still atomic
+    fcntl = None  # type: ignore
+
+
+class ResolutionCache:
+    """Memoizes the values resolved by `AppConfig` across service rebuilds.
+
+    Files are cached by `(context path, key)` and revalidated by the inode and
+    `st_mtime_ns` of the resolved file, so a secret rotated with an atomic
+    symlink swap (e.g. Kubernetes mounted secrets) is picked up on next read.
+    Directory scans are revalidated the same way on the context path.
+    Env lookups are cached against `env_version`, call `invalidate_env`
+    when the environment changes, with the changed names to only drop
+    the lookups reading them.
+    """
+
+    MISSING = object()
+
+    def __init__(self):
+        self._files: Dict[Tuple[str, str], Tuple[int, int, int, str]] = {}
+        self._scans: Dict[str, Tuple[int, int, int, List[Tuple[str, str]]]] = {}
+        self._env: Dict[Hashable, Tuple[int, Any]] = {}
+        self._env_names: Dict[str, Set[Hashable]] = {}
+        self.env_version = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _get_stat(path: str) -> Optional[os.stat_result]:
+        try:
+            return os.stat(path)
+        except OSError:
+            return None
+
+    def read_file(self, path: str) -> Optional[str]:
+        """Returns the content of a file, `None` if it does not exist."""
+        cache_key = os.path.split(path)
+        stat = self._get_stat(path)
+        if stat is None:
+            self._files.pop(cache_key, None)
+            return None
+        entry = self._files.get(cache_key)
+        if entry and entry[:3] == (stat.st_dev, stat.st_ino, stat.st_mtime_ns):
+            self.hits += 1
+            return entry[3]
+
+        self.misses += 1
+        with open(path) as f:
+            value = f.read()
+        self._files[cache_key] = (stat.st_dev, stat.st_ino, stat.st_mtime_ns, value)
+        return value
+
+    def scan(
+        self, context_path: str, scan_fn: Callable[[str], List[Tuple[str, str]]]
+    ) -> List[Tuple[str, str]]:
+        """Returns the `(name, path)` files of a context path, scanned by `scan_fn`."""
+        stat = self._get_stat(context_path)
+        if stat is None:
+            self._scans.pop(context_path, None)
+            return scan_fn(context_path)
+        entry = self._scans.get(context_path)
+        if entry and entry[:3] == (stat.st_dev, stat.st_ino, stat.st_mtime_ns):
+            self.hits += 1
+            return entry[3]
+
+        self.misses += 1
+        value = scan_fn(context_path)
+        self._scans[context_path] = (
+            stat.st_dev,
+            stat.st_ino,
+            stat.st_mtime_ns,
+            value,
+        )
+        return value
+
+    def get_env(self, key: Hashable) -> Any:
+        """Returns the cached env lookup or `MISSING` if stale or not cached."""
+        entry = self._env.get(key)
+        if entry is not None and entry[0] == self.env_version:
+            self.hits += 1
+            return entry[1]
+        self.misses += 1
+        return self.MISSING
+
+    def set_env(
+        self, key: Hashable, value: Any, names: Optional[Iterable[str]] = None
+    ) -> None:
+        """Caches an env lookup, `names` are the env names it reads."""
+        self._env[key] = (self.env_version, value)
+        for name in names or ():
+            self._env_names.setdefault(name, set()).add(key)
+
+    def invalidate_env(self, names: Optional[Iterable[str]] = None) -> None:
+        """Drops the lookups reading `names`, all the lookups if not set."""
+        if names is None:
+            self.env_version += 1
+            self._env = {}
+            self._env_names = {}
+            return
+        for name in names:
+            for key in self._env_names.pop(name, ()):
+                self._env.pop(key, None)
+
+    def clear(self) -> None:
+        self._files = {}
+        self._scans = {}
+        self.invalidate_env()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "files": len(self._files),
+            "scans": len(self._scans),
+            "env": len(self._env),
+        }
+
+
+class SharedCredentialsCache:
+    """File-backed credentials cache shared by the processes of a host.
+
+    Each entry is a JSON file with the credentials and their expiry,
+    written atomically and readable by the owner only.
+    Entries are served while they expire in more than `margin` seconds,
+    or half their lifetime for short-lived credentials,
+    otherwise a single process refreshes them under an exclusive file lock,
+    and the processes waiting for the lock read the refreshed entry.
+    Use a path private to the application, e.g. a tmpfs mount.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+
+    def _get_path(self, key: str) -> str:
+        name = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+        return os.path.join(self.path, name)
+
+    def _read(self, path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, "rb") as f:
+                return orjson_loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, path: str, entry: Dict[str, Any]) -> None:
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(orjson_dumps(entry))
+            os.replace(tmp_path, path)
+        except BaseException:
+            with contextlib.suppress(OSError):
+                os.remove(tmp_path)
+            raise
+
+    @contextlib.contextmanager
+    def _lock(self, path: str) -> Iterator[None]:
+        fd = os.open(path + ".lock", os.O_RDWR | os.O_CREAT, 0o600)
+        with os.fdopen(fd, "r+") as f:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _is_fresh(entry: Optional[Dict[str, Any]], margin: float) -> bool:
+        if not entry:
+            return False
+        expiry = entry.get("expiry", 0)
+        margin = min(margin, (expiry - entry.get("issued", 0)) / 2)
+        return expiry - time.time() > margin
+
+    def get(
+        self,
+        key: str,
+        fetch: Callable[[], Tuple[Dict[str, Any], float]],
+        margin: float = 0,
+    ) -> Dict[str, Any]:
+        """Returns the cached credentials of `key`.
+
+        `fetch` returns the new credentials, JSON serializable,
+        and their expiry timestamp.
+        """
+        path = self._get_path(key)
+        entry = self._read(path)
+        if self._is_fresh(entry, margin):
+            self.hits += 1
+            return entry["value"]  # type: ignore
+
+        os.makedirs(self.path, mode=0o700, exist_ok=True)
+        with self._lock(path):
+            # Another process may have refreshed it while waiting for the lock
+            entry = self._read(path)
+            if self._is_fresh(entry, margin):
+                self.hits += 1
+                return entry["value"]  # type: ignore
+            self.misses += 1
+            issued = time.time()
+            value, expiry = fetch()
+            self._write(path, {"issued": issued, "expiry": expiry, "value": value})
+        return value
+
+    def delete(self, key: str) -> None:
+        with contextlib.suppress(OSError):
+            os.remove(self._get_path(key))
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
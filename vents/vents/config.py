@@ -1,19 +1,194 @@
+from collections import OrderedDict
+import functools
+import hashlib
 import logging
 import os
-from typing import Any, Dict, List, Optional, Set, Type, Union
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Type, Union
 
-from clipped.compact.pydantic import Field
+from clipped.compact.pydantic import Field, PrivateAttr
 from clipped.config.parser import ConfigParser
 from clipped.config.schema import BaseSchemaModel
 from clipped.types import Uri
 from clipped.utils.paths import check_dirname_exists
+from vents.cache import ResolutionCache, SharedCredentialsCache
 from vents.connections import ConnectionCatalog
 from vents.connections.connection import Connection
+from vents.connections.streaming import StreamingCatalog
+from vents.env import EnvSnapshot, normalize_env_key
 from vents.exceptions import VentError
 
 
 _logger = logging.getLogger("vents.config.reader")
 
+_CATALOGS_CACHE_SIZE = 8
+_catalogs_cache: "OrderedDict[Tuple, ConnectionCatalog]" = OrderedDict()
+
+
+def get_catalog_cache_key(payload: str) -> Tuple[str, int, int]:
+    """Returns the hash of a catalog payload, with the file stat if it's a path."""
+    digest = hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+    if not payload.lstrip().startswith("{"):
+        try:
+            stat = os.stat(payload)
+            return digest, stat.st_mtime_ns, stat.st_size
+        except (OSError, ValueError):
+            pass
+    return digest, 0, 0
+
+
+def clear_catalogs_cache() -> None:
+    _catalogs_cache.clear()
+
+
+class KeySpec:
+    """Precompiled lookup table for a list of keys.
+
+    Holds the ordered key variants (lower, upper, no underscores),
+    their normalized form for `EnvSnapshot` lookups and, per env prefix,
+    the prefixed env names and the flat tuple of names to probe,
+    so that lookups only do one dict get per name.
+    """
+
+    __slots__ = ("keys", "variants", "normalized", "_env_keys", "_env_probes")
+
+    def __init__(self, keys: Union[Sequence[str], Set[str], str]):
+        if not isinstance(keys, (list, tuple, set)):
+            keys = [keys]  # type: ignore
+        self.keys = tuple(keys)
+        variants: Dict[str, None] = {}
+        for k in self.keys:
+            variants[k.lower()] = None
+            variants[k.upper()] = None
+            variants["".join(k.lower().split("_"))] = None
+        self.variants = tuple(variants)
+        self.normalized = frozenset(normalize_env_key(k) for k in self.keys)
+        self._env_keys: Dict[Optional[str], Tuple[Tuple[str, Optional[str]], ...]] = {}
+        self._env_probes: Dict[Optional[str], Tuple[Tuple[str, bool], ...]] = {}
+
+    def __repr__(self) -> str:
+        return "KeySpec({})".format(list(self.keys))
+
+    def get_env_keys(
+        self, env_prefix: Optional[str]
+    ) -> Tuple[Tuple[str, Optional[str]], ...]:
+        env_keys = self._env_keys.get(env_prefix)
+        if env_keys is None:
+            env_keys = get_env_keys(self.variants, env_prefix)
+            self._env_keys[env_prefix] = env_keys
+        return env_keys
+
+    def get_env_probes(self, env_prefix: Optional[str]) -> Tuple[Tuple[str, bool], ...]:
+        env_probes = self._env_probes.get(env_prefix)
+        if env_probes is None:
+            env_probes = get_env_probes(self.get_env_keys(env_prefix))
+            self._env_probes[env_prefix] = env_probes
+        return env_probes
+
+
+KeysType = Union[KeySpec, Set[str], List[str], str]
+
+
+def get_env_keys(
+    keys: Sequence[str], env_prefix: Optional[str]
+) -> Tuple[Tuple[str, Optional[str]], ...]:
+    """Returns the `(key, prefixed key)` pairs to check in the environment."""
+    if not env_prefix:
+        return tuple((key, None) for key in keys)
+    return tuple((key, "{}_{}".format(env_prefix, key)) for key in keys)
+
+
+def get_env_probes(
+    env_keys: Tuple[Tuple[str, Optional[str]], ...],
+) -> Tuple[Tuple[str, bool], ...]:
+    """Flattens the `(key, prefixed key)` pairs to `(name, is prefixed)` probes,
+    in lookup order."""
+    probes: List[Tuple[str, bool]] = []
+    for key, prefixed_key in env_keys:
+        probes.append((key, False))
+        if prefixed_key:
+            probes.append((prefixed_key, True))
+    return tuple(probes)
+
+
+def parse_env_value(value: str) -> Any:
+    """Coerces `true`/`false` env values to booleans."""
+    if value.lower() == "true":
+        return True
+    if value.lower() == "false":
+        return False
+    return value
+
+
+def get_keys(keys: Optional[KeysType]) -> Sequence[str]:
+    """Returns the keys to look up, the variants if `keys` is a `KeySpec`."""
+    if isinstance(keys, KeySpec):
+        return keys.variants
+    keys = keys or []
+    if not isinstance(keys, (list, tuple, set)):
+        keys = [keys]  # type: ignore
+    return keys  # type: ignore
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_keys(keys: Tuple[str, ...]) -> KeySpec:
+    return KeySpec(keys)
+
+
+def get_key_spec(keys: Optional[KeysType]) -> KeySpec:
+    """Returns a `KeySpec`, compiled plain lists of keys are memoized."""
+    if isinstance(keys, KeySpec):
+        return keys
+    keys = keys or []
+    if not isinstance(keys, (list, tuple, set)):
+        keys = [keys]  # type: ignore
+    return _compile_keys(tuple(keys))
+
+
+class KeysResolver:
+    """Resolves several keys against the same sources in a single pass.
+
+    Each context path is scanned once, on first use, and only the matching
+    files are read, instead of checking every key variant on every path.
+    """
+
+    def __init__(
+        self,
+        config: "AppConfig",
+        context_paths: Optional[List[str]] = None,
+        schema: Optional[Dict] = None,
+        env: Optional[Dict] = None,
+    ):
+        self.config = config
+        self.context_paths = context_paths
+        self.schema = schema
+        self.env = env
+        self._entries: Optional[Dict[str, List[str]]] = None
+
+    @property
+    def entries(self) -> Dict[str, List[str]]:
+        if self._entries is None:
+            self._entries = self.config.scan_context_paths(self.context_paths)
+        return self._entries
+
+    def read_keys(self, keys: KeysType) -> Optional[Any]:
+        keys = get_key_spec(keys)
+        if self.context_paths:
+            value = self.config.read_keys_from_entries(entries=self.entries, keys=keys)
+            if value is not None:
+                return value
+        if self.schema:
+            value = self.config.read_keys_from_schema(schema=self.schema, keys=keys)
+            if value is not None:
+                return value
+        if self.env:
+            value = self.config.read_keys_from_env(keys=keys, env=self.env)
+            if value is not None:
+                return value
+        return self.config.read_keys_from_env(keys=keys)
+
+    def read_keys_many(self, keys: Dict[str, KeysType]) -> Dict[str, Optional[Any]]:
+        return {name: self.read_keys(k) for name, k in keys.items()}
+
 
 class AppConfig(BaseSchemaModel):
     project_name: Optional[str] = "Vents"
@@ -26,14 +201,156 @@ class AppConfig(BaseSchemaModel):
     config_parser: Type[ConfigParser] = Field(
         default=ConfigParser, alias="config_parser"
     )
-    catalog: Optional[ConnectionCatalog] = None
+    catalog_: Optional[ConnectionCatalog] = Field(alias="catalog", default=None)
+    use_resolution_cache: Optional[bool] = False
+    use_env_snapshot: Optional[bool] = False
+    use_streaming_catalog: Optional[bool] = False
+    use_lazy_catalog: Optional[bool] = False
+    credentials_cache_path: Optional[str] = None
+    _catalog_loaded: bool = PrivateAttr(default=False)
+    _streaming_catalog: Optional[StreamingCatalog] = PrivateAttr(default=None)
+    _resolution_cache: Optional[ResolutionCache] = PrivateAttr(default=None)
+    _env_snapshot: Optional[EnvSnapshot] = PrivateAttr(default=None)
+    _env_version: int = PrivateAttr(default=0)
+    _credentials_cache: Optional[SharedCredentialsCache] = PrivateAttr(default=None)
 
     def __init__(self, **data: Any):
+        catalog = data.get("catalog")
+        if isinstance(catalog, ConnectionCatalog):
+            # Reused as is, pydantic v1 would copy it
+            del data["catalog"]
         super().__init__(**data)
-        self.catalog = self.catalog or self.load_connections_catalog()
+        if isinstance(catalog, ConnectionCatalog):
+            self._set_catalog(catalog)
+        self._catalog_loaded = self.catalog_ is not None
+        if self.use_resolution_cache:
+            self._resolution_cache = ResolutionCache()
+        if self.use_env_snapshot:
+            self._env_snapshot = EnvSnapshot(env_prefix=self.env_prefix)
+
+    def __setattr__(self, name: str, value: Any):
+        if name == "catalog":
+            # Property setters are not supported by pydantic v1 models
+            type(self).catalog.fset(self, value)  # type: ignore
+            return
+        super().__setattr__(name, value)
+
+    def _set_catalog(self, catalog: Optional[ConnectionCatalog]) -> None:
+        # Already validated, pydantic v1 would copy it on assignment
+        self.__dict__["catalog_"] = catalog
+        self.model_fields_set.add("catalog_")
+        self._catalog_loaded = True
+
+    @property
+    def catalog(self) -> Optional[ConnectionCatalog]:
+        """The connections catalog, loaded from the env on first access."""
+        if not self._catalog_loaded:
+            self._set_catalog(self.load_connections_catalog())
+        return self.catalog_
+
+    @catalog.setter
+    def catalog(self, catalog: Optional[ConnectionCatalog]) -> None:
+        self._set_catalog(catalog)
+        self._streaming_catalog = None
+
+    @property
+    def streaming_catalog(self) -> Optional[StreamingCatalog]:
+        """The env catalog streamed on demand, if `use_streaming_catalog` is enabled
+        and the full catalog was not loaded yet."""
+        if not self.use_streaming_catalog or self._catalog_loaded:
+            return None
+        if self._streaming_catalog is None:
+            catalog_env_name = self.get_connections_catalog_env_name()
+            connections_catalog = os.environ.get(catalog_env_name)
+            if not connections_catalog:
+                return None
+            # Only JSON documents are streamed, other formats are fully loaded
+            is_json = connections_catalog.lstrip().startswith("{")
+            if not is_json and not connections_catalog.endswith(".json"):
+                return None
+            self._streaming_catalog = StreamingCatalog(connections_catalog)
+        return self._streaming_catalog
+
+    @property
+    def resolution_cache(self) -> Optional[ResolutionCache]:
+        return self._resolution_cache
+
+    def enable_resolution_cache(self) -> ResolutionCache:
+        """Caches files and env lookups across calls, see `ResolutionCache`."""
+        if self._resolution_cache is None:
+            self._resolution_cache = ResolutionCache()
+        self.use_resolution_cache = True
+        return self._resolution_cache
+
+    def disable_resolution_cache(self) -> None:
+        self._resolution_cache = None
+        self.use_resolution_cache = False
+
+    @property
+    def credentials_cache(self) -> Optional[SharedCredentialsCache]:
+        """Credentials shared across processes, if `credentials_cache_path` is set."""
+        if not self.credentials_cache_path:
+            return None
+        if (
+            self._credentials_cache is None
+            or self._credentials_cache.path != self.credentials_cache_path
+        ):
+            self._credentials_cache = SharedCredentialsCache(
+                self.credentials_cache_path
+            )
+        return self._credentials_cache
+
+    @property
+    def env_snapshot(self) -> Optional[EnvSnapshot]:
+        return self._env_snapshot
+
+    def enable_env_snapshot(self) -> EnvSnapshot:
+        """Reads `os.environ` from an indexed snapshot, see `EnvSnapshot`."""
+        self.use_env_snapshot = True
+        self.refresh_env()
+        return self._env_snapshot  # type: ignore
+
+    def disable_env_snapshot(self) -> None:
+        self._env_snapshot = None
+        self.use_env_snapshot = False
+        self.refresh_env()
+
+    @property
+    def env_version(self) -> int:
+        """Incremented by `refresh_env`, used to invalidate env-based caches."""
+        return self._env_version
+
+    def refresh_env(self, *names: str) -> None:
+        """Picks up `os.environ` changes in the env snapshot and resolution cache.
+
+        Called by the services' `set_env_vars` with the names they set,
+        must be called after mutating `os.environ` directly.
+        If `names` are given, only these names are updated in the snapshot
+        and only the lookups reading them are invalidated,
+        otherwise the snapshot is rebuilt and all the lookups are invalidated.
+        """
+        snapshot = self._env_snapshot
+        if names and (snapshot is None or snapshot.env_prefix == self.env_prefix):
+            if snapshot is not None:
+                names = snapshot.update({n: os.environ.get(n) for n in names})
+            if not names:
+                return
+            self._env_version += 1
+            if self._resolution_cache is not None:
+                self._resolution_cache.invalidate_env(names)
+            return
+
+        self._env_version += 1
+        if self.use_env_snapshot:
+            version = snapshot.version + 1 if snapshot else 0
+            self._env_snapshot = EnvSnapshot(
+                env_prefix=self.env_prefix, version=version
+            )
+        if self._resolution_cache is not None:
+            self._resolution_cache.invalidate_env()
 
     def read_keys_from_env(
-        self, keys: Union[Set[str], List[str], str], env: Optional[Dict] = None
+        self, keys: KeysType, env: Optional[Dict] = None
     ) -> Optional[Any]:
         """
         Returns a variable from one of the list of keys based on the os.env.
@@ -43,29 +360,63 @@ class AppConfig(BaseSchemaModel):
         Returns:
             str | None
         """
-        env = env or os.environ
-        keys = keys or []
-        if not isinstance(keys, (list, tuple, set)):
-            keys = [keys]
-        for key in keys:
+        if isinstance(keys, KeySpec):
+            env_keys = keys.get_env_keys(self.env_prefix)
+        else:
+            env_keys = get_env_keys(get_keys(keys), self.env_prefix)
+        if env:
+            return self._read_env_keys(env_keys=env_keys, env=env)
+        if self._resolution_cache is None:
+            return self._read_os_env_keys(keys=keys, env_keys=env_keys)
+
+        cache_key = (keys if isinstance(keys, KeySpec) else env_keys, self.env_prefix)
+        value = self._resolution_cache.get_env(cache_key)
+        if value is ResolutionCache.MISSING:
+            value = self._read_os_env_keys(keys=keys, env_keys=env_keys)
+            names = (
+                n for key, prefixed_key in env_keys for n in (key, prefixed_key) if n
+            )
+            self._resolution_cache.set_env(cache_key, value, names=names)
+        return value
+
+    def _read_os_env_keys(
+        self, keys: KeysType, env_keys: Tuple[Tuple[str, Optional[str]], ...]
+    ) -> Optional[Any]:
+        if self._env_snapshot is None:
+            return self._read_env_keys(env_keys=env_keys, env=os.environ)
+
+        if self._env_snapshot.env_prefix != self.env_prefix:
+            self.refresh_env()
+        if isinstance(keys, KeySpec):
+            probes = keys.get_env_probes(self.env_prefix)
+        else:
+            probes = get_env_probes(env_keys)
+        found = self._env_snapshot.find(probes)
+        if found is None:
+            return None
+        value, is_prefixed = found
+        # Prefixed values are returned as is
+        return value if is_prefixed else parse_env_value(value)
+
+    @staticmethod
+    def _read_env_keys(
+        env_keys: Tuple[Tuple[str, Optional[str]], ...],
+        env: Union[Dict, EnvSnapshot],
+    ) -> Optional[Any]:
+        for key, prefixed_key in env_keys:
             value = env.get(key)
             if value:
-                if value.lower() == "true":
-                    return True
-                if value.lower() == "false":
-                    return False
-                return value
-            # Prepend prefix if set
-            if self.env_prefix:
-                key = "{}_{}".format(self.env_prefix, key)
-                value = env.get(key)
+                return parse_env_value(value)
+            # Check the prefixed key if a prefix is set
+            if prefixed_key:
+                value = env.get(prefixed_key)
                 if value:
                     return value
 
         return None
 
     def read_keys_from_path(
-        self, context_paths: List[str], keys: Union[Set[str], List[str], str]
+        self, context_paths: List[str], keys: KeysType
     ) -> Optional[Any]:
         """
         Returns a variable from one of the list of keys based on a base path.
@@ -85,28 +436,88 @@ class AppConfig(BaseSchemaModel):
         if not context_paths:
             return None
 
-        keys = keys or []
-        if not isinstance(keys, (list, tuple, set)):
-            keys = [keys]  # type: ignore
-        for key in keys:
+        for key in get_keys(keys):
             for context_path in context_paths:
-                key_path = os.path.join(context_path, key)
-                if not os.path.exists(key_path):
-                    continue
-                with open(key_path) as f:
-                    value = f.read()
-                    if value:
-                        if value.lower() == "true":
-                            return True
-                        if value.lower() == "false":
-                            return False
-                        return value
+                value = self._read_key_file(os.path.join(context_path, key))
+                if value:
+                    if value.lower() == "true":
+                        return True
+                    if value.lower() == "false":
+                        return False
+                    return value
 
         return None
 
-    def read_keys_from_schema(
-        self, schema: Dict, keys: Union[Set[str], List[str], str]
+    def scan_context_paths(
+        self, context_paths: Optional[List[str]]
+    ) -> Dict[str, List[str]]:
+        """
+        Scans each context path once and indexes the files it contains.
+        Args:
+            context_paths: List[str], base paths where to look for keys.
+
+        Returns:
+            Dict[str, List[str]], file name -> file paths in context paths order.
+        """
+        entries: Dict[str, List[str]] = {}
+        for context_path in context_paths or []:
+            try:
+                if self._resolution_cache is not None:
+                    files = self._resolution_cache.scan(
+                        context_path, self._scan_context_path
+                    )
+                else:
+                    files = self._scan_context_path(context_path)
+            except OSError:
+                self.logger.warning(
+                    "The context path is not a directory {}".format(context_path)
+                )
+                continue
+            for name, path in files:
+                entries.setdefault(name, []).append(path)
+        return entries
+
+    @staticmethod
+    def _scan_context_path(context_path: str) -> List[Tuple[str, str]]:
+        with os.scandir(context_path) as it:
+            return [(entry.name, entry.path) for entry in it if entry.is_file()]
+
+    def _read_key_file(self, key_path: str) -> Optional[str]:
+        if self._resolution_cache is not None:
+            return self._resolution_cache.read_file(key_path)
+        if not os.path.exists(key_path):
+            return None
+        with open(key_path) as f:
+            return f.read()
+
+    def read_keys_from_entries(
+        self, entries: Dict[str, List[str]], keys: KeysType
     ) -> Optional[Any]:
+        """
+        Returns a variable from one of the list of keys based on scanned entries.
+        Args:
+            entries: Dict[str, List[str]], result of `scan_context_paths`.
+            keys: list(str). list of keys to check in the entries
+
+        Returns:
+            str | None
+        """
+        if not entries:
+            return None
+
+        for key in get_keys(keys):
+            for key_path in entries.get(key, ()):
+                value = self._read_key_file(key_path)
+                if value:
+                    if value.lower() == "true":
+                        return True
+                    if value.lower() == "false":
+                        return False
+                    return value
+
+        return None
+
+    def read_keys_from_schema(self, schema: Dict, keys: KeysType) -> Optional[Any]:
         """Reads keys from a schema
 
         Args:
@@ -118,10 +529,7 @@ class AppConfig(BaseSchemaModel):
         """
         if not schema:
             return None
-        keys = keys or []
-        if not isinstance(keys, (list, tuple, set)):
-            keys = [keys]  # type: ignore
-        for key in keys:
+        for key in get_keys(keys):
             value = schema.get(key)
             if value:
                 if value.lower() == "true":
@@ -152,28 +560,79 @@ class AppConfig(BaseSchemaModel):
         connections_catalog = os.environ.get(catalog_env_name)
         if not connections_catalog:
             return None
-        return ConnectionCatalog.read(connections_catalog, config_type=".json")
+
+        # Parsed catalogs are shared between configs loading the same payload,
+        # each config gets its own copy since catalogs are mutable
+        cache_key = get_catalog_cache_key(connections_catalog) + (
+            bool(self.use_lazy_catalog),
+        )
+        catalog = _catalogs_cache.get(cache_key)
+        if catalog is not None:
+            _catalogs_cache.move_to_end(cache_key)
+            return catalog.clone()
+        catalog = ConnectionCatalog.read_json(
+            connections_catalog, lazy=bool(self.use_lazy_catalog)
+        )
+        _catalogs_cache[cache_key] = catalog
+        if len(_catalogs_cache) > _CATALOGS_CACHE_SIZE:
+            _catalogs_cache.popitem(last=False)
+        return catalog.clone()
 
     def get_connection_for(self, name: Optional[str]) -> Optional[Connection]:
         """Checks if a connection has a mount path exported"""
-        if not name or not self.catalog:
+        if not name:
+            return None
+        streaming_catalog = self.streaming_catalog
+        if streaming_catalog is not None:
+            return streaming_catalog.get_connection_for(name)
+        if not self.catalog:
             return None
 
-        return self.catalog.connections_by_names.get(name)
+        return self.catalog.get_connection_for(name)
+
+    def get_keys_resolver(
+        self,
+        schema: Optional[Dict] = None,
+        env: Optional[Dict] = None,
+        context_paths: Optional[List[str]] = None,
+    ) -> KeysResolver:
+        """Returns a resolver to read several keys with a single scan per context path."""
+        return KeysResolver(
+            config=self, context_paths=context_paths, schema=schema, env=env
+        )
+
+    def read_keys_many(
+        self,
+        keys: Dict[str, KeysType],
+        schema: Optional[Dict] = None,
+        env: Optional[Dict] = None,
+        context_paths: Optional[List[str]] = None,
+    ) -> Dict[str, Optional[Any]]:
+        """Resolves a set of named keys in one pass, e.g. all keys of a provider.
+
+        Args:
+            keys: Dict[str, list(str)], name -> list of keys to check.
+
+        Returns:
+            Dict[str, str | None]
+        """
+        resolver = self.get_keys_resolver(
+            context_paths=context_paths, schema=schema, env=env
+        )
+        return resolver.read_keys_many(keys)
 
     def read_keys(
         self,
-        keys: List[str],
+        keys: KeysType,
         schema: Optional[Dict] = None,
         env: Optional[Dict] = None,
         context_paths: Optional[List[str]] = None,
+        resolver: Optional[KeysResolver] = None,
     ) -> Optional[Any]:
         """Returns a variable by checking first a context path and then in the environment."""
-        keys = (
-            {k.lower() for k in keys}
-            | {k.upper() for k in keys}
-            | {"".join(k.lower().split("_")) for k in keys}
-        )
+        if resolver is not None:
+            return resolver.read_keys(keys)
+        keys = get_key_spec(keys)
         if context_paths:
             value = self.read_keys_from_path(context_paths=context_paths, keys=keys)
             if value is not None:
@@ -1,17 +1,110 @@
-from typing import Dict, List, Optional
+from collections.abc import Mapping
+import gc
+import hashlib
+import logging
+import os
+import pickle
+import struct
+import sys
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
-from clipped.compact.pydantic import PrivateAttr
+import orjson
+
+from clipped.compact.pydantic import PYDANTIC_VERSION, PrivateAttr
+from clipped.config.patch_strategy import PatchStrategy
 from clipped.config.schema import BaseSchemaModel
-from vents.connections.connection import Connection
+from clipped.utils.json import default_timedelta, orjson_loads
+from vents.connections.connection import Connection, _get_model_fields
 from vents.connections.connection_resource import ConnectionResource
+from vents.connections.mount_plan import MountEntry
+from vents.exceptions import VentError
+from vents.pkg import VERSION
+from vents.providers.kinds import ProviderKind
+
+
+if TYPE_CHECKING:
+    from vents.connections.merge import CatalogDiff
+    from vents.connections.mount_plan import MountPlan
+    from vents.connections.view import ConnectionView
+
+
+_logger = logging.getLogger("vents.connections.catalog")
+
+_MISSING = object()
+
+MOUNT_PLANS_CACHE_SIZE = 1024
+
+COMPILED_MAGIC = b"VENTSCAT"
+COMPILED_FORMAT = 1
+
+INDEX_NAMES = (
+    "kind",
+    "tag",
+    "secret",
+    "config_map",
+    "annotation",
+    "annotation_value",
+)
+
+
+class LazyConnections(Mapping):
+    """Read-only view of a lazy catalog's connections by names,
+    validating each connection on first access."""
+
+    __slots__ = ("_catalog",)
+
+    def __init__(self, catalog: "ConnectionCatalog"):
+        self._catalog = catalog
+
+    def __getitem__(self, name: str) -> Connection:
+        if name not in self._catalog._connections_by_names:
+            raise KeyError(name)
+        return self._catalog._get_connection(name)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._catalog._connections_by_names
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._catalog._connections_by_names)
+
+    def __len__(self) -> int:
+        return len(self._catalog._connections_by_names)
 
 
 class ConnectionCatalog(BaseSchemaModel):
     connections: Optional[List[Connection]] = None
-    _all_connections: List[Connection] = PrivateAttr()
+    _all_connections: Optional[List[Connection]] = PrivateAttr(default=None)
     _secrets: Optional[List[ConnectionResource]] = PrivateAttr(default=None)
     _config_maps: Optional[List[ConnectionResource]] = PrivateAttr(default=None)
-    _connections_by_names: Dict[str, Connection] = PrivateAttr()
+    # Connections by names, raw dicts are pending validation in lazy mode
+    _connections_by_names: Dict[str, Union[Connection, Dict]] = PrivateAttr()
+    # Names -> positions in `connections`, None if not built yet
+    _positions: Optional[Dict[str, int]] = PrivateAttr(default=None)
+    _lazy: bool = PrivateAttr(default=False)
+    # Index name -> index key -> names, None if not built yet
+    _indexes: Optional[Dict[str, Dict[Hashable, Dict[str, None]]]] = PrivateAttr(
+        default=None
+    )
+    _index_views: Dict[Tuple[str, Hashable], List[Connection]] = PrivateAttr(
+        default_factory=dict
+    )
+    _mount_plans: Dict[Tuple, "MountPlan"] = PrivateAttr(default_factory=dict)
+    # Name -> resources of the connection, filled with the indexes
+    _mount_entries: Dict[str, MountEntry] = PrivateAttr(default_factory=dict)
+    # Name -> (encoded connection or entry, JSON bytes)
+    _encoded: Dict[str, Tuple[Union[Connection, Dict], bytes]] = PrivateAttr(
+        default_factory=dict
+    )
 
     def __init__(
         self,
@@ -21,50 +114,695 @@ class ConnectionCatalog(BaseSchemaModel):
         # Post init
         self._all_connections = []
         self._connections_by_names = {}
+        self._positions = None
+        self._lazy = False
         self._secrets = None
         self._config_maps = None
+        self._indexes = None
+        self._index_views = {}
+        self._encoded = {}
+        self._mount_plans = {}
+        self._mount_entries = {}
         self.set_all_connections()
 
+    @classmethod
+    def from_entries(cls, entries: Optional[List[Dict]]) -> "ConnectionCatalog":
+        """Creates a lazy catalog from raw connection dicts.
+
+        Connections are validated on first access and cached,
+        `connections` is only set once `validate_all` is called.
+        """
+        connections_by_names = {}
+        for i, entry in enumerate(entries or []):
+            name = entry.get("name") if isinstance(entry, Mapping) else None
+            if not name:
+                raise VentError(
+                    "Received a connection without a name at position {}.".format(i)
+                )
+            connections_by_names[name] = entry
+        catalog = cls()
+        catalog._connections_by_names = connections_by_names
+        catalog._lazy = True
+        catalog._all_connections = None
+        return catalog
+
+    @classmethod
+    def from_connections(cls, connections: List[Connection]) -> "ConnectionCatalog":
+        """Creates a catalog from validated connections, reused as is.
+
+        Unlike `ConnectionCatalog(connections=...)`, the connections are not
+        validated again, nor copied by pydantic v1.
+        """
+        catalog = cls()
+        catalog._set_connections_field(connections)
+        catalog.set_all_connections()
+        return catalog
+
+    @classmethod
+    def read_json(
+        cls, value: Union[str, bytes], lazy: bool = False
+    ) -> "ConnectionCatalog":
+        """Reads a catalog from a JSON stream or file path using orjson.
+
+        Falls back to `read` for other formats, e.g. yaml.
+        If `lazy`, the connections are validated on first access.
+        """
+        data = None
+        try:
+            if isinstance(value, bytes) or value.lstrip().startswith("{"):
+                data = orjson_loads(value)
+            elif value.endswith(".json") and os.path.isfile(value):
+                with open(value, "rb") as f:
+                    data = orjson_loads(f.read())
+        except ValueError:
+            data = None
+        if not isinstance(data, dict):
+            if not lazy:
+                return cls.read(value, config_type=".json")
+            data = cls._CONFIG_SPEC.read_from(value, config_type=".json")
+        if lazy:
+            cls._validate_keys(data)
+            return cls.from_entries(data.get("connections"))
+        return cls.from_dict(data)
+
+    @classmethod
+    def _validate_keys(cls, data: Dict) -> None:
+        extra = set(data) - set(_get_model_fields(cls))
+        if extra:
+            raise VentError(
+                "Received unexpected catalog keys: {}.".format(", ".join(sorted(extra)))
+            )
+
+    @property
+    def is_lazy(self) -> bool:
+        return self._lazy
+
+    def _get_connection(self, name: str) -> Optional[Connection]:
+        connection = self._connections_by_names.get(name)
+        if isinstance(connection, dict):
+            connection = Connection.from_dict(connection)
+            self._connections_by_names[name] = connection
+        return connection  # type: ignore
+
+    def validate_all(self) -> List[Connection]:
+        """Validates all the pending connections, e.g. in CI.
+
+        Raises a `VentError` listing the invalid connections.
+        """
+        errors = []
+        for name in list(self._connections_by_names):
+            try:
+                self._get_connection(name)
+            except Exception as e:
+                errors.append("`{}`: {}".format(name, e))
+        if errors:
+            raise VentError(
+                "Received invalid connections:\n{}".format("\n".join(errors))
+            )
+        if self._lazy:
+            self._lazy = False
+            self._sync_connections()
+        return self.all_connections
+
+    @staticmethod
+    def _get_compiled_header() -> bytes:
+        # Snapshots are only valid for the same models and pickle protocol
+        return "{}|{}|{}|{}.{}".format(
+            COMPILED_FORMAT, VERSION, PYDANTIC_VERSION, *sys.version_info[:2]
+        ).encode()
+
+    @staticmethod
+    def _get_compiled_digest(payload: bytes, key: Optional[bytes] = None) -> bytes:
+        return hashlib.blake2b(payload, digest_size=32, key=key or b"").digest()
+
+    def compile(self, path: str, key: Optional[bytes] = None) -> None:
+        """Writes a binary snapshot of the validated catalog and its indexes.
+
+        The snapshot is a pickle, only load snapshots written by a trusted process,
+        and pass a `key` to authenticate them.
+        """
+        self.validate_all()
+        if self._indexes is None:
+            self._build_indexes()
+        payload = pickle.dumps(self, protocol=pickle.HIGHEST_PROTOCOL)
+        header = self._get_compiled_header()
+        tmp_path = "{}.{}.tmp".format(path, os.getpid())
+        with open(tmp_path, "wb") as f:
+            f.write(COMPILED_MAGIC)
+            f.write(struct.pack(">H", len(header)))
+            f.write(header)
+            f.write(self._get_compiled_digest(payload, key))
+            f.write(payload)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def _read_compiled(
+        cls, path: str, key: Optional[bytes] = None
+    ) -> "ConnectionCatalog":
+        with open(path, "rb") as f:
+            content = f.read()
+        view = memoryview(content)
+        offset = len(COMPILED_MAGIC)
+        if content[:offset] != COMPILED_MAGIC:
+            raise VentError("`{}` is not a compiled catalog.".format(path))
+        (header_size,) = struct.unpack_from(">H", content, offset)
+        offset += 2
+        header = content[offset : offset + header_size]
+        if header != cls._get_compiled_header():
+            raise VentError(
+                "Compiled catalog `{}` version mismatch: {}.".format(
+                    path, header.decode(errors="replace")
+                )
+            )
+        offset += header_size
+        digest = content[offset : offset + 32]
+        payload = view[offset + 32 :]
+        if cls._get_compiled_digest(payload, key) != digest:  # type: ignore
+            raise VentError(
+                "Compiled catalog `{}` integrity check failed.".format(path)
+            )
+        # Unpickling allocates many small objects, the gc passes are not needed
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            catalog = pickle.loads(payload)
+        finally:
+            if gc_enabled:
+                gc.enable()
+        if not isinstance(catalog, cls):
+            raise VentError("`{}` is not a compiled catalog.".format(path))
+        return catalog
+
+    @classmethod
+    def load_compiled(
+        cls,
+        path: str,
+        source: Optional[Union[str, bytes]] = None,
+        key: Optional[bytes] = None,
+    ) -> "ConnectionCatalog":
+        """Loads a snapshot written by `compile`.
+
+        If the snapshot is missing, corrupted, or written by another version,
+        falls back to reading the JSON `source` if provided, otherwise raises.
+        """
+        try:
+            return cls._read_compiled(path, key=key)
+        except (
+            OSError,
+            EOFError,
+            AttributeError,
+            ImportError,
+            VentError,
+            pickle.UnpicklingError,
+            struct.error,
+        ) as e:
+            if source is None:
+                if isinstance(e, VentError):
+                    raise
+                raise VentError(
+                    "Could not load the compiled catalog `{}`: {}".format(path, e)
+                ) from e
+            _logger.debug("Falling back to the catalog source: %s", e)
+        return cls.read_json(source)
+
     def set_all_connections(self) -> None:
+        self._lazy = False
         self._all_connections = self.connections[:] if self.connections else []
-        self._connections_by_names = {}
+        self._connections_by_names = {c.name: c for c in self._all_connections}
+        self._positions = None
         self._secrets = None
         self._config_maps = None
+        self._indexes = None
+        self._index_views = {}
+        self._encoded = {}
+        self._mount_plans = {}
+        self._mount_entries = {}
+
+    def _set_connections_field(self, connections: Optional[List[Connection]]) -> None:
+        # Already validated, the field is marked as set for `to_dict`
+        self.__dict__["connections"] = connections
+        self.model_fields_set.add("connections")
+
+    def clone(self) -> "ConnectionCatalog":
+        """Returns a catalog with its own mutable state, sharing the connections.
+
+        Connections are reused as is, only replace them, e.g. with `upsert`,
+        in-place changes are visible in both catalogs.
+        """
+        catalog = type(self)()
+        if self.connections is not None:
+            catalog._set_connections_field(self.connections[:])
+        catalog._connections_by_names = dict(self._connections_by_names)
+        catalog._lazy = self._lazy
+        catalog._all_connections = None
+        catalog._encoded = dict(self._encoded)
+        return catalog
+
+    def _build_indexes(self) -> None:
+        """Builds all the secondary indexes in a single pass over the connections."""
+        self._indexes = {name: {} for name in INDEX_NAMES}
+        self._index_views = {}
+        self._mount_entries = {}
+        for name, c in self._connections_by_names.items():
+            self._index_connection(name, c)
+
+    @staticmethod
+    def _get_index_entries(
+        connection: Union[Connection, Dict],
+    ) -> List[Tuple[str, Hashable]]:
+        if isinstance(connection, dict):
+            # Raw entries are indexed without validation
+            kind = connection.get("kind")
+            tags = connection.get("tags")
+            secret = connection.get("secret")
+            secret = secret.get("name") if isinstance(secret, dict) else None
+            config_map = connection.get("configMap", connection.get("config_map"))
+            config_map = (
+                config_map.get("name") if isinstance(config_map, dict) else None
+            )
+            annotations = connection.get("annotations")
+        else:
+            kind = connection.kind
+            tags = connection.tags
+            secret = (
+                connection.secret.name
+                if isinstance(connection.secret, ConnectionResource)
+                else None
+            )
+            config_map = (
+                connection.config_map.name
+                if isinstance(connection.config_map, ConnectionResource)
+                else None
+            )
+            annotations = connection.annotations
+        entries: List[Tuple[str, Hashable]] = [("kind", kind)]
+        if isinstance(tags, list):
+            entries += [("tag", tag) for tag in dict.fromkeys(tags)]
+        if secret is not None:
+            entries.append(("secret", secret))
+        if config_map is not None:
+            entries.append(("config_map", config_map))
+        if isinstance(annotations, dict):
+            for key, value in annotations.items():
+                entries.append(("annotation", key))
+                try:
+                    hash(value)
+                except TypeError:  # Unhashable values are only indexed by key
+                    continue
+                entries.append(("annotation_value", (key, value)))
+        return entries
+
+    def _index_connection(
+        self, connection_name: str, connection: Union[Connection, Dict]
+    ) -> None:
+        if self._indexes is None:
+            return
+        for name, key in self._get_index_entries(connection):
+            self._indexes[name].setdefault(key, {})[connection_name] = None
+            self._index_views.pop((name, key), None)
+        if isinstance(connection, Connection):
+            self._mount_entries[connection_name] = MountEntry.from_connection(
+                connection
+            )
+
+    def _unindex_connection(
+        self, connection_name: str, connection: Union[Connection, Dict]
+    ) -> None:
+        if self._indexes is None:
+            return
+        for name, key in self._get_index_entries(connection):
+            names = self._indexes[name].get(key)
+            if names is None:
+                continue
+            names.pop(connection_name, None)
+            if not names:
+                del self._indexes[name][key]
+            self._index_views.pop((name, key), None)
+
+    def _get_indexed(self, name: str, key: Hashable) -> List[Connection]:
+        view = self._index_views.get((name, key))
+        if view is not None:
+            return view
+        if self._indexes is None:
+            self._build_indexes()
+        names = self._indexes[name].get(key)  # type: ignore
+        if not names:
+            return []
+        view = [self._get_connection(n) for n in names]
+        self._index_views[(name, key)] = view
+        return view
+
+    def _invalidate_resources(self) -> None:
+        # The secrets and config maps are recomputed from the indexes on next access
+        self._secrets = None
+        self._config_maps = None
+        self._mount_plans = {}
+
+    def _upsert_connection(
+        self, connection: Connection
+    ) -> Optional[Union[Connection, Dict]]:
+        # Pending entries are replaced without being validated
+        previous = self._connections_by_names.get(connection.name)
+        self._mount_entries.pop(connection.name, None)
+        if previous is not None:
+            self._unindex_connection(connection.name, previous)
+        # Replacing an existing name keeps its position
+        self._connections_by_names[connection.name] = connection
+        self._index_connection(connection.name, connection)
+        self._invalidate_resources()
+        self._upsert_in_connections(connection, replace=previous is not None)
+        return previous
+
+    def _remove_connection(
+        self, name: str, in_connections: bool = True
+    ) -> Optional[Union[Connection, Dict]]:
+        connection = self._connections_by_names.pop(name, None)
+        self._mount_entries.pop(name, None)
+        if connection is not None:
+            self._unindex_connection(name, connection)
+            self._encoded.pop(name, None)
+            self._invalidate_resources()
+            if in_connections:
+                self._remove_from_connections(name)
+        return connection
+
+    # `connections` is updated in place, assigning the field
+    # would copy and revalidate the whole list on every change
+    def _get_positions(self) -> Dict[str, int]:
+        if self._positions is None:
+            self._positions = {c.name: i for i, c in enumerate(self.connections or [])}
+        return self._positions
+
+    def _upsert_in_connections(self, connection: Connection, replace: bool) -> None:
+        self._all_connections = None
+        if self._lazy:
+            # Set by `validate_all`
+            return
+        connections = self.connections
+        if connections is None:
+            connections = []
+            self._set_connections_field(connections)
+        if replace:
+            connections[self._get_positions()[connection.name]] = connection
+            return
+        if self._positions is not None:
+            self._positions[connection.name] = len(connections)
+        connections.append(connection)
+
+    def _remove_from_connections(self, name: str) -> None:
+        self._all_connections = None
+        if self._lazy:
+            return
+        positions = self._get_positions()
+        position = positions.pop(name)
+        connections = self.connections
+        del connections[position]  # type: ignore
+        if position < len(connections):
+            # The next positions are shifted, rebuilt on the next replacement
+            self._positions = None
+
+    def _sync_connections(self) -> None:
+        self._all_connections = None
+        self._positions = None
+        self._set_connections_field(
+            [
+                self._get_connection(name)  # type: ignore
+                for name in list(self._connections_by_names)
+            ]
+        )
+
+    def add(self, connection: Connection) -> None:
+        """Adds a new connection, raises if the name is already used."""
+        if connection.name in self._connections_by_names:
+            raise VentError(
+                "A connection with the name `{}` already exists.".format(
+                    connection.name
+                )
+            )
+        self._upsert_connection(connection)
+
+    def remove(self, name: str) -> Optional[Connection]:
+        """Removes a connection by name, returns the removed connection if any."""
+        # A pending entry is validated first, an invalid one is kept
+        removed = self._get_connection(name)
+        self._remove_connection(name)
+        return removed
+
+    def upsert(self, connection: Connection) -> Optional[Connection]:
+        """Adds or replaces a connection, returns the replaced connection if any."""
+        replaced = self._get_connection(connection.name)
+        self._upsert_connection(connection)
+        return replaced
+
+    def replace_many(
+        self,
+        connections: Optional[List[Connection]] = None,
+        removed: Optional[List[str]] = None,
+    ) -> None:
+        """Applies a catalog delta: removes the `removed` names,
+        then upserts the `connections`."""
+        removed_names = {
+            name
+            for name in removed or []
+            if self._remove_connection(name, in_connections=False) is not None
+        }
+        if removed_names and not self._lazy:
+            # A single pass instead of shifting the list per removal
+            self._all_connections = None
+            self._positions = None
+            self._set_connections_field(
+                [c for c in self.connections or [] if c.name not in removed_names]
+            )
+        for connection in connections or []:
+            self._upsert_connection(connection)
+
+    def to_dict(
+        self,
+        humanize_values: bool = False,
+        include_kind: bool = False,
+        include_version: bool = False,
+        exclude_unset: bool = True,
+        exclude_none: bool = True,
+        exclude_defaults: bool = False,
+    ) -> Dict[str, Any]:
+        """Returns the catalog as a dict, lazy catalogs emit their pending entries
+        as they were read."""
+        kwargs = dict(
+            humanize_values=humanize_values,
+            include_kind=include_kind,
+            include_version=include_version,
+            exclude_unset=exclude_unset,
+            exclude_none=exclude_none,
+            exclude_defaults=exclude_defaults,
+        )
+        data = super().to_dict(**kwargs)
+        if self._lazy:
+            data["connections"] = [
+                dict(c) if isinstance(c, dict) else c.to_dict(**kwargs)
+                for c in self._connections_by_names.values()
+            ]
+        return data
 
     @property
     def all_connections(self) -> List[Connection]:
+        if self._all_connections is None:
+            self._all_connections = [
+                self._get_connection(name)  # type: ignore
+                for name in list(self._connections_by_names)
+            ]
         return self._all_connections
 
+    # Indexed queries, the returned lists are cached and must not be mutated
+    def by_kind(self, kind: Union[str, ProviderKind]) -> List[Connection]:
+        """Returns the connections of a kind."""
+        return self._get_indexed("kind", kind)
+
+    def by_tag(self, tag: str) -> List[Connection]:
+        """Returns the connections with a tag."""
+        return self._get_indexed("tag", tag)
+
+    def by_secret(self, name: str) -> List[Connection]:
+        """Returns the connections using a secret."""
+        return self._get_indexed("secret", name)
+
+    def by_config_map(self, name: str) -> List[Connection]:
+        """Returns the connections using a config map."""
+        return self._get_indexed("config_map", name)
+
+    def by_annotation(self, key: str, value: Any = _MISSING) -> List[Connection]:
+        """Returns the connections with an annotation key, and value if provided."""
+        if value is _MISSING:
+            return self._get_indexed("annotation", key)
+        try:
+            return self._get_indexed("annotation_value", (key, value))
+        except TypeError:
+            return [
+                c
+                for c in self._get_indexed("annotation", key)
+                if c.annotations.get(key) == value
+            ]
+
     @property
-    def secrets(self) -> List[ConnectionResource]:
-        if self._secrets or not self._all_connections:
+    def secrets(self) -> Optional[List[ConnectionResource]]:
+        if not self._connections_by_names:
+            return None
+        if self._secrets is not None:
             return self._secrets
-        secret_names = set()
-        secrets = []
-        for c in self._all_connections:
-            if c.secret and c.secret.name not in secret_names:
-                secret_names.add(c.secret.name)
-                secrets.append(c.secret)
-        self._secrets = secrets
+        if self._indexes is None:
+            self._build_indexes()
+        self._secrets = [
+            self._get_connection(next(iter(names))).secret  # type: ignore
+            for names in self._indexes["secret"].values()  # type: ignore
+        ]
         return self._secrets
 
     @property
-    def config_maps(self) -> List[ConnectionResource]:
-        if self._config_maps or not self._all_connections:
+    def config_maps(self) -> Optional[List[ConnectionResource]]:
+        if not self._connections_by_names:
+            return None
+        if self._config_maps is not None:
             return self._config_maps
-        config_map_names = set()
-        config_maps = []
-        for c in self._all_connections:
-            if c.config_map and c.config_map.name not in config_map_names:
-                config_map_names.add(c.config_map.name)
-                config_maps.append(c.config_map)
-        self._config_maps = config_maps
+        if self._indexes is None:
+            self._build_indexes()
+        self._config_maps = [
+            self._get_connection(next(iter(names))).config_map  # type: ignore
+            for names in self._indexes["config_map"].values()  # type: ignore
+        ]
         return self._config_maps
 
     @property
-    def connections_by_names(self) -> Dict[str, Connection]:
-        if self._connections_by_names or not self._all_connections:
-            return self._connections_by_names
-
-        self._connections_by_names = {c.name: c for c in self._all_connections}
+    def connections_by_names(self) -> Mapping:
+        if self._lazy:
+            return LazyConnections(self)
         return self._connections_by_names
+
+    @staticmethod
+    def _encode_connection(connection: Union[Connection, Dict]) -> bytes:
+        if isinstance(connection, dict):
+            return orjson.dumps(
+                connection, default=default_timedelta, option=orjson.OPT_NAIVE_UTC
+            )
+        # Same output as `to_dict`, without the intermediate dict
+        return connection.model_dump_json(
+            by_alias=True, exclude_unset=True, exclude_none=True
+        ).encode()
+
+    def to_json_bytes(self, names: Optional[List[str]] = None) -> bytes:
+        """Returns the catalog as compact JSON bytes, e.g. for env injection.
+
+        Each connection's encoding is cached, `names` emits only a subset
+        of the connections, in the requested order.
+        Replaced connections are re-encoded, in-place changes are not detected.
+        """
+        connections = self._connections_by_names
+        cache = self._encoded
+        if names is None:
+            names = list(connections)
+        else:
+            missing = [n for n in names if n not in connections]
+            if missing:
+                raise VentError(
+                    "Received unknown connections: {}.".format(", ".join(missing))
+                )
+        encoded = []
+        for name in dict.fromkeys(names):
+            connection = connections[name]
+            cached = cache.get(name)
+            if cached is None or cached[0] is not connection:
+                cached = (connection, self._encode_connection(connection))
+                cache[name] = cached
+            encoded.append(cached[1])
+        return b'{"connections":[' + b",".join(encoded) + b"]}"
+
+    @staticmethod
+    def _get_resources_key(
+        resources: Optional[List[ConnectionResource]],
+    ) -> Tuple:
+        return tuple(
+            (
+                r.name,
+                r.mount_path,
+                r.host_path,
+                tuple(r.items or ()),
+                r.default_mode,
+                r.is_requested,
+            )
+            for r in resources or []
+        )
+
+    def get_mount_entry(self, name: str) -> Optional[MountEntry]:
+        """Returns the resources of a connection, computed with the indexes."""
+        entry = self._mount_entries.get(name)
+        if entry is not None:
+            return entry
+        if self._indexes is None:
+            self._build_indexes()
+            entry = self._mount_entries.get(name)
+            if entry is not None:
+                return entry
+        # Pending entries of lazy catalogs are validated on first use
+        connection = self._get_connection(name)
+        if connection is None:
+            return None
+        entry = MountEntry.from_connection(connection)
+        self._mount_entries[name] = entry
+        return entry
+
+    def get_mount_plan(
+        self,
+        connection_names: List[str],
+        secrets: Optional[List[ConnectionResource]] = None,
+        config_maps: Optional[List[ConnectionResource]] = None,
+    ) -> "MountPlan":
+        """Returns the mount plan of a job, cached per connections and resources.
+
+        The cache is bounded and cleared when the catalog is mutated.
+        """
+        from vents.connections.mount_plan import MountPlan
+
+        key = (
+            tuple(connection_names),
+            self._get_resources_key(secrets),
+            self._get_resources_key(config_maps),
+        )
+        plan = self._mount_plans.get(key)
+        if plan is None:
+            plan = MountPlan.build(
+                self,
+                connection_names=connection_names,
+                secrets=secrets,
+                config_maps=config_maps,
+            )
+            if len(self._mount_plans) >= MOUNT_PLANS_CACHE_SIZE:
+                self._mount_plans.pop(next(iter(self._mount_plans)))
+            self._mount_plans[key] = plan
+        return plan
+
+    def views(self) -> List["ConnectionView"]:
+        """Returns compact read-only views of the connections."""
+        from vents.connections.view import ConnectionView
+
+        return [ConnectionView.from_connection(c) for c in self.all_connections]
+
+    @classmethod
+    def merge(
+        cls,
+        *catalogs: Optional["ConnectionCatalog"],
+        strategy: Optional[PatchStrategy] = None,
+    ) -> "ConnectionCatalog":
+        """Merges catalogs layered by increasing precedence, see `merge_catalogs`."""
+        from vents.connections.merge import merge_catalogs
+
+        return merge_catalogs(*catalogs, strategy=strategy)
+
+    def diff(self, catalog: Optional["ConnectionCatalog"]) -> "CatalogDiff":
+        """Returns the changes from this catalog to `catalog`."""
+        from vents.connections.merge import diff_catalogs
+
+        return diff_catalogs(self, catalog)
+
+    def get_connection_for(self, name: Optional[str]) -> Optional[Connection]:
+        """Returns a connection by name, validating it first in lazy mode."""
+        if not name:
+            return None
+        return self._get_connection(name)
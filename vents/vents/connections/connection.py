@@ -1,14 +1,69 @@
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 from typing_extensions import Literal
 
-from clipped.compact.pydantic import Field, StrictStr
+from clipped.compact.pydantic import (
+    PYDANTIC_VERSION,
+    Field,
+    PrivateAttr,
+    StrictStr,
+    field_validator,
+    validation_before,
+)
 from clipped.config.schema import BaseSchemaModel
 from clipped.types.ref_or_obj import RefField
 from vents.connections.connection_resource import ConnectionResource
-from vents.connections.connection_schema import ConnectionSchema
+from vents.connections.connection_schema import (
+    SCHEMAS_BY_KIND,
+    ConnectionSchema,
+    parse_schema,
+)
 from vents.providers.kinds import ProviderKind
 
 
+# Computed once, `ProviderKind` builds these sets on every call
+_MOUNT_KINDS = frozenset(ProviderKind.mount_values())
+_BUCKET_KINDS = frozenset(ProviderKind.blob_values())
+_ARTIFACT_KINDS = _MOUNT_KINDS | _BUCKET_KINDS
+
+_NESTED_MODELS = (ConnectionResource,) + tuple(dict.fromkeys(SCHEMAS_BY_KIND.values()))
+
+
+def _get_model_fields(model_cls: Any) -> Dict[str, Any]:
+    # `model_fields` is only an instance property in the pydantic v1 compat layer
+    if PYDANTIC_VERSION.startswith("2."):
+        return model_cls.model_fields
+    return model_cls.__fields__
+
+
+class _StorePath:
+    """Memoized store path, ignored by the equality and pickling of connections."""
+
+    __slots__ = ("kind", "source", "value")
+
+    def __init__(self, kind: Optional[str], source: Optional[str], value: str):
+        self.kind = kind
+        self.source = source
+        self.value = value
+
+    def __eq__(self, other: Any) -> bool:
+        return True
+
+    def __hash__(self) -> int:
+        return 0
+
+    def __reduce__(self):
+        # Recomputed after unpickling, e.g. in compiled catalogs
+        return _StorePath, (None, None, "")
+
+
+# Aliases -> field names, `model_construct` only takes the names in pydantic v1
+_RESOURCE_FIELDS = {
+    field.alias: name
+    for name, field in _get_model_fields(ConnectionResource).items()
+    if field.alias
+}
+
+
 class Connection(BaseSchemaModel):
     _IDENTIFIER = "connection"
 
@@ -26,6 +81,21 @@ class Connection(BaseSchemaModel):
         Union[Dict[str, Any], List[Union[Tuple[str, str], List[str]]], RefField]
     ] = None
     annotations: Optional[Union[Dict, RefField]] = None
+    _store_path: Optional[_StorePath] = PrivateAttr(default=None)
+
+    # The kind is validated first, it selects the schema model directly
+    if PYDANTIC_VERSION.startswith("2."):
+
+        @field_validator("schema_", **validation_before)  # type: ignore
+        @classmethod
+        def validate_schema(cls, v: Any, info: Any) -> Any:
+            return parse_schema(info.data.get("kind"), v)
+
+    else:
+
+        @field_validator("schema_", **validation_before)  # type: ignore
+        def validate_schema(cls, v: Any, values: Dict[str, Any]) -> Any:
+            return parse_schema(values.get("kind"), v)
 
     def get_schema_as_dict(self) -> Dict[str, Any]:
         schema = self.schema_
@@ -34,63 +104,107 @@ class Connection(BaseSchemaModel):
 
         return schema
 
+    @staticmethod
+    def _get_model_value(value: Any) -> Any:
+        # Vents models are copied as is, other models are converted to dicts
+        if isinstance(value, _NESTED_MODELS):
+            return value.model_copy()
+        if hasattr(value, "to_dict"):
+            return value.to_dict()
+        return value
+
     @classmethod
-    def from_model(cls, model) -> "Connection":
-        schema = model.schema_
-        secret = model.secret
-        config_map = model.config_map
-        if hasattr(schema, "to_dict"):
-            schema = schema.to_dict()
-        if hasattr(secret, "to_dict"):
-            secret = secret.to_dict()
-        if hasattr(config_map, "to_dict"):
-            config_map = config_map.to_dict()
-        return Connection.from_dict(
-            {
+    def from_models(
+        cls, models: Iterable[Any], validate: bool = True
+    ) -> Iterator["Connection"]:
+        """Yields a connection per model, e.g. per ORM row.
+
+        Nested vents models are reused without a dict round trip.
+        If `validate` is False, the connections are built without validation,
+        only use it for trusted sources, raw schema dicts are still parsed by kind.
+        """
+        get_value = cls._get_model_value
+        for model in models:
+            kind = getattr(model.kind, "value", model.kind)
+            values = {
                 "name": model.name,
-                "kind": model.kind,
-                "schema": schema,
-                "secret": secret,
-                "configMap": config_map,
+                "kind": kind,
+                "schema_": get_value(model.schema_),
+                "secret": get_value(model.secret),
+                "config_map": get_value(model.config_map),
                 "env": model.env,
                 "annotations": model.annotations,
             }
-        )
+            values = {k: v for k, v in values.items() if v is not None}
+            if validate:
+                yield cls.from_dict(values)
+                continue
+            if "schema_" in values:
+                values["schema_"] = parse_schema(kind, values["schema_"])
+            for key in ("secret", "config_map"):
+                if isinstance(values.get(key), dict):
+                    values[key] = ConnectionResource.model_construct(
+                        **{
+                            _RESOURCE_FIELDS.get(k, k): v
+                            for k, v in values[key].items()
+                        }
+                    )
+            yield cls.model_construct(**values)
+
+    @classmethod
+    def from_model(cls, model) -> "Connection":
+        return next(cls.from_models([model]))
+
+    @staticmethod
+    def _get_store_path(kind: str, source: str) -> str:
+        if kind in _MOUNT_KINDS:
+            return source.rstrip("/")
+        bucket = source.rstrip("/")
+        if kind == ProviderKind.WASB:
+            from clipped import types
+            from vents.settings import VENTS_CONFIG
+
+            return VENTS_CONFIG.config_parser.parse(types.WASB)(
+                key="schema", value=bucket
+            ).get_container_path()
+        return bucket
 
     @property
     def store_path(self) -> str:
-        if self.is_mount:
-            return self.schema_.mount_path.rstrip("/")
-        if self.is_bucket:
-            bucket = self.schema_.bucket.rstrip("/")
-            if self.is_wasb:
-                from clipped import types
-                from vents.settings import VENTS_CONFIG
-
-                return VENTS_CONFIG.config_parser.parse(types.WASB)(
-                    key="schema", value=bucket
-                ).get_container_path()
-            return bucket
+        kind = self.kind
+        if kind in _MOUNT_KINDS:
+            source = self.schema_.mount_path
+        elif kind in _BUCKET_KINDS:
+            source = self.schema_.bucket
+        else:
+            return None  # type: ignore
+        # Recomputed if the kind or the schema's path is patched
+        cached = self._store_path
+        if cached is not None and cached.kind == kind and cached.source is source:
+            return cached.value
+        value = self._get_store_path(kind, source)
+        self._store_path = _StorePath(kind, source, value)
+        return value
 
     @property
     def is_mount(self) -> bool:
-        return ProviderKind.is_mount(self.kind)
+        return self.kind in _MOUNT_KINDS
 
     @property
     def is_artifact(self) -> bool:
-        return ProviderKind.is_artifact(self.kind)
+        return self.kind in _ARTIFACT_KINDS
 
     @property
     def is_host_path(self) -> bool:
-        return ProviderKind.is_host_path(self.kind)
+        return self.kind == ProviderKind.HOST_PATH
 
     @property
     def is_volume_claim(self) -> bool:
-        return ProviderKind.is_volume_claim(self.kind)
+        return self.kind == ProviderKind.VOLUME_CLAIM
 
     @property
     def is_bucket(self) -> bool:
-        return ProviderKind.is_bucket(self.kind)
+        return self.kind in _BUCKET_KINDS
 
     @property
     def is_gcs(self) -> bool:
@@ -102,7 +216,7 @@ class Connection(BaseSchemaModel):
 
     @property
     def is_wasb(self) -> bool:
-        return ProviderKind.is_wasb(self.kind)
+        return self.kind == ProviderKind.WASB
 
     @staticmethod
     def get_requested_resources(
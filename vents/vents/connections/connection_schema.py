@@ -1,8 +1,9 @@
-from typing import Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Type, Union
 
-from clipped.compact.pydantic import Field, StrictStr
+from clipped.compact.pydantic import Field, StrictStr, ValidationError
 from clipped.config.schema import BaseSchemaModel
 from clipped.types.ref_or_obj import RefField
+from vents.providers.kinds import ProviderKind
 
 
 class BucketConnection(BaseSchemaModel):
@@ -101,3 +102,30 @@ ConnectionSchema = Union[
     Dict,
     RefField,
 ]
+
+SCHEMAS_BY_KIND: Dict[str, Type[BaseSchemaModel]] = {
+    ProviderKind.GCS: BucketConnection,
+    ProviderKind.S3: BucketConnection,
+    ProviderKind.WASB: BucketConnection,
+    ProviderKind.VOLUME_CLAIM: ClaimConnection,
+    ProviderKind.HOST_PATH: HostPathConnection,
+    ProviderKind.GIT: GitConnection,
+    ProviderKind.REGISTRY: HostConnection,
+}
+
+
+def parse_schema(kind: Optional[str], schema: Any) -> Any:
+    """Validates a raw schema with the model of the connection kind.
+
+    Skips trying the `ConnectionSchema` members one by one,
+    values that do not match the kind's model are left to the union.
+    """
+    if not isinstance(schema, dict):
+        return schema
+    schema_cls = SCHEMAS_BY_KIND.get(kind)  # type: ignore
+    if schema_cls is None:
+        return schema
+    try:
+        return schema_cls.from_dict(schema)
+    except ValidationError:
+        return schema
@@ -0,0 +1,121 @@
+from typing import Dict, List, Optional
+
+from clipped.config.patch_strategy import PatchStrategy
+from clipped.config.schema import BaseSchemaModel
+from vents.connections.catalog import ConnectionCatalog
+from vents.connections.connection import Connection
+
+
+def merge_schemas(current, value):
+    """Overrides a connection schema, using the schema's `patch` if it has one."""
+    if value is None:
+        return current
+    if current is None:
+        return value
+    if isinstance(current, BaseSchemaModel) and type(current) is type(value):
+        if "patch" in type(current).__dict__:
+            current = current.model_copy()
+            current.patch(value)
+            return current
+        return value
+    if isinstance(current, dict) and isinstance(value, dict):
+        return {**current, **value}
+    return value
+
+
+def merge_connections(current: Connection, value: Connection) -> Connection:
+    """Returns a new connection with `value` overriding `current`.
+
+    A connection of a different kind replaces the current one,
+    otherwise the fields set in `value` override the current ones,
+    the schemas are patched and the annotations are merged.
+    """
+    if current.kind != value.kind:
+        return value
+    updates = {}
+    for field in value.model_fields_set:
+        override = getattr(value, field)
+        if field == "schema_":
+            override = merge_schemas(current.schema_, override)
+        elif field == "annotations":
+            override = merge_schemas(current.annotations, override)
+        updates[field] = override
+    # Both connections are already validated,
+    # `model_copy(update=...)` is not in the pydantic v1 compat layer
+    return type(current).model_construct(
+        _fields_set=current.model_fields_set | set(updates),
+        **{**current.__dict__, **updates},
+    )
+
+
+def merge_catalogs(
+    *catalogs: Optional[ConnectionCatalog],
+    strategy: Optional[PatchStrategy] = None,
+) -> ConnectionCatalog:
+    """Merges catalogs layered by increasing precedence, e.g. base, team, env.
+
+    With the default `post_merge` strategy, later layers patch the connections
+    of earlier layers, with `pre_merge` earlier layers take precedence,
+    with `replace` later connections replace earlier ones as a whole,
+    and with `isnull` later layers only add new connections.
+    Connections are merged by name in a single pass over each layer,
+    connections appear in the order they were first defined.
+    The input catalogs are not mutated.
+    """
+    strategy = strategy or PatchStrategy.POST_MERGE
+    connections: Dict[str, Connection] = {}
+    for catalog in catalogs:
+        if not catalog:
+            continue
+        for connection in catalog.all_connections:
+            current = connections.get(connection.name)
+            if current is None:
+                connections[connection.name] = connection
+            elif PatchStrategy.is_replace(strategy):
+                connections[connection.name] = connection
+            elif PatchStrategy.is_post_merge(strategy):
+                connections[connection.name] = merge_connections(current, connection)
+            elif PatchStrategy.is_pre_merge(strategy):
+                connections[connection.name] = merge_connections(connection, current)
+    return ConnectionCatalog.from_connections(list(connections.values()))
+
+
+class CatalogDiff(BaseSchemaModel):
+    added: List[str]
+    removed: List[str]
+    changed: List[str]
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+    def apply(self, catalog: ConnectionCatalog, target: ConnectionCatalog) -> None:
+        """Applies the diff to `catalog`, using the connections of `target`."""
+        by_names = target.connections_by_names
+        catalog.replace_many(
+            connections=[by_names[name] for name in self.added + self.changed],
+            removed=self.removed,
+        )
+
+
+def diff_catalogs(
+    current: Optional[ConnectionCatalog], target: Optional[ConnectionCatalog]
+) -> CatalogDiff:
+    """Returns the connection names added, removed, or changed from `current` to `target`.
+
+    Connections are compared by identity first, then by value.
+    """
+    current_connections = current.connections_by_names if current else {}
+    target_connections = target.connections_by_names if target else {}
+    added = []
+    changed = []
+    for name in target_connections:
+        if name not in current_connections:
+            added.append(name)
+            continue
+        connection = current_connections[name]
+        target_connection = target_connections[name]
+        if connection is not target_connection and connection != target_connection:
+            changed.append(name)
+    removed = [name for name in current_connections if name not in target_connections]
+    return CatalogDiff(added=added, removed=removed, changed=changed)
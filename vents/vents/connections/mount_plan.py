@@ -0,0 +1,201 @@
+import posixpath
+from types import MappingProxyType
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from vents.connections.connection import _MOUNT_KINDS, Connection
+from vents.connections.connection_resource import ConnectionResource
+from vents.exceptions import VentError
+
+
+if TYPE_CHECKING:
+    from vents.connections.catalog import ConnectionCatalog
+
+
+def normalize_mount_path(path: str) -> str:
+    """Returns the canonical form of a mount path, e.g. `/data/` -> `/data`."""
+    path = posixpath.normpath(path)
+    if path.startswith("//"):  # Kept by `normpath`
+        path = "/" + path.lstrip("/")
+    return path
+
+
+class MountEntry(NamedTuple):
+    """Resources of a connection, precomputed by the catalog for its mount plans."""
+
+    connection: Connection
+    secret: Optional[ConnectionResource]
+    secret_mount_path: Optional[str]
+    config_map: Optional[ConnectionResource]
+    config_map_mount_path: Optional[str]
+    volume_mount_path: Optional[str]
+
+    @classmethod
+    def from_connection(cls, connection: Connection) -> "MountEntry":
+        secret = connection.secret
+        if not isinstance(secret, ConnectionResource):
+            secret = None
+        config_map = connection.config_map
+        if not isinstance(config_map, ConnectionResource):
+            config_map = None
+        volume_mount_path = None
+        if connection.kind in _MOUNT_KINDS:
+            volume_mount_path = normalize_mount_path(connection.store_path)
+        return cls(
+            connection=connection,
+            secret=secret,
+            secret_mount_path=_get_mount_path(secret),
+            config_map=config_map,
+            config_map_mount_path=_get_mount_path(config_map),
+            volume_mount_path=volume_mount_path,
+        )
+
+
+def _get_mount_path(resource: Optional[ConnectionResource]) -> Optional[str]:
+    if resource is None or not resource.mount_path:
+        return None
+    return normalize_mount_path(resource.mount_path)
+
+
+def _add_resource(
+    resource: ConnectionResource,
+    mount_path: Optional[str],
+    resources: List[ConnectionResource],
+    resource_names: Set[str],
+    mount_paths: Dict[str, str],
+) -> None:
+    resources.append(resource)
+    resource_names.add(resource.name)
+    if mount_path:
+        mount_paths.setdefault(mount_path, resource.name)
+
+
+class MountPlan:
+    """Resolved mounts of a job: connections, secrets, config maps, and volumes.
+
+    Secrets and config maps follow `Connection.get_requested_resources`:
+    the requested resources first, kept as is, then the connections' resources
+    not already requested, deduplicated by name. `mount_paths` maps each normalized mount path
+    to the name of the first volume or resource using it.
+    Plans are immutable and can be shared, see `ConnectionCatalog.get_mount_plan`.
+    """
+
+    __slots__ = ("connections", "secrets", "config_maps", "volumes", "mount_paths")
+
+    connections: Tuple[Connection, ...]
+    secrets: Tuple[ConnectionResource, ...]
+    config_maps: Tuple[ConnectionResource, ...]
+    volumes: Tuple[Connection, ...]
+    mount_paths: Mapping[str, str]
+
+    def __init__(
+        self,
+        connections: Iterable[Connection],
+        secrets: Iterable[ConnectionResource],
+        config_maps: Iterable[ConnectionResource],
+        volumes: Iterable[Connection],
+        mount_paths: Mapping[str, str],
+    ):
+        set_value = object.__setattr__
+        set_value(self, "connections", tuple(connections))
+        set_value(self, "secrets", tuple(secrets))
+        set_value(self, "config_maps", tuple(config_maps))
+        set_value(self, "volumes", tuple(volumes))
+        set_value(self, "mount_paths", MappingProxyType(dict(mount_paths)))
+
+    def __setattr__(self, key: str, value: Any):
+        raise AttributeError("MountPlan is read-only.")
+
+    def __delattr__(self, key: str):
+        raise AttributeError("MountPlan is read-only.")
+
+    def __reduce__(self):
+        return self.__class__, (
+            self.connections,
+            self.secrets,
+            self.config_maps,
+            self.volumes,
+            dict(self.mount_paths),
+        )
+
+    @classmethod
+    def build(
+        cls,
+        catalog: "ConnectionCatalog",
+        connection_names: Iterable[str],
+        secrets: Optional[List[ConnectionResource]] = None,
+        config_maps: Optional[List[ConnectionResource]] = None,
+    ) -> "MountPlan":
+        """Computes the plan in a single pass over the requested connections,
+        using the resources precomputed by the catalog."""
+        requested_secrets: List[ConnectionResource] = []
+        requested_config_maps: List[ConnectionResource] = []
+        secret_names: Set[str] = set()
+        config_map_names: Set[str] = set()
+        mount_paths: Dict[str, str] = {}
+        for resource in secrets or []:
+            if resource.is_requested:
+                _add_resource(
+                    resource,
+                    _get_mount_path(resource),
+                    requested_secrets,
+                    secret_names,
+                    mount_paths,
+                )
+        for resource in config_maps or []:
+            if resource.is_requested:
+                _add_resource(
+                    resource,
+                    _get_mount_path(resource),
+                    requested_config_maps,
+                    config_map_names,
+                    mount_paths,
+                )
+
+        get_mount_entry = catalog.get_mount_entry
+        connections: Dict[str, Connection] = {}
+        volumes: List[Connection] = []
+        for name in connection_names:
+            if name in connections:
+                continue
+            entry = get_mount_entry(name)
+            if entry is None:
+                raise VentError("Connection `{}` is not in the catalog.".format(name))
+            connections[name] = entry.connection
+            if entry.secret and entry.secret.name not in secret_names:
+                _add_resource(
+                    entry.secret,
+                    entry.secret_mount_path,
+                    requested_secrets,
+                    secret_names,
+                    mount_paths,
+                )
+            if entry.config_map and entry.config_map.name not in config_map_names:
+                _add_resource(
+                    entry.config_map,
+                    entry.config_map_mount_path,
+                    requested_config_maps,
+                    config_map_names,
+                    mount_paths,
+                )
+            if entry.volume_mount_path is not None:
+                volumes.append(entry.connection)
+                mount_paths.setdefault(entry.volume_mount_path, name)
+
+        return cls(
+            connections=connections.values(),
+            secrets=requested_secrets,
+            config_maps=requested_config_maps,
+            volumes=volumes,
+            mount_paths=mount_paths,
+        )
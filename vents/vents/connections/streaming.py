@@ -0,0 +1,238 @@
+import io
+import re
+import threading
+from typing import IO, Dict, Iterator, List, Optional, Tuple, Union
+
+from clipped.utils.json import orjson_loads
+from vents.connections.catalog import ConnectionCatalog
+from vents.connections.connection import Connection
+from vents.exceptions import VentError
+
+
+_TOKENS = re.compile(rb'[{}\[\]"]')
+_STRING_END = re.compile(rb'["\\]')
+
+CHUNK_SIZE = 1 << 16
+
+
+def iter_catalog_entries(
+    stream: IO[bytes], chunk_size: int = CHUNK_SIZE
+) -> Iterator[Tuple[int, int, bytes]]:
+    """Yields the `(start, end, raw)` byte spans of the `connections` entries.
+
+    The JSON document is scanned chunk by chunk, only the current entry
+    is kept in memory, entries are not decoded.
+    """
+    buffer = b""
+    base = 0  # Offset of the buffer in the stream
+    pos = 0
+    depth = 0
+    key: Optional[bytes] = None
+    in_connections = False
+    string_start: Optional[int] = None
+    entry_start: Optional[int] = None
+    eof = False
+
+    while True:
+        if string_start is not None:
+            match = _STRING_END.search(buffer, pos)
+            if match is not None and match.group() == b"\\":
+                if match.end() < len(buffer):
+                    pos = match.end() + 1
+                    continue
+                match = None  # The escaped char is in the next chunk
+            if match is not None:
+                if depth == 1 and not in_connections:
+                    key = buffer[string_start : match.start()]
+                string_start = None
+                pos = match.end()
+                continue
+        else:
+            match = _TOKENS.search(buffer, pos)
+            if match is not None:
+                token = match.group()
+                pos = match.end()
+                if token == b'"':
+                    string_start = pos
+                elif token in (b"{", b"["):
+                    if depth == 1 and token == b"[" and key == b"connections":
+                        in_connections = True
+                    elif in_connections and depth == 2 and token == b"{":
+                        entry_start = match.start()
+                    depth += 1
+                else:
+                    depth -= 1
+                    if in_connections and depth == 2 and entry_start is not None:
+                        yield base + entry_start, base + pos, buffer[entry_start:pos]
+                        entry_start = None
+                    elif in_connections and depth == 1:
+                        return
+                continue
+
+        # Needs more data, drops what was already consumed
+        if eof:
+            if depth or string_start is not None:
+                raise VentError("Received an incomplete connections catalog.")
+            return
+        keep = pos
+        if entry_start is not None:
+            keep = entry_start
+        elif string_start is not None:
+            keep = string_start
+        buffer = buffer[keep:]
+        base += keep
+        pos -= keep
+        if entry_start is not None:
+            entry_start -= keep
+        if string_start is not None:
+            string_start -= keep
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            eof = True
+        buffer += chunk
+
+
+class StreamingCatalog:
+    """Read-only catalog streamed from a large JSON document.
+
+    Entries are scanned incrementally and indexed by name with their byte span,
+    connections are only validated on lookup and memoized,
+    `get_connection_for` returns as soon as the entry is reached.
+    Accepts a file path or a JSON payload.
+    """
+
+    def __init__(self, source: Union[str, bytes], chunk_size: int = CHUNK_SIZE):
+        self._path: Optional[str] = None
+        self._data: Optional[bytes] = None
+        if isinstance(source, bytes):
+            self._data = source
+        elif source.lstrip().startswith("{"):
+            self._data = source.encode()
+        else:
+            self._path = source
+        self.chunk_size = chunk_size
+        self._spans: Dict[str, Tuple[int, int]] = {}
+        self._names: List[str] = []
+        self._connections: Dict[str, Connection] = {}
+        self._entries: Optional[Iterator[Tuple[int, int, bytes]]] = None
+        self._stream: Optional[IO[bytes]] = None
+        self._done = False
+        self._lock = threading.RLock()
+
+    def _open(self) -> IO[bytes]:
+        if self._data is not None:
+            return io.BytesIO(self._data)
+        return open(self._path, "rb")  # type: ignore
+
+    def _advance(self) -> Optional[Tuple[str, Dict]]:
+        """Indexes the next entry, returns None once the document is consumed."""
+        if self._done:
+            return None
+        if self._entries is None:
+            self._stream = self._open()
+            self._entries = iter_catalog_entries(self._stream, self.chunk_size)
+        try:
+            start, end, raw = next(self._entries)
+        except StopIteration:
+            self._close()
+            return None
+        except Exception:
+            self._close()
+            raise
+        # Only the span is kept, the decoded entry is dropped unless requested
+        entry = orjson_loads(raw)
+        name = entry.get("name")
+        if not name:
+            raise VentError(
+                "Received a connection without a name at offset {}.".format(start)
+            )
+        if name not in self._spans:
+            self._names.append(name)
+        self._spans[name] = (start, end)
+        return name, entry
+
+    def _close(self) -> None:
+        self._done = True
+        self._entries = None
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    def _read_span(self, span: Tuple[int, int]) -> bytes:
+        if self._data is not None:
+            return self._data[span[0] : span[1]]
+        with open(self._path, "rb") as f:  # type: ignore
+            f.seek(span[0])
+            return f.read(span[1] - span[0])
+
+    def get_connection_for(self, name: Optional[str]) -> Optional[Connection]:
+        """Returns a connection by name, streaming the document up to its entry."""
+        if not name:
+            return None
+        with self._lock:
+            connection = self._connections.get(name)
+            if connection is not None:
+                return connection
+            span = self._spans.get(name)
+            if span is not None:
+                connection = Connection.from_dict(orjson_loads(self._read_span(span)))
+                self._connections[name] = connection
+                return connection
+            while True:
+                entry = self._advance()
+                if entry is None:
+                    return None
+                if entry[0] == name:
+                    connection = Connection.from_dict(entry[1])
+                    self._connections[name] = connection
+                    return connection
+
+    def evict(self, name: str) -> None:
+        """Drops a validated connection, it's re-read from its span on next lookup."""
+        with self._lock:
+            if name in self._spans:
+                self._connections.pop(name, None)
+
+    def iter_connections(self) -> Iterator[Connection]:
+        """Iterates over all the connections in the document order,
+        without memoizing the ones that were not looked up."""
+        i = 0
+        while True:
+            with self._lock:
+                entry = None
+                if i < len(self._names):
+                    name = self._names[i]
+                else:
+                    advanced = self._advance()
+                    if advanced is None:
+                        return
+                    name, entry = advanced
+                connection = self._connections.get(name)
+                span = self._spans[name]
+            i += 1
+            if connection is None:
+                if entry is None:
+                    entry = orjson_loads(self._read_span(span))
+                connection = Connection.from_dict(entry)
+            yield connection
+
+    @property
+    def names(self) -> List[str]:
+        with self._lock:
+            while self._advance() is not None:
+                pass
+            return self._names[:]
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            while name not in self._spans:
+                if self._advance() is None:
+                    return False
+            return True
+
+    def load(self) -> ConnectionCatalog:
+        """Materializes the full catalog."""
+        return ConnectionCatalog(connections=list(self.iter_connections()))
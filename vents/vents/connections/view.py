@@ -0,0 +1,124 @@
+import sys
+from typing import Any, Optional, Tuple
+
+from vents.connections.connection import (
+    _ARTIFACT_KINDS,
+    _BUCKET_KINDS,
+    _MOUNT_KINDS,
+    Connection,
+)
+from vents.connections.connection_resource import ConnectionResource
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    # Kinds, tags, and resource names are repeated across catalogs
+    return sys.intern(value) if isinstance(value, str) else None
+
+
+class ConnectionView:
+    """Frozen, compact read-only view of a `Connection`.
+
+    Keeps the values used by read-only code in `__slots__`,
+    with the repeated strings interned.
+    """
+
+    __slots__ = (
+        "name",
+        "kind",
+        "store_path",
+        "tags",
+        "secret",
+        "secret_mount_path",
+        "config_map",
+        "config_map_mount_path",
+    )
+
+    name: str
+    kind: str
+    store_path: Optional[str]
+    tags: Tuple[str, ...]
+    secret: Optional[str]
+    secret_mount_path: Optional[str]
+    config_map: Optional[str]
+    config_map_mount_path: Optional[str]
+
+    def __init__(
+        self,
+        name: str,
+        kind: str,
+        store_path: Optional[str] = None,
+        tags: Tuple[str, ...] = (),
+        secret: Optional[str] = None,
+        secret_mount_path: Optional[str] = None,
+        config_map: Optional[str] = None,
+        config_map_mount_path: Optional[str] = None,
+    ):
+        set_value = object.__setattr__
+        set_value(self, "name", name)
+        set_value(self, "kind", _intern(kind))
+        set_value(self, "store_path", store_path)
+        set_value(self, "tags", tuple(_intern(t) for t in tags))
+        set_value(self, "secret", _intern(secret))
+        set_value(self, "secret_mount_path", _intern(secret_mount_path))
+        set_value(self, "config_map", _intern(config_map))
+        set_value(self, "config_map_mount_path", _intern(config_map_mount_path))
+
+    @classmethod
+    def from_connection(cls, connection: Connection) -> "ConnectionView":
+        secret = connection.secret
+        if not isinstance(secret, ConnectionResource):
+            secret = None
+        config_map = connection.config_map
+        if not isinstance(config_map, ConnectionResource):
+            config_map = None
+        try:
+            store_path = connection.store_path
+        except AttributeError:  # Unstructured schemas, e.g. refs
+            store_path = None
+        return cls(
+            name=connection.name,
+            kind=connection.kind,
+            store_path=store_path,
+            tags=connection.tags if isinstance(connection.tags, list) else (),
+            secret=secret.name if secret else None,
+            secret_mount_path=secret.mount_path if secret else None,
+            config_map=config_map.name if config_map else None,
+            config_map_mount_path=config_map.mount_path if config_map else None,
+        )
+
+    def __setattr__(self, key: str, value: Any):
+        raise AttributeError("ConnectionView is read-only.")
+
+    def __delattr__(self, key: str):
+        raise AttributeError("ConnectionView is read-only.")
+
+    def __reduce__(self):
+        return self.__class__, self._astuple()
+
+    def _astuple(self) -> Tuple:
+        return tuple(getattr(self, k) for k in self.__slots__)
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, ConnectionView):
+            return NotImplemented
+        return self._astuple() == other._astuple()
+
+    def __hash__(self) -> int:
+        return hash(self._astuple())
+
+    def __repr__(self) -> str:
+        return "ConnectionView(name={!r}, kind={!r}, store_path={!r})".format(
+            self.name, self.kind, self.store_path
+        )
+
+    @property
+    def is_mount(self) -> bool:
+        return self.kind in _MOUNT_KINDS
+
+    @property
+    def is_bucket(self) -> bool:
+        return self.kind in _BUCKET_KINDS
+
+    @property
+    def is_artifact(self) -> bool:
+        return self.kind in _ARTIFACT_KINDS
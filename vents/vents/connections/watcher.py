@@ -0,0 +1,169 @@
+import hashlib
+import logging
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple
+import yaml
+
+from clipped.utils.json import orjson_loads
+from vents.connections.catalog import ConnectionCatalog
+from vents.connections.connection import Connection
+
+
+if TYPE_CHECKING:
+    from vents.config import AppConfig
+
+
+_logger = logging.getLogger("vents.connections.watcher")
+
+
+class CatalogWatcher:
+    """Hot-reloads a catalog file (JSON/YAML) into `AppConfig.catalog`.
+
+    The file's directory is watched with inotify if `inotify_simple` is installed,
+    otherwise the file is polled for mtime changes every `interval` seconds.
+    The file is re-parsed only when its content hash changes, and connections
+    with unchanged entries keep their previous instance (and validation),
+    so anything built from them stays valid. The new catalog is swapped
+    with a single assignment, readers are never blocked.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        config: Optional["AppConfig"] = None,
+        interval: float = 1.0,
+        on_change: Optional[Callable[[ConnectionCatalog, Set[str]], None]] = None,
+        use_inotify: Optional[bool] = None,
+    ):
+        self.path = path
+        self._config = config
+        self.interval = interval
+        self.on_change = on_change
+        self.use_inotify = use_inotify
+        self._stat: Optional[Tuple[int, int, int]] = None
+        self._digest: Optional[str] = None
+        self._entries: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def config(self) -> "AppConfig":
+        if self._config is None:
+            from vents.settings import VENTS_CONFIG
+
+            return VENTS_CONFIG
+        return self._config
+
+    def _get_stat(self) -> Optional[Tuple[int, int, int]]:
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    @staticmethod
+    def _parse(content: bytes) -> Dict:
+        try:
+            return orjson_loads(content)
+        except ValueError:
+            return yaml.safe_load(content) or {}
+
+    def _build_catalog(self, data: Dict) -> Tuple[ConnectionCatalog, Set[str]]:
+        current = self.config.catalog_
+        current_connections = current.connections_by_names if current else {}
+        entries: Dict[str, Any] = {}
+        connections: List[Connection] = []
+        changed: Set[str] = set()
+        for entry in data.get("connections") or []:
+            name = entry.get("name")
+            entries[name] = entry
+            connection = current_connections.get(name)
+            if connection is None or self._entries.get(name) != entry:
+                connection = Connection.from_dict(entry)
+                changed.add(name)
+            connections.append(connection)
+        changed |= set(current_connections) - set(entries)
+        self._entries = entries
+        return ConnectionCatalog.from_connections(connections), changed
+
+    def reload(self, force: bool = False) -> bool:
+        """Reloads the catalog if the file changed, returns True if it was swapped."""
+        with self._lock:
+            stat = self._get_stat()
+            if stat is None or (stat == self._stat and not force):
+                return False
+            with open(self.path, "rb") as f:
+                content = f.read()
+            self._stat = stat
+            digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+            if digest == self._digest and not force:
+                return False
+
+            catalog, changed = self._build_catalog(self._parse(content))
+            self._digest = digest
+            # Single reference swap, readers see either the old or the new catalog
+            self.config.catalog = catalog
+        _logger.debug("Reloaded catalog %s, changed: %s", self.path, changed)
+        if self.on_change:
+            self.on_change(catalog, changed)
+        return True
+
+    def _safe_reload(self):
+        try:
+            self.reload()
+        except Exception as e:  # Keep serving the previous catalog
+            _logger.warning("Could not reload catalog %s: %s", self.path, e)
+
+    def _get_inotify(self):
+        if self.use_inotify is False:
+            return None
+        try:
+            from inotify_simple import INotify, flags
+        except ImportError:
+            return None
+
+        inotify = INotify()
+        # Watch the directory to catch atomic renames and symlink swaps
+        inotify.add_watch(
+            os.path.dirname(os.path.abspath(self.path)),
+            flags.CLOSE_WRITE | flags.MOVED_TO | flags.CREATE | flags.DELETE,
+        )
+        return inotify
+
+    def _run(self):
+        inotify = self._get_inotify()
+        try:
+            while not self._stop_event.is_set():
+                if inotify is not None:
+                    if inotify.read(timeout=int(self.interval * 1000)):
+                        self._safe_reload()
+                else:
+                    self._safe_reload()
+                    self._stop_event.wait(self.interval)
+        finally:
+            if inotify is not None:
+                inotify.close()
+
+    def start(self) -> "CatalogWatcher":
+        self._safe_reload()
+        if self._thread is None:
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="vents-catalog-watcher", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self) -> "CatalogWatcher":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
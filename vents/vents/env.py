@@ -0,0 +1,101 @@
+import os
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+
+def normalize_env_key(key: str) -> str:
+    """Case-folds a key and strips its underscores, e.g. `AWS_REGION` -> `awsregion`."""
+    return key.casefold().replace("_", "")
+
+
+class EnvSnapshot:
+    """Copy of the environment indexed by normalized key.
+
+    Names with the env prefix are also indexed without the prefix,
+    so checking all the variants of a key is a single dict hit.
+    The snapshot only changes through `update`, which bumps its version.
+    """
+
+    __slots__ = ("env_prefix", "version", "_env", "_index")
+
+    def __init__(
+        self,
+        env: Optional[Mapping[str, str]] = None,
+        env_prefix: Optional[str] = None,
+        version: int = 0,
+    ):
+        self.env_prefix = env_prefix
+        self.version = version
+        self._env: Dict[str, str] = dict(os.environ if env is None else env)
+        self._index: Dict[str, Tuple[str, ...]] = {}
+        for name in self._env:
+            self._index_name(name)
+
+    def _get_normalized_keys(self, name: str) -> Tuple[str, ...]:
+        normalized = normalize_env_key(name)
+        prefix = "{}_".format(self.env_prefix) if self.env_prefix else None
+        if prefix and name.startswith(prefix):
+            return normalized, normalize_env_key(name[len(prefix) :])
+        return (normalized,)
+
+    def _index_name(self, name: str) -> None:
+        for normalized in self._get_normalized_keys(name):
+            self._index[normalized] = self._index.get(normalized, ()) + (name,)
+
+    def _unindex_name(self, name: str) -> None:
+        for normalized in self._get_normalized_keys(name):
+            names = tuple(n for n in self._index.get(normalized, ()) if n != name)
+            if names:
+                self._index[normalized] = names
+            else:
+                self._index.pop(normalized, None)
+
+    def __len__(self) -> int:
+        return len(self._env)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._env
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        return self._env.get(name, default)
+
+    def get_names(self, normalized_key: str) -> Tuple[str, ...]:
+        """Returns the env names matching a normalized key, prefixed or not."""
+        return self._index.get(normalized_key, ())
+
+    def has_any(self, normalized_keys: Iterable[str]) -> bool:
+        index = self._index
+        for key in normalized_keys:
+            if key in index:
+                return True
+        return False
+
+    def find(self, probes: Tuple[Tuple[str, bool], ...]) -> Optional[Tuple[str, bool]]:
+        """Returns the first non-empty `(value, flag)` of the `(name, flag)` probes."""
+        env = self._env
+        for name, flag in probes:
+            value = env.get(name)
+            if value:
+                return value, flag
+        return None
+
+    def update(self, env: Mapping[str, Optional[str]]) -> Tuple[str, ...]:
+        """Sets the given names, `None` removes them, and returns the changed ones.
+
+        Only the changed names are reindexed, the version is bumped if any changed.
+        """
+        changed = []
+        for name, value in env.items():
+            current = self._env.get(name)
+            if value == current:
+                continue
+            changed.append(name)
+            if value is None:
+                del self._env[name]
+                self._unindex_name(name)
+            else:
+                self._env[name] = value
+                if current is None:
+                    self._index_name(name)
+        if changed:
+            self.version += 1
+        return tuple(changed)
@@ -74,3 +74,4 @@ class AnthropicService(BaseService):
             os.environ["ANTHROPIC_API_KEY"] = self.api_key
         if self.kwargs:
             os.environ["ANTHROPIC_KWARGS"] = orjson_dumps(self.kwargs)
+        VENTS_CONFIG.refresh_env("ANTHROPIC_API_KEY", "ANTHROPIC_KWARGS")
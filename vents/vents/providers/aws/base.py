@@ -1,78 +1,123 @@
 from typing import List, Optional, Union
 
 from clipped.utils.bools import to_bool
+from vents.config import KeySpec, KeysResolver
 from vents.settings import VENTS_CONFIG
 
 
+AWS_ACCESS_KEY_ID_KEYS = KeySpec(["AWS_ACCESS_KEY_ID"])
+AWS_SECRET_ACCESS_KEY_KEYS = KeySpec(["AWS_SECRET_ACCESS_KEY"])
+AWS_SECURITY_TOKEN_KEYS = KeySpec(["AWS_SECURITY_TOKEN"])
+AWS_REGION_KEYS = KeySpec(["AWS_REGION"])
+AWS_ENDPOINT_URL_KEYS = KeySpec(["AWS_ENDPOINT_URL"])
+AWS_STS_ENDPOINT_URL_KEYS = KeySpec(["AWS_STS_ENDPOINT_URL"])
+AWS_USE_SSL_KEYS = KeySpec(["AWS_USE_SSL"])
+AWS_VERIFY_SSL_KEYS = KeySpec(["AWS_VERIFY_SSL"])
+AWS_ASSUME_ROLE_KEYS = KeySpec(["AWS_ASSUME_ROLE"])
+AWS_ROLE_ARN_KEYS = KeySpec(["AWS_ROLE_ARN"])
+AWS_SESSION_NAME_KEYS = KeySpec(["AWS_SESSION_NAME"])
+AWS_SESSION_DURATION_KEYS = KeySpec(["AWS_SESSION_DURATION"])
+
+
 def get_aws_access_key_id(
-    keys: Optional[Union[str, List[str]]] = None,
+    keys: Optional[Union[str, List[str], KeySpec]] = None,
     context_paths: Optional[List[str]] = None,
     schema: Optional[str] = None,
     env: Optional[str] = None,
+    resolver: Optional[KeysResolver] = None,
 ) -> Optional[str]:
-    keys = keys or ["AWS_ACCESS_KEY_ID"]
+    keys = keys or AWS_ACCESS_KEY_ID_KEYS
     return VENTS_CONFIG.read_keys(
-        context_paths=context_paths, schema=schema, env=env, keys=keys
+        context_paths=context_paths,
+        schema=schema,
+        env=env,
+        keys=keys,
+        resolver=resolver,
     )  # type: ignore
 
 
 def get_aws_secret_access_key(
-    keys: Optional[Union[str, List[str]]] = None,
+    keys: Optional[Union[str, List[str], KeySpec]] = None,
     context_paths: Optional[List[str]] = None,
     schema: Optional[str] = None,
     env: Optional[str] = None,
+    resolver: Optional[KeysResolver] = None,
 ) -> Optional[str]:
-    keys = keys or ["AWS_SECRET_ACCESS_KEY"]
+    keys = keys or AWS_SECRET_ACCESS_KEY_KEYS
     return VENTS_CONFIG.read_keys(
-        context_paths=context_paths, schema=schema, env=env, keys=keys
+        context_paths=context_paths,
+        schema=schema,
+        env=env,
+        keys=keys,
+        resolver=resolver,
     )  # type: ignore
 
 
 def get_aws_security_token(
-    keys: Optional[Union[str, List[str]]] = None,
+    keys: Optional[Union[str, List[str], KeySpec]] = None,
     context_paths: Optional[List[str]] = None,
     schema: Optional[str] = None,
     env: Optional[str] = None,
+    resolver: Optional[KeysResolver] = None,
 ) -> Optional[str]:
-    keys = keys or ["AWS_SECURITY_TOKEN"]
+    keys = keys or AWS_SECURITY_TOKEN_KEYS
     return VENTS_CONFIG.read_keys(
-        context_paths=context_paths, schema=schema, env=env, keys=keys
+        context_paths=context_paths,
+        schema=schema,
+        env=env,
+        keys=keys,
+        resolver=resolver,
     )  # type: ignore
 
 
 def get_region(
-    keys: Optional[Union[str, List[str]]] = None,
+    keys: Optional[Union[str, List[str], KeySpec]] = None,
     context_paths: Optional[List[str]] = None,
     schema: Optional[str] = None,
     env: Optional[str] = None,
+    resolver: Optional[KeysResolver] = None,
 ) -> Optional[str]:
-    keys = keys or ["AWS_REGION"]
+    keys = keys or AWS_REGION_KEYS
     return VENTS_CONFIG.read_keys(
-        context_paths=context_paths, schema=schema, env=env, keys=keys
+        context_paths=context_paths,
+        schema=schema,
+        env=env,
+        keys=keys,
+        resolver=resolver,
     )  # type: ignore
 
 
 def get_endpoint_url(
-    keys: Optional[Union[str, List[str]]] = None,
+    keys: Optional[Union[str, List[str], KeySpec]] = None,
     context_paths: Optional[List[str]] = None,
     schema: Optional[str] = None,
     env: Optional[str] = None,
+    resolver: Optional[KeysResolver] = None,
 ) -> Optional[str]:
-    keys = keys or ["AWS_ENDPOINT_URL"]
+    keys = keys or AWS_ENDPOINT_URL_KEYS
     return VENTS_CONFIG.read_keys(
-        context_paths=context_paths, schema=schema, env=env, keys=keys
+        context_paths=context_paths,
+        schema=schema,
+        env=env,
+        keys=keys,
+        resolver=resolver,
     )  # type: ignore
 
 
 def get_aws_use_ssl(
-    keys: Optional[Union[str, List[str]]] = None,
+    keys: Optional[Union[str, List[str], KeySpec]] = None,
     context_paths: Optional[List[str]] = None,
     schema: Optional[str] = None,
     env: Optional[str] = None,
+    resolver: Optional[KeysResolver] = None,
 ) -> Optional[bool]:
-    keys = keys or ["AWS_USE_SSL"]
+    keys = keys or AWS_USE_SSL_KEYS
     value = VENTS_CONFIG.read_keys(
-        context_paths=context_paths, schema=schema, env=env, keys=keys
+        context_paths=context_paths,
+        schema=schema,
+        env=env,
+        keys=keys,
+        resolver=resolver,
     )  # type: ignore
     if value is not None:
         return to_bool(value)
@@ -80,14 +125,19 @@ def get_aws_use_ssl(
 
 
 def get_aws_verify_ssl(
-    keys: Optional[Union[str, List[str]]] = None,
+    keys: Optional[Union[str, List[str], KeySpec]] = None,
     context_paths: Optional[List[str]] = None,
     schema: Optional[str] = None,
     env: Optional[str] = None,
+    resolver: Optional[KeysResolver] = None,
 ) -> Optional[bool]:
-    keys = keys or ["AWS_VERIFY_SSL"]
+    keys = keys or AWS_VERIFY_SSL_KEYS
     value = VENTS_CONFIG.read_keys(
-        context_paths=context_paths, schema=schema, env=env, keys=keys
+        context_paths=context_paths,
+        schema=schema,
+        env=env,
+        keys=keys,
+        resolver=resolver,
     )  # type: ignore
     if value is not None:
         return to_bool(value)
@@ -98,19 +148,17 @@ def get_aws_session(
     context_paths: Optional[List[str]] = None,
     schema: Optional[str] = None,
     env: Optional[str] = None,
+    resolver: Optional[KeysResolver] = None,
 ):
     import boto3
 
-    aws_access_key_id = get_aws_access_key_id(
+    resolver = resolver or VENTS_CONFIG.get_keys_resolver(
         context_paths=context_paths, schema=schema, env=env
     )
-    aws_secret_access_key = get_aws_secret_access_key(
-        context_paths=context_paths, schema=schema, env=env
-    )
-    aws_session_token = get_aws_security_token(
-        context_paths=context_paths, schema=schema, env=env
-    )
-    region_name = get_region(context_paths=context_paths, schema=schema, env=env)
+    aws_access_key_id = get_aws_access_key_id(resolver=resolver)
+    aws_secret_access_key = get_aws_secret_access_key(resolver=resolver)
+    aws_session_token = get_aws_security_token(resolver=resolver)
+    region_name = get_region(resolver=resolver)
     return boto3.session.Session(
         aws_access_key_id=aws_access_key_id,
         aws_secret_access_key=aws_secret_access_key,
@@ -119,21 +167,57 @@ def get_aws_session(
     )
 
 
+def _get_cached_aws_client(
+    method: str,
+    service_name: str,
+    resolver: KeysResolver,
+    max_pool_connections: Optional[int] = None,
+):
+    from vents.providers.aws.clients import AWS_CLIENTS_CACHE, get_credentials_identity
+
+    aws_access_key_id = get_aws_access_key_id(resolver=resolver)
+    aws_secret_access_key = get_aws_secret_access_key(resolver=resolver)
+    aws_session_token = get_aws_security_token(resolver=resolver)
+    region_name = get_region(resolver=resolver)
+
+    def session_factory():
+        import boto3
+
+        return boto3.session.Session(
+            aws_access_key_id=aws_access_key_id,
+            aws_secret_access_key=aws_secret_access_key,
+            aws_session_token=aws_session_token,
+            region_name=region_name,
+        )
+
+    return getattr(AWS_CLIENTS_CACHE, method)(
+        session_factory=session_factory,
+        service_name=service_name,
+        region_name=region_name,
+        endpoint_url=get_endpoint_url(resolver=resolver),
+        use_ssl=get_aws_use_ssl(resolver=resolver),
+        verify=get_aws_verify_ssl(resolver=resolver),
+        max_pool_connections=max_pool_connections,
+        credentials=get_credentials_identity(
+            access_key_id=aws_access_key_id,
+            secret_access_key=aws_secret_access_key,
+            session_token=aws_session_token,
+        ),
+    )
+
+
 def get_aws_client(
     client_type,
     context_paths: Optional[List[str]] = None,
+    max_pool_connections: Optional[int] = None,
 ):
-    session = get_aws_session(
-        context_paths=context_paths,
-    )
-    endpoint_url = get_endpoint_url(context_paths=context_paths)
-    aws_use_ssl = get_aws_use_ssl(context_paths=context_paths)
-    aws_verify_ssl = get_aws_verify_ssl(context_paths=context_paths)
-    return session.client(
-        client_type,
-        endpoint_url=endpoint_url,
-        use_ssl=aws_use_ssl,
-        verify=aws_verify_ssl,
+    """Returns a cached client, the session is only created on a cache miss."""
+    resolver = VENTS_CONFIG.get_keys_resolver(context_paths=context_paths)
+    return _get_cached_aws_client(
+        "get_client",
+        service_name=client_type,
+        resolver=resolver,
+        max_pool_connections=max_pool_connections,
     )
 
 
@@ -142,28 +226,34 @@ def get_aws_resource(
     schema: Optional[str] = None,
     env: Optional[str] = None,
     context_paths: Optional[List[str]] = None,
+    max_pool_connections: Optional[int] = None,
 ):
-    session = get_aws_session(context_paths=context_paths, schema=schema, env=env)
-    endpoint_url = get_endpoint_url(context_paths=context_paths)
-    aws_use_ssl = get_aws_use_ssl(context_paths=context_paths)
-    aws_verify_ssl = get_aws_verify_ssl(context_paths=context_paths)
-    return session.resource(
-        resource_type,
-        endpoint_url=endpoint_url,
-        use_ssl=aws_use_ssl,
-        verify=aws_verify_ssl,
+    """Returns a resource cached for the current thread."""
+    resolver = VENTS_CONFIG.get_keys_resolver(
+        context_paths=context_paths, schema=schema, env=env
+    )
+    return _get_cached_aws_client(
+        "get_resource",
+        service_name=resource_type,
+        resolver=resolver,
+        max_pool_connections=max_pool_connections,
     )
 
 
 def get_aws_assume_role(
-    keys: Optional[Union[str, List[str]]] = None,
+    keys: Optional[Union[str, List[str], KeySpec]] = None,
     context_paths: Optional[List[str]] = None,
     schema: Optional[str] = None,
     env: Optional[str] = None,
+    resolver: Optional[KeysResolver] = None,
 ) -> Optional[bool]:
-    keys = keys or ["AWS_ASSUME_ROLE"]
+    keys = keys or AWS_ASSUME_ROLE_KEYS
     value = VENTS_CONFIG.read_keys(
-        context_paths=context_paths, schema=schema, env=env, keys=keys
+        context_paths=context_paths,
+        schema=schema,
+        env=env,
+        keys=keys,
+        resolver=resolver,
     )  # type: ignore
     if value is not None:
         return to_bool(value)
@@ -171,36 +261,54 @@ def get_aws_assume_role(
 
 
 def get_aws_role_arn(
-    keys: Optional[Union[str, List[str]]] = None,
+    keys: Optional[Union[str, List[str], KeySpec]] = None,
     context_paths: Optional[List[str]] = None,
     schema: Optional[str] = None,
     env: Optional[str] = None,
+    resolver: Optional[KeysResolver] = None,
 ) -> Optional[str]:
-    keys = keys or ["AWS_ROLE_ARN"]
+    keys = keys or AWS_ROLE_ARN_KEYS
     return VENTS_CONFIG.read_keys(
-        context_paths=context_paths, schema=schema, env=env, keys=keys
+        context_paths=context_paths,
+        schema=schema,
+        env=env,
+        keys=keys,
+        resolver=resolver,
     )  # type: ignore
 
 
 def get_aws_session_name(
-    keys: Optional[Union[str, List[str]]] = None,
+    keys: Optional[Union[str, List[str], KeySpec]] = None,
     context_paths: Optional[List[str]] = None,
     schema: Optional[str] = None,
     env: Optional[str] = None,
+    resolver: Optional[KeysResolver] = None,
 ) -> Optional[str]:
-    keys = keys or ["AWS_SESSION_NAME"]
+    keys = keys or AWS_SESSION_NAME_KEYS
     return VENTS_CONFIG.read_keys(
-        context_paths=context_paths, schema=schema, env=env, keys=keys
+        context_paths=context_paths,
+        schema=schema,
+        env=env,
+        keys=keys,
+        resolver=resolver,
     )  # type: ignore
 
 
 def get_aws_session_duration(
-    keys: Optional[Union[str, List[str]]] = None,
+    keys: Optional[Union[str, List[str], KeySpec]] = None,
     context_paths: Optional[List[str]] = None,
     schema: Optional[str] = None,
     env: Optional[str] = None,
-) -> Optional[str]:
-    keys = keys or ["AWS_SESSION_DURATION"]
-    return VENTS_CONFIG.read_keys(
-        context_paths=context_paths, schema=schema, env=env, keys=keys
+    resolver: Optional[KeysResolver] = None,
+) -> Optional[int]:
+    keys = keys or AWS_SESSION_DURATION_KEYS
+    value = VENTS_CONFIG.read_keys(
+        context_paths=context_paths,
+        schema=schema,
+        env=env,
+        keys=keys,
+        resolver=resolver,
     )  # type: ignore
+    if value is not None:
+        return int(value)
+    return None
@@ -0,0 +1,232 @@
+import asyncio
+from collections import OrderedDict
+import contextlib
+import hashlib
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import weakref
+
+
+DEFAULT_MAX_POOL_CONNECTIONS = 10
+
+
+def get_credentials_identity(
+    access_key_id: Optional[str] = None,
+    secret_access_key: Optional[str] = None,
+    session_token: Optional[str] = None,
+    credentials: Optional[Any] = None,
+) -> Hashable:
+    """Returns the identity of the credentials used to build a client.
+
+    Refreshable credentials, e.g. `AssumedRoleCredentials`, are compared by identity,
+    the clients built with them stay valid when they are refreshed.
+    Only a digest of the secrets is kept.
+    """
+    if credentials is not None:
+        return credentials
+    secrets = "{}:{}".format(secret_access_key or "", session_token or "")
+    return access_key_id, hashlib.blake2b(secrets.encode(), digest_size=16).hexdigest()
+
+
+def get_client_config(
+    max_pool_connections: Optional[int] = None, asynchronous: bool = False
+) -> Any:
+    if asynchronous:
+        from aiobotocore.config import AioConfig as Config
+    else:
+        from botocore.config import Config
+
+    return Config(
+        max_pool_connections=max_pool_connections or DEFAULT_MAX_POOL_CONNECTIONS
+    )
+
+
+class ClientsCache:
+    """Thread-safe cache of the boto3 clients and resources.
+
+    Clients are cached by service name, region, endpoint, ssl flags, pool size,
+    and credentials identity, see `get_credentials_identity`, and shared across threads.
+    Resources are not thread-safe, they are cached per thread.
+    `session_factory` is only called to build a missing client.
+    """
+
+    def __init__(self, maxsize: int = 64):
+        self.maxsize = maxsize
+        self._clients: "OrderedDict[Tuple, Any]" = OrderedDict()
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def get_key(
+        service_name: str,
+        region_name: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+        use_ssl: Optional[bool] = None,
+        verify: Optional[Any] = None,
+        max_pool_connections: Optional[int] = None,
+        credentials: Optional[Hashable] = None,
+    ) -> Tuple:
+        return (
+            service_name,
+            region_name,
+            endpoint_url,
+            use_ssl,
+            verify,
+            max_pool_connections or DEFAULT_MAX_POOL_CONNECTIONS,
+            credentials,
+        )
+
+    @staticmethod
+    def _get_kwargs(key: Tuple, asynchronous: bool = False) -> Dict[str, Any]:
+        kwargs = {
+            "region_name": key[1],
+            "endpoint_url": key[2],
+            "use_ssl": key[3],
+            "verify": key[4],
+            "config": get_client_config(key[5], asynchronous=asynchronous),
+        }
+        # Let the session resolve the defaults, e.g. `use_ssl=True`
+        return {k: v for k, v in kwargs.items() if v is not None}
+
+    def get_client(self, session_factory: Callable[[], Any], **kwargs) -> Any:
+        """Returns a cached client, `kwargs` are the arguments of `get_key`."""
+        key = self.get_key(**kwargs)
+        client = self._clients.get(key)
+        if client is not None:
+            with self._lock:
+                if key in self._clients:
+                    self._clients.move_to_end(key)
+                self.hits += 1
+            return client
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self.hits += 1
+                return client
+            self.misses += 1
+            # Sessions are not thread-safe, clients are built under the lock
+            client = session_factory().client(key[0], **self._get_kwargs(key))
+            self._clients[key] = client
+            while len(self._clients) > self.maxsize:
+                self._clients.popitem(last=False)
+        return client
+
+    def get_resource(self, session_factory: Callable[[], Any], **kwargs) -> Any:
+        """Returns a resource cached for the current thread."""
+        key = self.get_key(**kwargs)
+        resources = getattr(self._local, "resources", None)
+        if resources is None:
+            resources = self._local.resources = OrderedDict()
+        resource = resources.get(key)
+        if resource is not None:
+            resources.move_to_end(key)
+            self.hits += 1
+            return resource
+        self.misses += 1
+        with self._lock:
+            resource = session_factory().resource(key[0], **self._get_kwargs(key))
+        resources[key] = resource
+        while len(resources) > self.maxsize:
+            resources.popitem(last=False)
+        return resource
+
+    def clear(self) -> None:
+        with self._lock:
+            self._clients = OrderedDict()
+            self._local = threading.local()
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "clients": len(self._clients)}
+
+
+class _LoopClients:
+    def __init__(self):
+        self.clients: Dict[Tuple, Any] = {}
+        self.stack = contextlib.AsyncExitStack()
+        self.lock = asyncio.Lock()
+
+
+class AsyncClientsCache:
+    """Cache of the `aiobotocore` clients, per event loop.
+
+    Async clients are bound to the loop that created them,
+    they are cached with the keys of `ClientsCache.get_key`
+    and entered on an exit stack of their loop,
+    `close` closes the clients of the running loop.
+    The cache can be used as an async context manager to close them on exit.
+    """
+
+    def __init__(self):
+        self._loops: "weakref.WeakKeyDictionary[Any, _LoopClients]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self.hits = 0
+        self.misses = 0
+
+    def _get_loop_clients(self) -> _LoopClients:
+        loop = asyncio.get_running_loop()
+        loop_clients = self._loops.get(loop)
+        if loop_clients is None:
+            loop_clients = self._loops[loop] = _LoopClients()
+        return loop_clients
+
+    async def get_client(self, session_factory: Callable[[], Any], **kwargs) -> Any:
+        """Returns a cached client,
+        `kwargs` are the arguments of `ClientsCache.get_key`."""
+        key = ClientsCache.get_key(**kwargs)
+        loop_clients = self._get_loop_clients()
+        client = loop_clients.clients.get(key)
+        if client is not None:
+            self.hits += 1
+            return client
+        async with loop_clients.lock:
+            client = loop_clients.clients.get(key)
+            if client is not None:
+                self.hits += 1
+                return client
+            self.misses += 1
+            client_context = session_factory().create_client(
+                key[0], **ClientsCache._get_kwargs(key, asynchronous=True)
+            )
+            client = await loop_clients.stack.enter_async_context(client_context)
+            loop_clients.clients[key] = client
+        return client
+
+    async def close(self) -> None:
+        """Closes the clients of the running loop."""
+        loop_clients = self._loops.pop(asyncio.get_running_loop(), None)
+        if loop_clients is not None:
+            await loop_clients.stack.aclose()
+
+    async def __aenter__(self) -> "AsyncClientsCache":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    def clear(self) -> None:
+        self._loops = weakref.WeakKeyDictionary()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "clients": sum(len(c.clients) for c in list(self._loops.values())),
+        }
+
+
+AWS_CLIENTS_CACHE = ClientsCache()
+AWS_ASYNC_CLIENTS_CACHE = AsyncClientsCache()
+
+
+async def close_async_clients() -> None:
+    """Closes the shared async clients of the running loop."""
+    await AWS_ASYNC_CLIENTS_CACHE.close()
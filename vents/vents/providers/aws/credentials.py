@@ -0,0 +1,394 @@
+import asyncio
+import datetime
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+import weakref
+
+
+_logger = logging.getLogger("vents.providers.aws.credentials")
+
+# Botocore refreshes credentials 15 minutes before their expiry,
+# refreshing in the background before that keeps the calls off the request path
+REFRESH_MARGIN = 20 * 60
+RETRY_INTERVAL = 30
+# Credentials not used for this long are evicted instead of refreshed
+IDLE_TTL = 6 * 60 * 60
+
+
+def get_assume_role_key(
+    role_arn: str,
+    session_name: Optional[str] = None,
+    session_duration: Optional[int] = None,
+    region: Optional[str] = None,
+    endpoint_url: Optional[str] = None,
+    access_key_id: Optional[str] = None,
+    secret_access_key: Optional[str] = None,
+) -> Tuple:
+    """Returns the cache key of a role assumed with the source credentials."""
+    # The secret is only kept as a digest
+    secret_digest = hashlib.blake2b(
+        (secret_access_key or "").encode(), digest_size=16
+    ).hexdigest()
+    return (
+        role_arn,
+        session_name,
+        session_duration,
+        region,
+        endpoint_url,
+        access_key_id,
+        secret_digest,
+    )
+
+
+def to_metadata(credentials: Dict) -> Dict[str, str]:
+    """Converts STS `Credentials` to the botocore refreshable credentials metadata."""
+    expiration = credentials["Expiration"]
+    if isinstance(expiration, datetime.datetime):
+        expiration = expiration.isoformat()
+    return {
+        "access_key": credentials["AccessKeyId"],
+        "secret_key": credentials["SecretAccessKey"],
+        "token": credentials["SessionToken"],
+        "expiry_time": expiration,
+    }
+
+
+def _get_expiry(metadata: Dict[str, str]) -> float:
+    from botocore.utils import parse_timestamp
+
+    return parse_timestamp(metadata["expiry_time"]).timestamp()
+
+
+def get_shared_fetch(
+    key: Tuple, fetch: Callable[[], Dict], margin: float = REFRESH_MARGIN
+) -> Callable[[], Dict]:
+    """Wraps `fetch` with the config's `credentials_cache`, if enabled,
+    so a single process calls STS for all the processes sharing the cache."""
+
+    def fetch_entry() -> Tuple[Dict, float]:
+        credentials = dict(fetch())
+        metadata = to_metadata(credentials)
+        credentials["Expiration"] = metadata["expiry_time"]
+        return credentials, _get_expiry(metadata)
+
+    def shared_fetch() -> Dict:
+        from vents.settings import VENTS_CONFIG
+
+        cache = VENTS_CONFIG.credentials_cache
+        if cache is None:
+            return fetch()
+        return cache.get("sts:{}".format(key), fetch_entry, margin=margin)
+
+    return shared_fetch
+
+
+class AssumedRoleCredentials:
+    """Credentials of an assumed role, refreshed before their expiry.
+
+    `fetch` returns STS `Credentials`, e.g. `AWSService.assume_role`.
+    The botocore sessions built with `get_refreshable_credentials`
+    get the refreshed credentials without calling STS themselves,
+    unless the background refresh is late.
+    """
+
+    def __init__(
+        self, fetch: Callable[[], Dict], refresh_margin: float = REFRESH_MARGIN
+    ):
+        self.fetch = fetch
+        self.refresh_margin = refresh_margin
+        self.refreshes = 0
+        self.margin = refresh_margin
+        self._metadata: Optional[Dict[str, str]] = None
+        self._expiry = 0.0
+        self._lock = threading.Lock()
+        self.last_used = time.time()
+
+    def refresh(self) -> Dict[str, str]:
+        with self._lock:
+            return self._refresh()
+
+    def _refresh(self) -> Dict[str, str]:
+        fetched_at = time.time()
+        return self._set_credentials(self.fetch(), fetched_at)
+
+    def _set_credentials(self, credentials: Dict, fetched_at: float) -> Dict[str, str]:
+        metadata = to_metadata(credentials)
+        self._expiry = _get_expiry(metadata)
+        # Short-lived credentials are refreshed halfway through their lifetime
+        self.margin = min(self.refresh_margin, (self._expiry - fetched_at) / 2)
+        self._metadata = metadata
+        self.refreshes += 1
+        return metadata
+
+    def set_credentials(self, credentials: Dict) -> None:
+        """Sets credentials fetched by the caller, e.g. with `aiobotocore`."""
+        with self._lock:
+            self._set_credentials(credentials, time.time())
+
+    @property
+    def expiry(self) -> float:
+        return self._expiry
+
+    def expires_in(self, now: Optional[float] = None) -> float:
+        return self._expiry - (time.time() if now is None else now)
+
+    def get_metadata(self) -> Dict[str, str]:
+        """Returns the current credentials, fetched again if about to expire."""
+        self.last_used = time.time()
+        metadata = self._metadata
+        if metadata is not None and self.expires_in() > self.margin:
+            return metadata
+        with self._lock:
+            if self._metadata is None or self.expires_in() <= self.margin:
+                return self._refresh()
+            return self._metadata
+
+    async def get_metadata_async(self) -> Dict[str, str]:
+        """Async `get_metadata`, the credentials are fetched in the loop's executor."""
+        self.last_used = time.time()
+        metadata = self._metadata
+        if metadata is not None and self.expires_in() > self.margin:
+            return metadata
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.get_metadata)
+
+    def get_credentials(self) -> Dict[str, str]:
+        """Returns the current credentials in the STS `Credentials` format."""
+        return self._to_sts_credentials(self.get_metadata())
+
+    async def get_credentials_async(self) -> Dict[str, str]:
+        """Async `get_credentials`, without blocking the loop on a refresh."""
+        return self._to_sts_credentials(await self.get_metadata_async())
+
+    @staticmethod
+    def _to_sts_credentials(metadata: Dict[str, str]) -> Dict[str, str]:
+        return {
+            "AccessKeyId": metadata["access_key"],
+            "SecretAccessKey": metadata["secret_key"],
+            "SessionToken": metadata["token"],
+            "Expiration": metadata["expiry_time"],
+        }
+
+    def _get_timeouts(self) -> Dict[str, float]:
+        # Botocore asks for new credentials only after they were refreshed here,
+        # with the default margin these are botocore's default timeouts
+        return {
+            "advisory_timeout": self.margin * 3 / 4,
+            "mandatory_timeout": self.margin / 2,
+        }
+
+    def get_refreshable_credentials(self) -> Any:
+        """Returns botocore credentials backed by this cache."""
+        from botocore.credentials import RefreshableCredentials
+
+        return RefreshableCredentials.create_from_metadata(
+            metadata=self.get_metadata(),
+            refresh_using=self.get_metadata,
+            method="sts-assume-role",
+            **self._get_timeouts(),
+        )
+
+    def get_credential_resolver(self) -> Any:
+        """Returns a botocore credential resolver of these credentials,
+        to register as the `credential_provider` of a session."""
+        from botocore.credentials import CredentialProvider, CredentialResolver
+
+        credentials = self
+
+        class AssumedRoleProvider(CredentialProvider):
+            METHOD = "sts-assume-role"
+
+            def load(self):
+                return credentials.get_refreshable_credentials()
+
+        return CredentialResolver(providers=[AssumedRoleProvider()])
+
+    def get_async_credential_resolver(self) -> Any:
+        """Async `get_credential_resolver`, for `aiobotocore` sessions."""
+        from aiobotocore.credentials import AioCredentialResolver
+        from botocore.credentials import CredentialProvider
+
+        credentials = self
+
+        class AioAssumedRoleProvider(CredentialProvider):
+            METHOD = "sts-assume-role"
+
+            async def load(self):
+                return await credentials.get_async_refreshable_credentials()
+
+        return AioCredentialResolver(providers=[AioAssumedRoleProvider()])
+
+    async def get_async_refreshable_credentials(self) -> Any:
+        """Returns aiobotocore credentials, e.g. for `s3fs` sessions."""
+        from aiobotocore.credentials import AioRefreshableCredentials
+
+        return AioRefreshableCredentials.create_from_metadata(
+            metadata=await self.get_metadata_async(),
+            refresh_using=self.get_metadata_async,
+            method="sts-assume-role",
+            **self._get_timeouts(),
+        )
+
+
+class AssumeRoleCache:
+    """Process-wide cache of assumed-role credentials.
+
+    Credentials are cached by role, session, and source credentials,
+    see `get_assume_role_key`. A daemon thread refreshes them
+    `refresh_margin` seconds before they expire, failed refreshes are retried,
+    and the credentials are fetched on access if the refresh did not happen.
+    Credentials not used for `idle_ttl` seconds are evicted,
+    and forked processes restart the thread for the inherited credentials.
+    """
+
+    def __init__(
+        self,
+        refresh_margin: float = REFRESH_MARGIN,
+        background: bool = True,
+        idle_ttl: float = IDLE_TTL,
+    ):
+        self.refresh_margin = refresh_margin
+        self.background = background
+        self.idle_ttl = idle_ttl
+        self._entries: Dict[Hashable, AssumedRoleCredentials] = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        _CACHES.add(self)
+
+    def get(
+        self,
+        key: Hashable,
+        fetch: Callable[[], Dict],
+        credentials: Optional[Dict] = None,
+    ) -> AssumedRoleCredentials:
+        """Returns the cached credentials of `key`, fetched with `fetch` if missing,
+        unless the first `credentials` are provided."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.last_used = time.time()
+            return entry
+
+        self.evict_idle()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                entry = AssumedRoleCredentials(
+                    fetch=fetch, refresh_margin=self.refresh_margin
+                )
+                self._entries[key] = entry
+        try:
+            if credentials is not None:
+                entry.set_credentials(credentials)
+            else:
+                entry.get_metadata()
+        except Exception:
+            # Not cached, the next call fetches them again
+            with self._lock:
+                if self._entries.get(key) is entry and entry.refreshes == 0:
+                    del self._entries[key]
+            raise
+        if self.background:
+            self.start()
+            self._wakeup.set()
+        return entry
+
+    def find(self, key: Hashable) -> Optional[AssumedRoleCredentials]:
+        return self._entries.get(key)
+
+    def evict_idle(self, now: Optional[float] = None) -> int:
+        """Evicts the credentials unused for `idle_ttl` seconds, returns their count."""
+        now = time.time() if now is None else now
+        with self._lock:
+            idle_keys = [
+                key
+                for key, entry in self._entries.items()
+                if now - entry.last_used > self.idle_ttl
+            ]
+            for key in idle_keys:
+                del self._entries[key]
+        return len(idle_keys)
+
+    def refresh_expiring(self, now: Optional[float] = None) -> float:
+        """Refreshes the credentials about to expire,
+        returns the seconds to the next refresh."""
+        now = time.time() if now is None else now
+        self.evict_idle(now)
+        delay = float(self.refresh_margin)
+        for entry in list(self._entries.values()):
+            remaining = entry.expires_in(now) - entry.margin
+            if remaining <= 0:
+                try:
+                    entry.refresh()
+                    remaining = entry.expires_in() - entry.margin
+                except Exception as e:  # Retried, or fetched on access
+                    _logger.warning("Could not refresh assumed role credentials: %s", e)
+                    remaining = RETRY_INTERVAL
+            delay = min(delay, max(remaining, 1))
+        return delay
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self._wakeup.clear()
+            delay = self.refresh_expiring()
+            self._wakeup.wait(delay)
+
+    def _is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _after_fork(self) -> None:
+        # Threads do not survive a fork, and locks held by them stay locked
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop_event = threading.Event()
+        self._thread = None
+        for entry in self._entries.values():
+            entry._lock = threading.Lock()
+        if self.background and self._entries:
+            self.start()
+
+    def start(self) -> None:
+        if self._is_running():
+            return
+        with self._lock:
+            if not self._is_running():
+                self._stop_event.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name="vents-sts-refresh", daemon=True
+                )
+                self._thread.start()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._wakeup.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+            self._thread = None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_CACHES: "weakref.WeakSet[AssumeRoleCache]" = weakref.WeakSet()
+
+
+def _after_fork_in_child() -> None:
+    for cache in list(_CACHES):
+        cache._after_fork()
+
+
+if hasattr(os, "register_at_fork"):  # Not on Windows
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+
+
+STS_CREDENTIALS_CACHE = AssumeRoleCache()
@@ -1,31 +1,61 @@
-from typing import Optional
-
-from s3fs import S3FileSystem as BaseS3FileSystem
+import functools
+from typing import Any, Optional, Type
 
 from vents.providers.aws.service import AWSService
 
 
-class S3FileSystem(BaseS3FileSystem):
-    retries = 5
+@functools.lru_cache(maxsize=None)
+def get_s3_filesystem_class() -> Type:
+    """Defines `S3FileSystem` on first use, `s3fs` is slow to import."""
+    from s3fs import S3FileSystem as BaseS3FileSystem
+
+    class S3FileSystem(BaseS3FileSystem):
+        retries = 5
+
+    # Pickled by reference, resolved by the module `__getattr__`
+    S3FileSystem.__module__ = __name__
+    S3FileSystem.__qualname__ = "S3FileSystem"
+    return S3FileSystem
+
+
+def __getattr__(name: str) -> Any:
+    if name == "S3FileSystem":
+        return get_s3_filesystem_class()
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
 
 class S3Service(AWSService):
     def _set_session(
         self,
-        asynchronous: Optional[bool] = False,
+        asynchronous: Optional[bool] = None,
         use_listings_cache: Optional[bool] = False,
         **kwargs,
     ):
+        if asynchronous is None:
+            asynchronous = self.is_async
         config_kwargs = kwargs.get("config_kwargs", {})
         if self.region and "region_name" not in config_kwargs:
             config_kwargs["region_name"] = self.region
         client_kwargs = kwargs.get("client_kwargs", {})
         if self.verify_ssl is not None and "verify" not in client_kwargs:
             client_kwargs["verify"] = self.verify_ssl
-        self._session = S3FileSystem(
-            key=self.access_key_id,
-            secret=self.secret_access_key,
-            token=self.session_token,
+        credentials = {
+            "key": self.access_key_id,
+            "secret": self.secret_access_key,
+            "token": self.session_token,
+        }
+        if self._credentials is not None and "session" not in kwargs:
+            from aiobotocore.session import AioSession
+
+            # Assumed role credentials, refreshed without rebuilding the filesystem
+            session = AioSession()
+            session.register_component(
+                "credential_provider", self._credentials.get_async_credential_resolver()
+            )
+            kwargs["session"] = session
+            credentials = {}
+        self._session = get_s3_filesystem_class()(
+            **credentials,
             use_ssl=self.use_ssl,
             endpoint_url=self.endpoint_url,
             config_kwargs=config_kwargs,
@@ -35,6 +65,13 @@ class S3Service(AWSService):
             **kwargs,
         )
 
+    def _get_clients_session(self):
+        # The session of the service is the filesystem
+        return self.get_boto3_session()
+
+    def _get_async_clients_session(self):
+        return self.get_aio_session()
+
     def get_fs(
         self,
         asynchronous: Optional[bool] = False,
@@ -1,7 +1,11 @@
+import asyncio
+import functools
 import os
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Tuple
 
+from clipped.compact.pydantic import PrivateAttr
 from vents.providers.aws.base import (
+    AWS_STS_ENDPOINT_URL_KEYS,
     get_aws_access_key_id,
     get_aws_assume_role,
     get_aws_role_arn,
@@ -14,7 +18,20 @@ from vents.providers.aws.base import (
     get_endpoint_url,
     get_region,
 )
+from vents.providers.aws.clients import (
+    AWS_ASYNC_CLIENTS_CACHE,
+    AWS_CLIENTS_CACHE,
+    get_client_config,
+    get_credentials_identity,
+)
+from vents.providers.aws.credentials import (
+    STS_CREDENTIALS_CACHE,
+    AssumedRoleCredentials,
+    get_assume_role_key,
+    get_shared_fetch,
+)
 from vents.providers.base import BaseService
+from vents.settings import VENTS_CONFIG
 
 
 if TYPE_CHECKING:
@@ -30,11 +47,16 @@ class AWSService(BaseService):
     session_token: Optional[str] = None
     verify_ssl: Optional[bool] = None
     use_ssl: Optional[bool] = None
+    max_pool_connections: Optional[int] = None
+    is_async: bool = False
+    _credentials: Optional[AssumedRoleCredentials] = PrivateAttr(default=None)
 
     @classmethod
-    def load_from_connection(
+    def resolve_connection_keys(
         cls, connection: Optional["Connection"] = None
-    ) -> Optional["AWSService"]:
+    ) -> Dict[str, Any]:
+        """Resolves the settings and credentials of a connection,
+        shared by `load_from_connection` and `load_from_connection_async`."""
         # Check if there are mounting based on secrets/configmaps
         context_paths = []
         schema = None
@@ -49,67 +71,183 @@ class AWSService(BaseService):
             if connection.env:
                 builtin_env = connection.env
 
-        region = get_region(context_paths=context_paths, schema=schema, env=builtin_env)
-        endpoint_url = get_endpoint_url(
-            context_paths=context_paths, schema=schema, env=builtin_env
-        )
-        sts_endpoint_url = get_endpoint_url(
-            keys=["AWS_STS_ENDPOINT_URL"],
-            context_paths=context_paths,
-            schema=schema,
-            env=builtin_env,
-        )
-        access_key_id = get_aws_access_key_id(
-            context_paths=context_paths, schema=schema, env=builtin_env
-        )
-        secret_access_key = get_aws_secret_access_key(
-            context_paths=context_paths, schema=schema, env=builtin_env
-        )
-        verify_ssl = get_aws_verify_ssl(
-            context_paths=context_paths, schema=schema, env=builtin_env
-        )
-        use_ssl = get_aws_use_ssl(
-            context_paths=context_paths, schema=schema, env=builtin_env
-        )
-        session_token = get_aws_security_token(
-            context_paths=context_paths, schema=schema, env=builtin_env
-        )
-        assume_role = get_aws_assume_role(
-            context_paths=context_paths, schema=schema, env=builtin_env
-        )
-        role_arn = get_aws_role_arn(
-            context_paths=context_paths, schema=schema, env=builtin_env
-        )
-        session_name = get_aws_session_name(
-            context_paths=context_paths, schema=schema, env=builtin_env
-        )
-        session_duration = get_aws_session_duration(
+        resolver = VENTS_CONFIG.get_keys_resolver(
             context_paths=context_paths, schema=schema, env=builtin_env
         )
-        if assume_role and role_arn:
-            credentials = cls.assume_role(
-                role_arn=role_arn,
-                session_name=session_name,
-                session_duration=session_duration,
-                region=region,
-                endpoint_url=sts_endpoint_url,
-                access_key_id=access_key_id,
-                secret_access_key=secret_access_key,
-                verify_ssl=verify_ssl,
-                use_ssl=use_ssl,
-            )
+        return {
+            "region": get_region(resolver=resolver),
+            "endpoint_url": get_endpoint_url(resolver=resolver),
+            "sts_endpoint_url": get_endpoint_url(
+                keys=AWS_STS_ENDPOINT_URL_KEYS,
+                resolver=resolver,
+            ),
+            "access_key_id": get_aws_access_key_id(resolver=resolver),
+            "secret_access_key": get_aws_secret_access_key(resolver=resolver),
+            "verify_ssl": get_aws_verify_ssl(resolver=resolver),
+            "use_ssl": get_aws_use_ssl(resolver=resolver),
+            "session_token": get_aws_security_token(resolver=resolver),
+            "assume_role": get_aws_assume_role(resolver=resolver),
+            "role_arn": get_aws_role_arn(resolver=resolver),
+            "session_name": get_aws_session_name(resolver=resolver),
+            "session_duration": get_aws_session_duration(resolver=resolver),
+        }
+
+    @staticmethod
+    def _get_assume_role_kwargs(keys: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "role_arn": keys["role_arn"],
+            "session_name": keys["session_name"],
+            "session_duration": keys["session_duration"],
+            "region": keys["region"],
+            "endpoint_url": keys["sts_endpoint_url"],
+            "access_key_id": keys["access_key_id"],
+            "secret_access_key": keys["secret_access_key"],
+            "verify_ssl": keys["verify_ssl"],
+            "use_ssl": keys["use_ssl"],
+        }
+
+    @classmethod
+    def _from_keys(
+        cls,
+        keys: Dict[str, Any],
+        assumed_role: Optional[AssumedRoleCredentials] = None,
+        credentials: Optional[Dict[str, Any]] = None,
+    ) -> "AWSService":
+        access_key_id = keys["access_key_id"]
+        secret_access_key = keys["secret_access_key"]
+        session_token = keys["session_token"]
+        if assumed_role is not None:
+            if credentials is None:
+                credentials = assumed_role.get_credentials()
             access_key_id = credentials["AccessKeyId"]
             secret_access_key = credentials["SecretAccessKey"]
             session_token = credentials["SessionToken"]
-        return cls(
+        service = cls(
+            region=keys["region"],
+            endpoint_url=keys["endpoint_url"],
+            access_key_id=access_key_id,
+            secret_access_key=secret_access_key,
+            session_token=session_token,
+            verify_ssl=keys["verify_ssl"],
+            use_ssl=keys["use_ssl"],
+        )
+        service._credentials = assumed_role
+        return service
+
+    @classmethod
+    def load_from_connection(
+        cls, connection: Optional["Connection"] = None
+    ) -> Optional["AWSService"]:
+        keys = cls.resolve_connection_keys(connection)
+        assumed_role = None
+        if keys["assume_role"] and keys["role_arn"]:
+            assumed_role = cls.get_assumed_role_credentials(
+                **cls._get_assume_role_kwargs(keys)
+            )
+        return cls._from_keys(keys, assumed_role)
+
+    @classmethod
+    async def load_from_connection_async(
+        cls, connection: Optional["Connection"] = None
+    ) -> Optional["AWSService"]:
+        """Loads an async service, assuming the role with `aiobotocore` if needed."""
+        keys = cls.resolve_connection_keys(connection)
+        assumed_role = None
+        credentials = None
+        if keys["assume_role"] and keys["role_arn"]:
+            assumed_role = await cls.get_assumed_role_credentials_async(
+                **cls._get_assume_role_kwargs(keys)
+            )
+            # Refreshed off the loop if the cached credentials are expiring
+            credentials = await assumed_role.get_credentials_async()
+        service = cls._from_keys(keys, assumed_role, credentials)
+        service.is_async = True
+        return service
+
+    @classmethod
+    def _get_assume_role_fetch(
+        cls, **kwargs
+    ) -> Tuple[Tuple, Callable[[], Dict[str, Any]]]:
+        key = get_assume_role_key(
+            role_arn=kwargs["role_arn"],
+            session_name=kwargs.get("session_name"),
+            session_duration=kwargs.get("session_duration"),
+            region=kwargs.get("region"),
+            endpoint_url=kwargs.get("endpoint_url"),
+            access_key_id=kwargs.get("access_key_id"),
+            secret_access_key=kwargs.get("secret_access_key"),
+        )
+
+        def fetch():
+            return cls.assume_role(**kwargs)
+
+        return key, get_shared_fetch(key, fetch)
+
+    @classmethod
+    def get_assumed_role_credentials(
+        cls,
+        role_arn: str,
+        session_name: Optional[str] = None,
+        session_duration: Optional[int] = 43200,
+        region: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        verify_ssl: Optional[bool] = None,
+        use_ssl: Optional[bool] = None,
+    ) -> AssumedRoleCredentials:
+        """Returns the cached credentials of an assumed role, see `AssumeRoleCache`."""
+        key, fetch = cls._get_assume_role_fetch(
+            role_arn=role_arn,
+            session_name=session_name,
+            session_duration=session_duration,
             region=region,
             endpoint_url=endpoint_url,
             access_key_id=access_key_id,
             secret_access_key=secret_access_key,
-            session_token=session_token,
             verify_ssl=verify_ssl,
             use_ssl=use_ssl,
         )
+        return STS_CREDENTIALS_CACHE.get(key, fetch)
+
+    @classmethod
+    async def get_assumed_role_credentials_async(
+        cls,
+        role_arn: str,
+        session_name: Optional[str] = None,
+        session_duration: Optional[int] = 43200,
+        region: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        verify_ssl: Optional[bool] = None,
+        use_ssl: Optional[bool] = None,
+    ) -> AssumedRoleCredentials:
+        """Async `get_assumed_role_credentials`, the role is assumed with `aiobotocore`,
+        the refreshes are made by the `AssumeRoleCache` thread."""
+        kwargs = dict(
+            role_arn=role_arn,
+            session_name=session_name,
+            session_duration=session_duration,
+            region=region,
+            endpoint_url=endpoint_url,
+            access_key_id=access_key_id,
+            secret_access_key=secret_access_key,
+            verify_ssl=verify_ssl,
+            use_ssl=use_ssl,
+        )
+        key, fetch = cls._get_assume_role_fetch(**kwargs)
+        assumed_role = STS_CREDENTIALS_CACHE.find(key)
+        if assumed_role is not None:
+            return assumed_role
+        if VENTS_CONFIG.credentials_cache is not None:
+            # Shared with the other processes under a file lock
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, functools.partial(STS_CREDENTIALS_CACHE.get, key, fetch)
+            )
+        credentials = await cls.assume_role_async(**kwargs)
+        return STS_CREDENTIALS_CACHE.get(key, fetch, credentials=credentials)
 
     @classmethod
     def assume_role(
@@ -123,7 +261,8 @@ class AWSService(BaseService):
         secret_access_key: Optional[str] = None,
         verify_ssl: Optional[bool] = None,
         use_ssl: Optional[bool] = None,
-    ) -> "AWSService":
+    ) -> Dict[str, Any]:
+        """Calls STS `AssumeRole`, use `get_assumed_role_credentials` to cache it."""
         import botocore.session
 
         session = botocore.session.get_session()
@@ -144,17 +283,95 @@ class AWSService(BaseService):
         )
         return response["Credentials"]
 
-    def _set_session(self):
+    @classmethod
+    async def assume_role_async(
+        cls,
+        role_arn: str,
+        session_name: Optional[str] = None,
+        session_duration: Optional[int] = 43200,
+        region: Optional[str] = None,
+        endpoint_url: Optional[str] = None,
+        access_key_id: Optional[str] = None,
+        secret_access_key: Optional[str] = None,
+        verify_ssl: Optional[bool] = None,
+        use_ssl: Optional[bool] = None,
+    ) -> Dict[str, Any]:
+        """Async `assume_role`, calls STS `AssumeRole` with `aiobotocore`."""
+        from aiobotocore.session import get_session
+
+        endpoint_url = endpoint_url or "https://sts.{}.amazonaws.com".format(region)
+        async with get_session().create_client(
+            "sts",
+            region_name=region,
+            use_ssl=use_ssl,
+            verify=verify_ssl,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+            endpoint_url=endpoint_url,
+        ) as client:
+            response = await client.assume_role(
+                RoleArn=role_arn,
+                RoleSessionName=session_name or "S3Session",
+                DurationSeconds=session_duration or 43200,
+            )
+        return response["Credentials"]
+
+    @property
+    def credentials(self) -> Optional[AssumedRoleCredentials]:
+        """The refreshed credentials of the assumed role, if any."""
+        return self._credentials
+
+    def get_boto3_session(self):
         import boto3
 
-        self._session = boto3.session.Session(
+        if self._credentials is not None:
+            import botocore.session
+
+            botocore_session = botocore.session.get_session()
+            # Refreshable credentials, not supported by the session's constructor
+            botocore_session.register_component(
+                "credential_provider", self._credentials.get_credential_resolver()
+            )
+            return boto3.session.Session(
+                botocore_session=botocore_session, region_name=self.region
+            )
+        return boto3.session.Session(
             aws_access_key_id=self.access_key_id,
             aws_secret_access_key=self.secret_access_key,
             aws_session_token=self.session_token,
             region_name=self.region,
         )
 
+    def get_aio_session(self):
+        """Returns an `aiobotocore` session with the credentials of the service."""
+        from aiobotocore.session import AioSession
+
+        session = AioSession()
+        if self._credentials is not None:
+            session.register_component(
+                "credential_provider", self._credentials.get_async_credential_resolver()
+            )
+        elif self.access_key_id or self.secret_access_key:
+            session.set_credentials(
+                self.access_key_id, self.secret_access_key, self.session_token
+            )
+        if self.region:
+            session.set_config_variable("region", self.region)
+        return session
+
+    def _set_session(self):
+        if self.is_async:
+            self._session = self.get_aio_session()
+        else:
+            self._session = self.get_boto3_session()
+
     def set_env_vars(self):
+        if self._credentials is not None:
+            # Exports the current credentials of the assumed role
+            credentials = self._credentials.get_credentials()
+            self.access_key_id = credentials["AccessKeyId"]
+            self.secret_access_key = credentials["SecretAccessKey"]
+            self.session_token = credentials["SessionToken"]
         if self.endpoint_url:
             os.environ["AWS_ENDPOINT_URL"] = self.endpoint_url
         if self.access_key_id:
@@ -169,20 +386,73 @@ class AWSService(BaseService):
             os.environ["AWS_USE_SSL"] = str(self.use_ssl)
         if self.verify_ssl is not None:
             os.environ["AWS_VERIFY_SSL"] = str(self.verify_ssl)
+        VENTS_CONFIG.refresh_env(
+            "AWS_ENDPOINT_URL",
+            "AWS_ACCESS_KEY_ID",
+            "AWS_SECRET_ACCESS_KEY",
+            "AWS_SECURITY_TOKEN",
+            "AWS_REGION",
+            "AWS_USE_SSL",
+            "AWS_VERIFY_SSL",
+        )
+
+    def _get_clients_kwargs(self) -> Dict[str, Any]:
+        return {
+            "service_name": self.resource,
+            "region_name": self.region,
+            "endpoint_url": self.endpoint_url,
+            "use_ssl": self.use_ssl,
+            "verify": self.verify_ssl,
+            "max_pool_connections": self.max_pool_connections,
+            "credentials": get_credentials_identity(
+                access_key_id=self.access_key_id,
+                secret_access_key=self.secret_access_key,
+                session_token=self.session_token,
+                credentials=self._credentials,
+            ),
+        }
+
+    def _get_clients_session(self):
+        if self.is_async:
+            return self.get_boto3_session()
+        return self.session
+
+    def _get_async_clients_session(self):
+        if self.is_async:
+            return self.session
+        return self.get_aio_session()
 
     def get_client(self):
-        return self.session.client(
-            service_name=self.resource,
-            region_name=self.region,
-            endpoint_url=self.endpoint_url,
-            use_ssl=self.use_ssl,
-            verify=self.verify_ssl,
+        """Returns a client shared with the services using the same settings,
+        see `ClientsCache`."""
+        return AWS_CLIENTS_CACHE.get_client(
+            session_factory=self._get_clients_session, **self._get_clients_kwargs()
         )
 
     def get_resource(self):
-        return self.session.resource(
-            self.resource,
-            endpoint_url=self.endpoint_url,
-            use_ssl=self.use_ssl,
-            verify=self.verify_ssl,
+        """Returns a resource cached for the current thread, see `ClientsCache`."""
+        return AWS_CLIENTS_CACHE.get_resource(
+            session_factory=self._get_clients_session, **self._get_clients_kwargs()
+        )
+
+    def async_client(self):
+        """Returns a new async client,
+        to use as `async with service.async_client() as client`."""
+        kwargs = {
+            "region_name": self.region,
+            "endpoint_url": self.endpoint_url,
+            "use_ssl": self.use_ssl,
+            "verify": self.verify_ssl,
+            "config": get_client_config(self.max_pool_connections, asynchronous=True),
+        }
+        return self._get_async_clients_session().create_client(
+            self.resource, **{k: v for k, v in kwargs.items() if v is not None}
+        )
+
+    async def get_async_client(self):
+        """Returns an async client shared in the running loop,
+        see `AsyncClientsCache`."""
+        return await AWS_ASYNC_CLIENTS_CACHE.get_client(
+            session_factory=self._get_async_clients_session,
+            **self._get_clients_kwargs(),
         )
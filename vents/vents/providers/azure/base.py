@@ -2,95 +2,145 @@ import logging
 import os
 from typing import List, Optional, Union
 
+from vents.config import KeySpec, KeysResolver
 from vents.settings import VENTS_CONFIG
 
 
-logging.getLogger("azure").setLevel(logging.WARNING)
-logging.getLogger("azure.storage").setLevel(logging.WARNING)
-logging.getLogger("azure.storage.blob").setLevel(logging.WARNING)
+def configure_loggers():
+    """Quiets the Azure SDK loggers, does not import the SDK."""
+    logging.getLogger("azure").setLevel(logging.WARNING)
+    logging.getLogger("azure.storage").setLevel(logging.WARNING)
+    logging.getLogger("azure.storage.blob").setLevel(logging.WARNING)
+
+
+configure_loggers()
+
+
+AZURE_ACCOUNT_NAME_KEYS = KeySpec(["AZURE_ACCOUNT_NAME"])
+AZURE_ACCOUNT_KEY_KEYS = KeySpec(["AZURE_ACCOUNT_KEY"])
+AZURE_CONNECTION_STRING_KEYS = KeySpec(["AZURE_CONNECTION_STRING"])
+AZURE_SAS_TOKEN_KEYS = KeySpec(["AZURE_SAS_TOKEN", "AZURE_STORAGE_SAS_TOKEN"])
+AZURE_TENANT_ID_KEYS = KeySpec(["AZURE_TENANT_ID"])
+AZURE_CLIENT_ID_KEYS = KeySpec(["AZURE_CLIENT_ID"])
+AZURE_CLIENT_SECRET_KEYS = KeySpec(["AZURE_CLIENT_SECRET"])
 
 
 def get_account_name(
-    keys: Optional[Union[str, List[str]]] = None,
+    keys: Optional[Union[str, List[str], KeySpec]] = None,
     context_paths: Optional[List[str]] = None,
     schema: Optional[str] = None,
     env: Optional[str] = None,
+    resolver: Optional[KeysResolver] = None,
 ) -> Optional[str]:
-    keys = keys or ["AZURE_ACCOUNT_NAME"]
+    keys = keys or AZURE_ACCOUNT_NAME_KEYS
     return VENTS_CONFIG.read_keys(
-        context_paths=context_paths, schema=schema, env=env, keys=keys
+        context_paths=context_paths,
+        schema=schema,
+        env=env,
+        keys=keys,
+        resolver=resolver,
     )  # type: ignore
 
 
 def get_account_key(
-    keys: Optional[Union[str, List[str]]] = None,
+    keys: Optional[Union[str, List[str], KeySpec]] = None,
     context_paths: Optional[List[str]] = None,
     schema: Optional[str] = None,
     env: Optional[str] = None,
+    resolver: Optional[KeysResolver] = None,
 ) -> Optional[str]:
-    keys = keys or ["AZURE_ACCOUNT_KEY"]
+    keys = keys or AZURE_ACCOUNT_KEY_KEYS
     return VENTS_CONFIG.read_keys(
-        context_paths=context_paths, schema=schema, env=env, keys=keys
+        context_paths=context_paths,
+        schema=schema,
+        env=env,
+        keys=keys,
+        resolver=resolver,
     )  # type: ignore
 
 
 def get_connection_string(
-    keys: Optional[Union[str, List[str]]] = None,
+    keys: Optional[Union[str, List[str], KeySpec]] = None,
     context_paths: Optional[List[str]] = None,
     schema: Optional[str] = None,
     env: Optional[str] = None,
+    resolver: Optional[KeysResolver] = None,
 ) -> Optional[str]:
-    keys = keys or ["AZURE_CONNECTION_STRING"]
+    keys = keys or AZURE_CONNECTION_STRING_KEYS
     return VENTS_CONFIG.read_keys(
-        context_paths=context_paths, schema=schema, env=env, keys=keys
+        context_paths=context_paths,
+        schema=schema,
+        env=env,
+        keys=keys,
+        resolver=resolver,
     )  # type: ignore
 
 
 def get_sas_token(
-    keys: Optional[Union[str, List[str]]] = None,
+    keys: Optional[Union[str, List[str], KeySpec]] = None,
     context_paths: Optional[List[str]] = None,
     schema: Optional[str] = None,
     env: Optional[str] = None,
+    resolver: Optional[KeysResolver] = None,
 ) -> Optional[str]:
-    keys = keys or ["AZURE_SAS_TOKEN", "AZURE_STORAGE_SAS_TOKEN"]
+    keys = keys or AZURE_SAS_TOKEN_KEYS
     return VENTS_CONFIG.read_keys(
-        context_paths=context_paths, schema=schema, env=env, keys=keys
+        context_paths=context_paths,
+        schema=schema,
+        env=env,
+        keys=keys,
+        resolver=resolver,
     )  # type: ignore
 
 
 def get_tenant_id(
-    keys: Optional[Union[str, List[str]]] = None,
+    keys: Optional[Union[str, List[str], KeySpec]] = None,
     context_paths: Optional[List[str]] = None,
     schema: Optional[str] = None,
     env: Optional[str] = None,
+    resolver: Optional[KeysResolver] = None,
 ) -> Optional[str]:
-    keys = keys or ["AZURE_TENANT_ID"]
+    keys = keys or AZURE_TENANT_ID_KEYS
     return VENTS_CONFIG.read_keys(
-        context_paths=context_paths, schema=schema, env=env, keys=keys
+        context_paths=context_paths,
+        schema=schema,
+        env=env,
+        keys=keys,
+        resolver=resolver,
     )  # type: ignore
 
 
 def get_client_id(
-    keys: Optional[Union[str, List[str]]] = None,
+    keys: Optional[Union[str, List[str], KeySpec]] = None,
     context_paths: Optional[List[str]] = None,
     schema: Optional[str] = None,
     env: Optional[str] = None,
+    resolver: Optional[KeysResolver] = None,
 ) -> Optional[str]:
-    keys = keys or ["AZURE_CLIENT_ID"]
+    keys = keys or AZURE_CLIENT_ID_KEYS
     return VENTS_CONFIG.read_keys(
-        context_paths=context_paths, schema=schema, env=env, keys=keys
+        context_paths=context_paths,
+        schema=schema,
+        env=env,
+        keys=keys,
+        resolver=resolver,
     )  # type: ignore
 
 
 def get_client_secret(
-    keys: Optional[Union[str, List[str]]] = None,
+    keys: Optional[Union[str, List[str], KeySpec]] = None,
     context_paths: Optional[List[str]] = None,
     schema: Optional[str] = None,
     env: Optional[str] = None,
+    resolver: Optional[KeysResolver] = None,
 ) -> Optional[str]:
-    keys = keys or ["AZURE_CLIENT_SECRET"]
+    keys = keys or AZURE_CLIENT_SECRET_KEYS
     return VENTS_CONFIG.read_keys(
-        context_paths=context_paths, schema=schema, env=env, keys=keys
+        context_paths=context_paths,
+        schema=schema,
+        env=env,
+        keys=keys,
+        resolver=resolver,
     )  # type: ignore
 
 
@@ -105,3 +155,6 @@ def set_env_vars(
         os.environ["AZURE_ACCOUNT_KEY"] = account_key
     if connection_string:
         os.environ["AZURE_CONNECTION_STRING"] = connection_string
+    VENTS_CONFIG.refresh_env(
+        "AZURE_ACCOUNT_NAME", "AZURE_ACCOUNT_KEY", "AZURE_CONNECTION_STRING"
+    )
@@ -1,32 +1,49 @@
-from typing import Optional
-
-from adlfs import AzureBlobFileSystem as BaseAzureBlobFileSystem
+import functools
+from typing import Any, Optional, Type
 
 from vents.providers.azure.service import AzureService
 
 
-class AzureBlobFileSystem(BaseAzureBlobFileSystem):
-    async def _put_file(self, lpath, rpath, delimiter="/", overwrite=True, **kwargws):
-        return await super()._put_file(
-            lpath, rpath, delimiter=delimiter, overwrite=overwrite, **kwargws
-        )
+@functools.lru_cache(maxsize=None)
+def get_blob_filesystem_class() -> Type:
+    """Defines `AzureBlobFileSystem` on first use, `adlfs` is slow to import."""
+    from adlfs import AzureBlobFileSystem as BaseAzureBlobFileSystem
 
-    async def _ls(
-        self,
-        path: str,
-        force: bool = False,
-        delimiter: str = "/",
-        return_glob: bool = False,
-        **kwargs,
-    ):
-        invalidate_cache = kwargs.pop("invalidate_cache", force)
-        return await super()._ls(
-            path,
-            invalidate_cache=invalidate_cache,
-            delimiter=delimiter,
-            return_glob=return_glob,
+    class AzureBlobFileSystem(BaseAzureBlobFileSystem):
+        async def _put_file(
+            self, lpath, rpath, delimiter="/", overwrite=True, **kwargws
+        ):
+            return await super()._put_file(
+                lpath, rpath, delimiter=delimiter, overwrite=overwrite, **kwargws
+            )
+
+        async def _ls(
+            self,
+            path: str,
+            force: bool = False,
+            delimiter: str = "/",
+            return_glob: bool = False,
             **kwargs,
-        )
+        ):
+            invalidate_cache = kwargs.pop("invalidate_cache", force)
+            return await super()._ls(
+                path,
+                invalidate_cache=invalidate_cache,
+                delimiter=delimiter,
+                return_glob=return_glob,
+                **kwargs,
+            )
+
+    # Pickled by reference, resolved by the module `__getattr__`
+    AzureBlobFileSystem.__module__ = __name__
+    AzureBlobFileSystem.__qualname__ = "AzureBlobFileSystem"
+    return AzureBlobFileSystem
+
+
+def __getattr__(name: str) -> Any:
+    if name == "AzureBlobFileSystem":
+        return get_blob_filesystem_class()
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
 
 class BlobStorageService(AzureService):
@@ -36,7 +53,7 @@ class BlobStorageService(AzureService):
         use_listings_cache: Optional[bool] = False,
         **kwargs,
     ):
-        self._session = AzureBlobFileSystem(
+        self._session = get_blob_filesystem_class()(
             account_name=self.account_name,
             account_key=self.account_key,
             connection_string=self.connection_string,
@@ -11,6 +11,7 @@ from vents.providers.azure.base import (
     get_tenant_id,
 )
 from vents.providers.base import BaseService
+from vents.settings import VENTS_CONFIG
 
 
 if TYPE_CHECKING:
@@ -44,27 +45,16 @@ class AzureService(BaseService):
             if connection.env:
                 builtin_env = connection.env
 
-        account_name = get_account_name(
-            context_paths=context_paths, schema=schema, env=builtin_env
-        )
-        account_key = get_account_key(
-            context_paths=context_paths, schema=schema, env=builtin_env
-        )
-        connection_string = get_connection_string(
-            context_paths=context_paths, schema=schema, env=builtin_env
-        )
-        sas_token = get_sas_token(
-            context_paths=context_paths, schema=schema, env=builtin_env
-        )
-        tenant_id = get_tenant_id(
-            context_paths=context_paths, schema=schema, env=builtin_env
-        )
-        client_id = get_client_id(
-            context_paths=context_paths, schema=schema, env=builtin_env
-        )
-        client_secret = get_client_secret(
+        resolver = VENTS_CONFIG.get_keys_resolver(
             context_paths=context_paths, schema=schema, env=builtin_env
         )
+        account_name = get_account_name(resolver=resolver)
+        account_key = get_account_key(resolver=resolver)
+        connection_string = get_connection_string(resolver=resolver)
+        sas_token = get_sas_token(resolver=resolver)
+        tenant_id = get_tenant_id(resolver=resolver)
+        client_id = get_client_id(resolver=resolver)
+        client_secret = get_client_secret(resolver=resolver)
         return cls(
             account_name=account_name,
             account_key=account_key,
@@ -82,3 +72,6 @@ class AzureService(BaseService):
             os.environ["AZURE_ACCOUNT_KEY"] = self._account_key
         if self._connection_string:
             os.environ["AZURE_CONNECTION_STRING"] = self._connection_string
+        VENTS_CONFIG.refresh_env(
+            "AZURE_ACCOUNT_NAME", "AZURE_ACCOUNT_KEY", "AZURE_CONNECTION_STRING"
+        )
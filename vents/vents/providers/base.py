@@ -27,6 +27,21 @@ class BaseService(BaseSchemaModel):
         )
         return cls.load_from_connection(connection=connection)
 
+    @classmethod
+    def get_from_catalog(
+        cls, connection_name: str, catalog: Optional["ConnectionCatalog"]
+    ) -> Optional["BaseService"]:
+        """Returns a cached service from the catalog, see `ServiceRegistry`."""
+        from vents.providers.service_registry import SERVICES_REGISTRY
+
+        if not catalog or not connection_name:
+            return cls.load_from_catalog(connection_name=connection_name, catalog=None)
+        return SERVICES_REGISTRY.get(
+            connection_name=connection_name,
+            catalog=catalog,
+            service_class=None if cls is BaseService else cls,
+        )
+
     @classmethod
     def load_from_connection(
         cls, connection: Optional["Connection"] = None
@@ -57,6 +57,7 @@ class DiscordService(BaseService):
     def set_env_vars(self):
         if self.token:
             os.environ["DISCORD_TOKEN"] = self.token
+        VENTS_CONFIG.refresh_env("DISCORD_TOKEN")
 
 
 class DiscordWebhookService(BaseHttpService):
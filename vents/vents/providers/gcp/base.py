@@ -1,16 +1,32 @@
 from collections.abc import Mapping
+import datetime
+import hashlib
 import os
-from typing import Dict, List, Optional, Union
+import time
+from typing import TYPE_CHECKING, Dict, List, Optional, Union
 
-import google.auth
-import google.oauth2.service_account
-from google.oauth2.service_account import Credentials
-
-from clipped.utils.json import orjson_loads
+from clipped.utils.json import orjson_dumps, orjson_loads
+from vents.config import KeySpec, KeysResolver
 from vents.settings import VENTS_CONFIG
 
 
 DEFAULT_SCOPES = ["https://www.googleapis.com/auth/cloud-platform"]
+GC_PROJECT_KEYS = KeySpec(
+    ["GC_PROJECT", "GOOGLE_PROJECT", "GC_PROJECT_ID", "GOOGLE_PROJECT_ID"]
+)
+GC_KEY_PATH_KEYS = KeySpec(
+    ["GC_KEY_PATH", "GOOGLE_KEY_PATH", "GOOGLE_APPLICATION_CREDENTIALS"]
+)
+GC_KEYFILE_DICT_KEYS = KeySpec(["GC_KEYFILE_DICT", "GOOGLE_KEYFILE_DICT"])
+GC_SCOPES_KEYS = KeySpec(["GC_SCOPES", "GOOGLE_SCOPES"])
+# Google refreshes tokens 3m45s before they expire
+GC_TOKEN_REFRESH_MARGIN = 5 * 60
+
+
+if TYPE_CHECKING:
+    from google.oauth2.service_account import Credentials
+
+    from vents.cache import SharedCredentialsCache
 
 
 def get_default_key_path():
@@ -18,59 +34,74 @@ def get_default_key_path():
 
 
 def get_project_id(
-    keys: Optional[Union[str, List[str]]] = None,
+    keys: Optional[Union[str, List[str], KeySpec]] = None,
     context_paths: Optional[List[str]] = None,
     schema: Optional[str] = None,
     env: Optional[str] = None,
+    resolver: Optional[KeysResolver] = None,
     **kwargs,
 ) -> Optional[str]:
     value = kwargs.get("project_id")
     if value:
         return value
-    keys = keys or [
-        "GC_PROJECT",
-        "GOOGLE_PROJECT",
-        "GC_PROJECT_ID",
-        "GOOGLE_PROJECT_ID",
-    ]
+    keys = keys or GC_PROJECT_KEYS
     return VENTS_CONFIG.read_keys(
-        context_paths=context_paths, schema=schema, env=env, keys=keys
+        context_paths=context_paths,
+        schema=schema,
+        env=env,
+        keys=keys,
+        resolver=resolver,
     )  # type: ignore
 
 
 def get_key_path(
-    keys: Optional[Union[str, List[str]]] = None,
+    keys: Optional[Union[str, List[str], KeySpec]] = None,
     context_paths: Optional[List[str]] = None,
     schema: Optional[str] = None,
     env: Optional[str] = None,
+    resolver: Optional[KeysResolver] = None,
 ) -> Optional[str]:
-    keys = keys or ["GC_KEY_PATH", "GOOGLE_KEY_PATH", "GOOGLE_APPLICATION_CREDENTIALS"]
+    keys = keys or GC_KEY_PATH_KEYS
     return VENTS_CONFIG.read_keys(
-        context_paths=context_paths, schema=schema, env=env, keys=keys
+        context_paths=context_paths,
+        schema=schema,
+        env=env,
+        keys=keys,
+        resolver=resolver,
     )  # type: ignore
 
 
 def get_keyfile_dict(
-    keys: Optional[Union[str, List[str]]] = None,
+    keys: Optional[Union[str, List[str], KeySpec]] = None,
     context_paths: Optional[List[str]] = None,
     schema: Optional[str] = None,
     env: Optional[str] = None,
+    resolver: Optional[KeysResolver] = None,
 ) -> Optional[Dict]:
-    keys = keys or ["GC_KEYFILE_DICT", "GOOGLE_KEYFILE_DICT"]
+    keys = keys or GC_KEYFILE_DICT_KEYS
     return VENTS_CONFIG.read_keys(
-        context_paths=context_paths, schema=schema, env=env, keys=keys
+        context_paths=context_paths,
+        schema=schema,
+        env=env,
+        keys=keys,
+        resolver=resolver,
     )  # type: ignore
 
 
 def get_scopes(
-    keys: Optional[Union[str, List[str]]] = None,
+    keys: Optional[Union[str, List[str], KeySpec]] = None,
     context_paths: Optional[List[str]] = None,
     schema: Optional[str] = None,
     env: Optional[str] = None,
+    resolver: Optional[KeysResolver] = None,
 ) -> Optional[List[str]]:
-    keys = keys or ["GC_SCOPES", "GOOGLE_SCOPES"]
+    keys = keys or GC_SCOPES_KEYS
     scopes = VENTS_CONFIG.read_keys(
-        context_paths=context_paths, schema=schema, env=env, keys=keys
+        context_paths=context_paths,
+        schema=schema,
+        env=env,
+        keys=keys,
+        resolver=resolver,
     )
     scopes = VENTS_CONFIG.config_parser.parse(str)(
         key="scopes",
@@ -85,10 +116,13 @@ def get_gc_credentials(
     key_path: Optional[str],
     keyfile_dict: Optional[Union[str, Dict]],
     scopes: Optional[List[str]],
-) -> Credentials:
+) -> "Credentials":
     """
     Returns the Credentials object for Google API
     """
+    import google.auth
+    from google.oauth2.service_account import Credentials
+
     if not key_path and not keyfile_dict:
         context_secret = get_default_key_path()
         # Look for default GC path
@@ -127,4 +161,59 @@ def get_gc_credentials(
         except ValueError:  # json.decoder.JSONDecodeError does not exist on py2
             raise VENTS_CONFIG.exception("Invalid key JSON.")
 
+    credentials_cache = VENTS_CONFIG.credentials_cache
+    if credentials_cache is not None and credentials is not None:
+        cache_key = get_gc_cache_key(key_path, keyfile_dict, scopes)
+        share_gc_credentials(credentials, cache_key, credentials_cache)
+    return credentials
+
+
+def get_gc_cache_key(
+    key_path: Optional[str] = None,
+    keyfile_dict: Optional[Union[str, Dict]] = None,
+    scopes: Optional[List[str]] = None,
+) -> str:
+    """Returns the shared cache key of the credentials,
+    a rotated key file, with a new mtime or size, gets a new key."""
+    key_file_stat = None
+    if key_path:
+        try:
+            stat = os.stat(key_path)
+            key_file_stat = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            pass
+    keyfile_digest = None
+    if keyfile_dict:
+        keyfile_digest = hashlib.blake2b(
+            orjson_dumps(keyfile_dict).encode(), digest_size=16
+        ).hexdigest()
+    return "gcp:{}".format((key_path, key_file_stat, keyfile_digest, scopes))
+
+
+def share_gc_credentials(
+    credentials: "Credentials", cache_key: str, cache: "SharedCredentialsCache"
+) -> "Credentials":
+    """Refreshes the access token through a cache shared by several processes,
+    only one process calls the token endpoint, the others read its token."""
+    refresh = credentials.refresh
+
+    def fetch_token(request):
+        refresh(request)
+        expiry = credentials.expiry  # Naive UTC
+        if expiry is None:  # Not cached
+            return {"token": credentials.token, "expiry": None}, time.time()
+        return (
+            {"token": credentials.token, "expiry": expiry.isoformat()},
+            expiry.replace(tzinfo=datetime.timezone.utc).timestamp(),
+        )
+
+    def shared_refresh(request):
+        value = cache.get(
+            cache_key, lambda: fetch_token(request), margin=GC_TOKEN_REFRESH_MARGIN
+        )
+        credentials.token = value["token"]
+        expiry = value["expiry"]
+        credentials.expiry = datetime.datetime.fromisoformat(expiry) if expiry else None
+
+    credentials.refresh = shared_refresh
     return credentials
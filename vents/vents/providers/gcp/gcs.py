@@ -1,15 +1,30 @@
-from typing import Optional
-
-from gcsfs import GCSFileSystem as BaseGCSFileSystem
+import functools
+from typing import Any, Optional, Type
 
 from vents.providers.gcp.service import GCPService
 
 
-class GCSFileSystem(BaseGCSFileSystem):
-    retries = 5
+@functools.lru_cache(maxsize=None)
+def get_gcs_filesystem_class() -> Type:
+    """Defines `GCSFileSystem` on first use, `gcsfs` is slow to import."""
+    from gcsfs import GCSFileSystem as BaseGCSFileSystem
+
+    class GCSFileSystem(BaseGCSFileSystem):
+        retries = 5
+
+        async def set_session(self):
+            return await self._set_session()
+
+    # Pickled by reference, resolved by the module `__getattr__`
+    GCSFileSystem.__module__ = __name__
+    GCSFileSystem.__qualname__ = "GCSFileSystem"
+    return GCSFileSystem
+
 
-    async def set_session(self):
-        return await self._set_session()
+def __getattr__(name: str) -> Any:
+    if name == "GCSFileSystem":
+        return get_gcs_filesystem_class()
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
 
 
 class GCSService(GCPService):
@@ -19,7 +34,7 @@ class GCSService(GCPService):
         use_listings_cache: Optional[bool] = False,
         **kwargs,
     ):
-        self._session = GCSFileSystem(
+        self._session = get_gcs_filesystem_class()(
             project=self.project_id,
             token=self.credentials,
             asynchronous=asynchronous,
@@ -2,8 +2,6 @@ import json
 import os
 from typing import TYPE_CHECKING, Any, List, Optional
 
-from google.oauth2.service_account import Credentials
-
 from vents.providers.base import BaseService
 from vents.providers.gcp.base import (
     get_default_key_path,
@@ -13,11 +11,10 @@ from vents.providers.gcp.base import (
     get_project_id,
     get_scopes,
 )
+from vents.settings import VENTS_CONFIG
 
 
 if TYPE_CHECKING:
-    from google.cloud.storage.client import Client
-
     from vents.connections.connection import Connection
 
 
@@ -26,7 +23,8 @@ class GCPService(BaseService):
     key_path: Optional[str] = None
     keyfile_dict: Optional[str] = None
     scopes: Optional[List[str]] = None
-    credentials: Optional[Credentials] = None
+    # `google.oauth2.service_account.Credentials`, not imported to keep imports light
+    credentials: Optional[Any] = None
     client_info: Optional[Any] = None
     client_options: Optional[Any] = None
     encoding: Optional[str] = "utf-8"
@@ -49,16 +47,13 @@ class GCPService(BaseService):
             if connection.env:
                 builtin_env = connection.env
 
-        project_id = get_project_id(
-            context_paths=context_paths, schema=schema, env=builtin_env
-        )
-        key_path = get_key_path(
+        resolver = VENTS_CONFIG.get_keys_resolver(
             context_paths=context_paths, schema=schema, env=builtin_env
         )
-        keyfile_dict = get_keyfile_dict(
-            context_paths=context_paths, schema=schema, env=builtin_env
-        )
-        scopes = get_scopes(context_paths=context_paths, schema=schema, env=builtin_env)
+        project_id = get_project_id(resolver=resolver)
+        key_path = get_key_path(resolver=resolver)
+        keyfile_dict = get_keyfile_dict(resolver=resolver)
+        scopes = get_scopes(resolver=resolver)
         credentials = get_gc_credentials(
             key_path=key_path,
             keyfile_dict=keyfile_dict,
@@ -73,6 +68,8 @@ class GCPService(BaseService):
         )
 
     def _set_session(self):
+        from google.cloud.storage.client import Client
+
         self._session = Client(
             project=self.project_id,
             credentials=self.credentials,
@@ -88,3 +85,4 @@ class GCPService(BaseService):
             with open(key_path, "w") as outfile:
                 json.dump(self.keyfile_dict, outfile)
             os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = key_path
+        VENTS_CONFIG.refresh_env("GOOGLE_APPLICATION_CREDENTIALS")
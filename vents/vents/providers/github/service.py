@@ -54,3 +54,4 @@ class GithubService(BaseService):
     def set_env_vars(self):
         if self.token:
             os.environ["GITHUB_TOKEN"] = self.token
+        VENTS_CONFIG.refresh_env("GITHUB_TOKEN")
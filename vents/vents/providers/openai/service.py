@@ -86,3 +86,4 @@ class OpenAIService(BaseService):
             os.environ["OPENAI_BASE_URL"] = self.base_url
         if self.kwargs:
             os.environ["OPENAI_KWARGS"] = orjson_dumps(self.kwargs)
+        VENTS_CONFIG.refresh_env("OPENAI_API_KEY", "OPENAI_BASE_URL", "OPENAI_KWARGS")
@@ -94,6 +94,13 @@ class RedditService(BaseService):
             os.environ["REDDIT_USERNAME"] = self.username
         if self.password:
             os.environ["REDDIT_PASSWORD"] = self.password
+        VENTS_CONFIG.refresh_env(
+            "REDDIT_CLIENT_ID",
+            "REDDIT_CLIENT_SECRET",
+            "REDDIT_USER_AGENT",
+            "REDDIT_USERNAME",
+            "REDDIT_PASSWORD",
+        )
 
 
 class RedditRssService(BaseHttpService):
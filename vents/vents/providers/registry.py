@@ -0,0 +1,124 @@
+import importlib
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Type, Union
+
+from vents.exceptions import VentError
+from vents.providers.kinds import ProviderKind
+
+
+if TYPE_CHECKING:
+    from vents.connections.connection import Connection
+    from vents.providers.base import BaseService
+
+
+ENTRY_POINTS_GROUP = "vents.providers"
+
+# Import paths, the SDKs are only imported when a kind is requested
+DEFAULT_PROVIDERS: Dict[str, str] = {
+    ProviderKind.AWS: "vents.providers.aws.service:AWSService",
+    ProviderKind.S3: "vents.providers.aws.s3:S3Service",
+    ProviderKind.GCP: "vents.providers.gcp.service:GCPService",
+    ProviderKind.GCS: "vents.providers.gcp.gcs:GCSService",
+    ProviderKind.AZURE: "vents.providers.azure.service:AzureService",
+    ProviderKind.WASB: "vents.providers.azure.blob_storage:BlobStorageService",
+    ProviderKind.SLACK: "vents.providers.slack.service:SlackService",
+    ProviderKind.DISCORD: "vents.providers.discord.service:DiscordService",
+}
+
+
+def import_service(path: str) -> Type["BaseService"]:
+    module_name, _, attr = path.partition(":")
+    if not attr:
+        raise VentError(
+            "Received an invalid service path `{}`, expected `module:Class`.".format(
+                path
+            )
+        )
+    return getattr(importlib.import_module(module_name), attr)
+
+
+class ProviderRegistry:
+    """Maps connection kinds to service classes, imported on first use.
+
+    Third-party packages can register kinds with `register`
+    or with a `vents.providers` entry point, e.g. `custom = pkg.module:Service`,
+    entry points do not override the kinds registered in code.
+    """
+
+    def __init__(self, providers: Optional[Dict[str, str]] = None):
+        self._paths: Dict[str, str] = dict(
+            DEFAULT_PROVIDERS if providers is None else providers
+        )
+        self._services: Dict[str, Type["BaseService"]] = {}
+        self._entry_points_loaded = False
+        self._lock = threading.Lock()
+
+    def _load_entry_points(self) -> None:
+        if self._entry_points_loaded:
+            return
+        from importlib.metadata import entry_points
+
+        try:
+            eps = entry_points(group=ENTRY_POINTS_GROUP)
+        except TypeError:  # Python < 3.10
+            eps = entry_points().get(ENTRY_POINTS_GROUP, [])  # type: ignore
+        for ep in eps:
+            if ep.name not in self._paths and ep.name not in self._services:
+                self._paths[ep.name] = ep.value
+        self._entry_points_loaded = True
+
+    def register(self, kind: str, service: Union[str, Type["BaseService"]]) -> None:
+        """Registers a service class, or its `module:Class` path, for a kind."""
+        with self._lock:
+            self._services.pop(kind, None)
+            self._paths.pop(kind, None)
+            if isinstance(service, str):
+                self._paths[kind] = service
+            else:
+                self._services[kind] = service
+
+    def unregister(self, kind: str) -> None:
+        with self._lock:
+            self._services.pop(kind, None)
+            self._paths.pop(kind, None)
+
+    @property
+    def kinds(self) -> List[str]:
+        with self._lock:
+            self._load_entry_points()
+            return list(dict.fromkeys([*self._paths, *self._services]))
+
+    def get(self, kind: str) -> Optional[Type["BaseService"]]:
+        """Returns the service class of a kind, importing it if needed."""
+        service = self._services.get(kind)
+        if service is not None:
+            return service
+        with self._lock:
+            self._load_entry_points()
+            service = self._services.get(kind)
+            if service is not None:
+                return service
+            path = self._paths.get(kind)
+            if path is None:
+                return None
+            service = import_service(path)
+            self._services[kind] = service
+            return service
+
+    def service_for(self, connection: "Connection") -> "BaseService":
+        """Returns the service of a connection, built with `load_from_connection`."""
+        service = self.get(connection.kind)
+        if service is None:
+            raise VentError(
+                "No service is registered for the kind `{}` of connection `{}`.".format(
+                    connection.kind, connection.name
+                )
+            )
+        return service.load_from_connection(connection=connection)
+
+
+PROVIDERS_REGISTRY = ProviderRegistry()
+
+
+def service_for(connection: "Connection") -> "BaseService":
+    return PROVIDERS_REGISTRY.service_for(connection)
@@ -0,0 +1,251 @@
+from collections import OrderedDict
+import hashlib
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Hashable, List, Optional, Tuple, Type
+
+from vents.connections.connection_resource import ConnectionResource
+from vents.providers.registry import PROVIDERS_REGISTRY
+
+
+# Most lookups only stat the mount directories,
+# their files are stat-ed again at most once per interval if unchanged
+FINGERPRINT_INTERVAL = 1.0
+
+
+if TYPE_CHECKING:
+    from vents.config import AppConfig
+    from vents.connections.catalog import ConnectionCatalog
+    from vents.connections.connection import Connection
+    from vents.providers.base import BaseService
+
+
+def _get_stat(path: str) -> Optional[Tuple[int, int, int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def get_context_paths(connection: Optional["Connection"]) -> List[str]:
+    """Returns the mount paths a service reads its keys from."""
+    context_paths = []
+    if connection:
+        for resource in (connection.secret, connection.config_map):
+            # Refs are not resolved here
+            if isinstance(resource, ConnectionResource) and resource.mount_path:
+                context_paths.append(resource.mount_path)
+    return context_paths
+
+
+# Path -> (directory stat, checked at, digest)
+_directory_fingerprints: Dict[str, Tuple[Optional[Tuple], float, str]] = {}
+
+
+def _get_directory_fingerprint(path: str) -> str:
+    stat = _get_stat(path)
+    now = time.monotonic()
+    cached = _directory_fingerprints.get(path)
+    if (
+        cached is not None
+        and cached[0] == stat
+        and now - cached[1] < FINGERPRINT_INTERVAL
+    ):
+        return cached[2]
+    digest = hashlib.blake2b(repr(stat).encode(), digest_size=16)
+    try:
+        names = sorted(os.listdir(path))
+    except OSError:
+        names = []
+    for name in names:
+        digest.update(repr((name, _get_stat(os.path.join(path, name)))).encode())
+    fingerprint = digest.hexdigest()
+    _directory_fingerprints[path] = (stat, now, fingerprint)
+    return fingerprint
+
+
+def get_sources_fingerprint(context_paths: List[str]) -> str:
+    """Returns a digest of the files in the context paths.
+
+    Files are compared by device, inode, mtime, and size, following symlinks,
+    so secrets rotated with an atomic symlink swap
+    (e.g. Kubernetes mounted secrets) change the fingerprint.
+    The files are only listed again when their directory changes,
+    or after `FINGERPRINT_INTERVAL` seconds for files edited in place.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for context_path in context_paths:
+        digest.update(
+            repr((context_path, _get_directory_fingerprint(context_path))).encode()
+        )
+    return digest.hexdigest()
+
+
+def clear_fingerprints() -> None:
+    _directory_fingerprints.clear()
+
+
+class _ServiceEntry:
+    __slots__ = ("service", "connection", "fingerprint", "expires_at")
+
+    def __init__(
+        self,
+        service: "BaseService",
+        connection: Optional["Connection"],
+        fingerprint: Tuple,
+        expires_at: Optional[float],
+    ):
+        self.service = service
+        self.connection = connection
+        self.fingerprint = fingerprint
+        self.expires_at = expires_at
+
+
+class ServiceRegistry:
+    """Process-wide cache of the services built from connections.
+
+    Services, and the sessions they hold, are cached by connection name
+    and service class, and revalidated on each lookup with a fingerprint
+    of their credentials' sources: the connection definition,
+    the files in its secret and config map mount paths, and `env_version`.
+    Entries are evicted in LRU order beyond `maxsize`,
+    and rebuilt after `ttl` seconds if set, e.g. for temporary credentials.
+    Services are built outside the lock, concurrent misses can build twice.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 128,
+        ttl: Optional[float] = None,
+        config: Optional["AppConfig"] = None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._config = config
+        self._entries: "OrderedDict[Hashable, _ServiceEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def config(self) -> "AppConfig":
+        if self._config is None:
+            from vents.settings import VENTS_CONFIG
+
+            return VENTS_CONFIG
+        return self._config
+
+    def _get_fingerprint(self, connection: Optional["Connection"]) -> Tuple:
+        config = self.config
+        return (
+            id(config),
+            config.env_version,
+            get_sources_fingerprint(get_context_paths(connection)),
+        )
+
+    @staticmethod
+    def _is_same_connection(
+        current: Optional["Connection"], connection: Optional["Connection"]
+    ) -> bool:
+        # Catalog reloads keep the instances of unchanged connections
+        return current is connection or current == connection
+
+    def get(
+        self,
+        connection_name: str,
+        catalog: Optional["ConnectionCatalog"] = None,
+        service_class: Optional[Type["BaseService"]] = None,
+    ) -> Optional["BaseService"]:
+        """Returns the cached service of a connection, building it if needed.
+
+        The connection is looked up in `catalog`, or in the config's catalog.
+        Without a `service_class`, the class is resolved from the connection kind,
+        see `ProviderRegistry`.
+        """
+        if catalog is not None:
+            connection = catalog.get_connection_for(connection_name)
+        else:
+            connection = self.config.get_connection_for(connection_name)
+        return self.get_for_connection(
+            connection=connection,
+            connection_name=connection_name,
+            service_class=service_class,
+        )
+
+    def get_for_connection(
+        self,
+        connection: Optional["Connection"],
+        connection_name: Optional[str] = None,
+        service_class: Optional[Type["BaseService"]] = None,
+    ) -> Optional["BaseService"]:
+        if service_class is None:
+            if connection is None:
+                return None
+            service_class = PROVIDERS_REGISTRY.get(connection.kind)
+            if service_class is None:
+                return None
+        connection_name = connection_name or (connection.name if connection else None)
+        cache_key = (connection_name, service_class)
+        fingerprint = self._get_fingerprint(connection)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if (
+                entry is not None
+                and entry.fingerprint == fingerprint
+                and (entry.expires_at is None or entry.expires_at > now)
+                and self._is_same_connection(entry.connection, connection)
+            ):
+                self._entries.move_to_end(cache_key)
+                self.hits += 1
+                return entry.service
+            self.misses += 1
+
+        service = service_class.load_from_connection(connection=connection)
+        if service is None:
+            return None
+        expires_at = now + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[cache_key] = _ServiceEntry(
+                service=service,
+                connection=connection,
+                fingerprint=fingerprint,
+                expires_at=expires_at,
+            )
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return service
+
+    def invalidate(self, connection_name: str) -> None:
+        """Drops the services of a connection, e.g. after rotating its credentials."""
+        with self._lock:
+            for cache_key in [k for k in self._entries if k[0] == connection_name]:
+                del self._entries[cache_key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = OrderedDict()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+        clear_fingerprints()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+        }
+
+
+SERVICES_REGISTRY = ServiceRegistry()
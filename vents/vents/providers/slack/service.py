@@ -52,6 +52,7 @@ class SlackService(BaseService):
     def set_env_vars(self):
         if self.token:
             os.environ["SLACK_TOKEN"] = self.token
+        VENTS_CONFIG.refresh_env("SLACK_TOKEN")
 
 
 class SlackWebhookService(BaseService):
@@ -83,6 +84,7 @@ class SlackWebhookService(BaseService):
     def set_env_vars(self):
         if self.url:
             os.environ["SLACK_URL"] = self.url
+        VENTS_CONFIG.refresh_env("SLACK_URL")
 
 
 class SlackHttpWebhookService(BaseHttpService):